@@ -3,11 +3,15 @@ from sqlalchemy.orm import Session
 from typing import List
 from datetime import datetime
 
+from app.config import settings
 from app.database import get_db
 from app.models import Question, Assessment, QuestionResponse
 from app.schemas.schemas import SubmitResponse, QuestionResponseResult, CodeExecutionRequest
 from app.services.auth_service import get_current_user, get_current_candidate
-from app.services.code_executor import execute_code, validate_code_syntax
+from app.services.code_executor import ExecutionLimits, execute_code_async
+from app.services.execution_scheduler import QueueFullError
+from app.services.executor_client import ExecutorUnavailableError
+from app.services.performance_cases import is_performance_case, prepare_test_cases_async
 from app.services.scoring_service import (
     score_mcq_response, score_coding_response, 
     score_text_response, score_slider_response
@@ -45,11 +49,33 @@ async def submit_question_response(
     
     elif question.question_type == "coding":
         # Execute code
-        exec_result = execute_code(
-            data.response_text,
-            "python",
-            question.test_cases
-        )
+        try:
+            # Performance cases get generated inputs and budgets timed from the reference solution
+            test_cases, digest = await prepare_test_cases_async(question.test_cases, question.correct_answer)
+            exec_result = await execute_code_async(
+                data.response_text,
+                "python",
+                test_cases,
+                fail_fast=settings.graded_fail_fast,
+                graded=True,
+                limits=ExecutionLimits.for_suite(test_cases),
+                question_id=question.id,
+                digest=digest
+            )
+        except QueueFullError as e:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=str(e),
+                headers={"Retry-After": str(e.retry_after)}
+            )
+        except ExecutorUnavailableError as e:
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+        except ValueError as e:
+            # The question's suite cannot be graded (saved before it was validated, or its reference fails)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Question {question.id} cannot be graded: {e}"
+            )
         score_result = score_coding_response(question, exec_result)
         code_output = exec_result.get("output", "") + (exec_result.get("error") or "")
     
@@ -83,18 +109,21 @@ async def execute_code_endpoint(
     current_user = Depends(get_current_candidate)
 ):
     """Execute code in sandbox (for practice/testing)"""
-    # Validate syntax first
-    syntax_check = validate_code_syntax(data.code, data.language)
-    if not syntax_check.get("valid"):
-        return {
-            "success": False,
-            "output": "",
-            "error": syntax_check.get("error"),
-            "test_results": [],
-            "execution_time_ms": 0
-        }
-    
-    result = execute_code(data.code, data.language, data.test_cases)
+    # Generated inputs and reference benchmarks are only for question suites, never client-supplied cases
+    if any(is_performance_case(tc) or "generate" in tc for tc in data.test_cases or []):
+        raise HTTPException(status_code=400, detail="Performance test cases cannot be run in practice")
+    # Oversize, unparsable or banned code is rejected by the executor's prescreen before it runs
+    try:
+        # Not attributed to a question: telemetry only counts graded runs of the question's own suite
+        result = await execute_code_async(data.code, data.language, data.test_cases)
+    except QueueFullError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    except ExecutorUnavailableError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
     return result
 
 @router.get("/question/{question_id}")
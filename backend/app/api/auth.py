@@ -5,7 +5,8 @@ from app.database import get_db
 from app.models import User, CandidateProfile
 from app.schemas.schemas import UserCreate, UserLogin, Token, UserResponse
 from app.services.auth_service import (
-    get_password_hash, verify_password, create_access_token, get_current_user
+    get_password_hash, verify_password, create_access_token, get_current_user, has_usable_password,
+    verify_invite_token
 )
 from app.config import settings
 
@@ -13,29 +14,46 @@ router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 @router.post("/register", response_model=Token)
 async def register(user_data: UserCreate, db: Session = Depends(get_db)):
-    """Register a new user (candidate or recruiter)"""
+    """
+    Register a new user (candidate or recruiter). A candidate whose resume was
+    bulk-imported already has an account without a password: registering with
+    that email and the invite token emailed to it claims the account, keeping
+    the imported profile. Without the token the email counts as registered.
+    """
     # Check if email exists
     existing_user = db.query(User).filter(User.email == user_data.email).first()
-    if existing_user:
+    claimable = (
+        existing_user is not None
+        and not has_usable_password(existing_user)
+        and existing_user.role == "candidate"
+        and user_data.role == "candidate"
+        and verify_invite_token(user_data.invite_token, existing_user)
+    )
+    if existing_user and not claimable:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    # Create user
+    # Create user (or set the password of the imported one)
     hashed_password = get_password_hash(user_data.password)
-    db_user = User(
-        email=user_data.email,
-        full_name=user_data.full_name,
-        hashed_password=hashed_password,
-        role=user_data.role
-    )
-    db.add(db_user)
+    if claimable:
+        db_user = existing_user
+        db_user.full_name = user_data.full_name
+        db_user.hashed_password = hashed_password
+    else:
+        db_user = User(
+            email=user_data.email,
+            full_name=user_data.full_name,
+            hashed_password=hashed_password,
+            role=user_data.role
+        )
+        db.add(db_user)
     db.commit()
     db.refresh(db_user)
     
     # Create candidate profile if role is candidate
-    if user_data.role == "candidate":
+    if user_data.role == "candidate" and db_user.candidate_profile is None:
         candidate_profile = CandidateProfile(user_id=db_user.id)
         db.add(candidate_profile)
         db.commit()
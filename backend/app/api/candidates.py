@@ -16,6 +16,9 @@ from app.schemas.schemas import (
 )
 from app.services.auth_service import get_current_user, get_current_candidate
 from app.services.resume_service import parse_resume, parse_resume_from_bytes, match_resume_to_job
+from app.services.match_engine import batch_match, job_match_fields
+from app.services.resume_cache import get_parsed_resume
+from app.services.resume_pool import ResumeParseTimeout, parse_in_pool
 from app.services.scoring_service import (
     calculate_assessment_scores, calculate_integrity_score, generate_evaluation
 )
@@ -65,13 +68,19 @@ async def parse_resume_test(
     # Parse resume
     try:
         print("Parsing resume...")
-        parsed_data = parse_resume(file_path)
-        print(f"Skills found: {len(parsed_data.get('skills', []))}")
+        parsed_data, cached = await get_parsed_resume(
+            db, content, file.filename, lambda: parse_in_pool(parse_resume, file_path)
+        )
+        print(f"Skills found: {len(parsed_data.get('skills', []))}{' (cached)' if cached else ''}")
         print(f"Skills: {parsed_data.get('skills', [])[:10]}")
         return {
             "message": "Resume parsed successfully",
-            "parsed_data": parsed_data
+            "parsed_data": parsed_data,
+            "cached": cached
         }
+    except ResumeParseTimeout as e:
+        print(f"Parse timeout: {e}")
+        raise HTTPException(status_code=422, detail=f"Failed to parse resume: {str(e)}")
     except Exception as e:
         print(f"Parse error: {e}")
         import traceback
@@ -133,9 +142,14 @@ async def upload_resume(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to read file: {str(e)}")
     
-    # Parse resume from bytes (works on serverless)
+    # Parse resume from bytes (works on serverless) in the parser pool, off the event loop;
+    # a file seen before is served from the parse cache
     try:
-        parsed_data = parse_resume_from_bytes(file_content, file.filename)
+        parsed_data, cached = await get_parsed_resume(
+            db, file_content, file.filename, lambda: parse_in_pool(parse_resume_from_bytes, file_content, file.filename)
+        )
+    except ResumeParseTimeout as e:
+        raise HTTPException(status_code=422, detail=f"Failed to parse resume: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to parse resume: {str(e)}")
     
@@ -158,7 +172,8 @@ async def upload_resume(
     
     return {
         "message": "Resume uploaded and parsed successfully",
-        "parsed_data": parsed_data
+        "parsed_data": parsed_data,
+        "cached": cached
     }
 
 @router.get("/jobs", response_model=List[dict])
@@ -174,8 +189,13 @@ async def get_available_jobs(
         CandidateProfile.user_id == current_user.id
     ).first()
     
+    # Every job scored against the resume in one batch
+    matches = None
+    if profile and profile.parsed_resume:
+        matches = batch_match([profile.parsed_resume], [job_match_fields(job) for job in jobs])[0]
+    
     result = []
-    for job in jobs:
+    for i, job in enumerate(jobs):
         job_dict = {
             "id": job.id,
             "title": job.title,
@@ -187,15 +207,9 @@ async def get_available_jobs(
         }
         
         # Add match score if resume is available
-        if profile and profile.parsed_resume:
-            match_result = match_resume_to_job(profile.parsed_resume, {
-                "required_skills": job.required_skills or [],
-                "preferred_skills": job.preferred_skills or [],
-                "min_experience_years": job.min_experience_years,
-                "education_requirements": job.education_requirements or []
-            })
-            job_dict["match_score"] = match_result["match_score"]
-            job_dict["ranking"] = match_result["ranking"]
+        if matches:
+            job_dict["match_score"] = matches[i]["match_score"]
+            job_dict["ranking"] = matches[i]["ranking"]
         
         result.append(job_dict)
     
@@ -362,12 +376,7 @@ async def complete_assessment(
     # Calculate resume match
     resume_match = {}
     if profile.parsed_resume and job:
-        resume_match = match_resume_to_job(profile.parsed_resume, {
-            "required_skills": job.required_skills or [],
-            "preferred_skills": job.preferred_skills or [],
-            "min_experience_years": job.min_experience_years,
-            "education_requirements": job.education_requirements or []
-        })
+        resume_match = match_resume_to_job(profile.parsed_resume, job_match_fields(job))
     
     # Generate final evaluation
     evaluation_data = generate_evaluation(
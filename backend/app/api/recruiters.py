@@ -1,7 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from datetime import datetime
+from urllib.parse import urlencode
+import smtplib
+import zipfile
+
+from starlette.concurrency import run_in_threadpool
 
 from app.database import get_db
 from app.models import (
@@ -12,8 +18,17 @@ from app.schemas.schemas import (
     JobDescriptionCreate, JobDescriptionResponse, 
     QuestionCreate, QuestionResponse
 )
-from app.services.auth_service import get_current_recruiter
-from app.services.resume_service import match_resume_to_job
+from app.config import settings
+from app.services.auth_service import get_current_recruiter, has_usable_password, create_invite_token
+from app.services.mailer import mail_configured, send_mail
+from app.services.match_engine import batch_match, job_match_fields
+from app.services.code_executor import executor_stats_async
+from app.services.execution_telemetry import question_stats
+from app.services.performance_cases import validate_test_cases
+from app.services.bulk_ingest import ResumeSource, ingest_resumes, sse_event
+from app.services.pdf_text import extraction_stats
+from app.services.resume_cache import parse_cache
+from app.services.resume_pool import get_resume_pool
 
 router = APIRouter(prefix="/recruiter", tags=["Recruiter"])
 
@@ -124,6 +139,10 @@ async def create_question(
     db: Session = Depends(get_db)
 ):
     """Create a new question"""
+    try:
+        validate_test_cases(question_data.test_cases, question_data.correct_answer)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     question = Question(**question_data.model_dump())
     db.add(question)
     db.commit()
@@ -157,6 +176,12 @@ async def create_questions_bulk(
     db: Session = Depends(get_db)
 ):
     """Create multiple questions at once"""
+    for i, q_data in enumerate(questions):
+        try:
+            validate_test_cases(q_data.test_cases, q_data.correct_answer)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Question {i + 1}: {e}")
+    
     created = []
     for q_data in questions:
         question = Question(**q_data.model_dump())
@@ -302,6 +327,44 @@ async def get_candidate_detail(
         } if evaluation else None
     }
 
+@router.post("/candidates/{candidate_id}/invite")
+async def invite_candidate(
+    candidate_id: int,
+    current_user: User = Depends(get_current_recruiter),
+    db: Session = Depends(get_db)
+):
+    """
+    Email a bulk-imported candidate a link to claim their account. The invite
+    token only goes to the candidate's own address, never back to the caller.
+    """
+    candidate = db.query(CandidateProfile).filter(
+        CandidateProfile.id == candidate_id
+    ).first()
+
+    if not candidate:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+
+    user = candidate.user
+    if has_usable_password(user):
+        raise HTTPException(status_code=400, detail="Candidate has already registered")
+    if not mail_configured():
+        raise HTTPException(status_code=503, detail="Outgoing mail is not configured")
+
+    query = urlencode({"invite": create_invite_token(user), "email": user.email})
+    link = f"{settings.frontend_url.rstrip('/')}/register?{query}"
+    body = (
+        f"Hello {user.full_name},\n\n"
+        f"{current_user.full_name} has added your resume to Elite-Hire.\n"
+        f"Set a password to claim your account:\n\n{link}\n\n"
+        f"This link expires in {settings.invite_token_expire_hours} hours."
+    )
+    try:
+        await run_in_threadpool(send_mail, user.email, "Your Elite-Hire account", body)
+    except (smtplib.SMTPException, OSError) as e:
+        raise HTTPException(status_code=502, detail=f"Could not send the invite: {e}")
+
+    return {"message": f"Invite sent to {user.email}"}
+
 @router.get("/candidates/job/{job_id}/shortlist")
 async def get_shortlisted_candidates(
     job_id: int,
@@ -315,9 +378,15 @@ async def get_shortlisted_candidates(
         Assessment.status == "completed"
     ).all()
     
+    # Resume match of every candidate against this job, scored in one batch
+    job = db.query(JobDescription).filter(JobDescription.id == job_id).first()
+    resume_matches = batch_match(
+        [a.candidate.parsed_resume for a in assessments], [job_match_fields(job)] if job else []
+    )
+    
     candidates_data = []
     
-    for assessment in assessments:
+    for assessment, resume_match in zip(assessments, resume_matches):
         candidate = assessment.candidate
         user = candidate.user
         evaluation = db.query(FinalEvaluation).filter(
@@ -335,7 +404,8 @@ async def get_shortlisted_candidates(
             "psychometric_score": assessment.psychometric_score,
             "recommendation": evaluation.recommendation if evaluation else "pending",
             "final_score": evaluation.final_score if evaluation else 0,
-            "integrity_score": evaluation.integrity_score if evaluation else 100
+            "integrity_score": evaluation.integrity_score if evaluation else 100,
+            "resume_match_score": resume_match[0]["match_score"] if resume_match and resume_match[0] else None
         })
     
     # Sort by ranking and score
@@ -406,3 +476,68 @@ async def get_recruiter_dashboard(
             "created_at": e.created_at
         } for e in recent_evaluations]
     }
+
+# ============ CODE EXECUTION ============
+
+@router.get("/executor/stats")
+async def get_code_executor_stats(
+    current_user: User = Depends(get_current_recruiter)
+):
+    """Get code execution capacity (idle/busy sandbox workers)"""
+    return await executor_stats_async()
+
+@router.get("/executor/questions")
+async def get_question_execution_stats(
+    question_id: Optional[int] = None,
+    current_user: User = Depends(get_current_recruiter),
+    db: Session = Depends(get_db)
+):
+    """Per-question runtime percentiles, timeout rates and memory peaks, slowest first"""
+    stats = question_stats(db, [question_id] if question_id is not None else None)
+    questions = {
+        q.id: q for q in db.query(Question).filter(Question.id.in_([s["question_id"] for s in stats]))
+    }
+    for s in stats:
+        question = questions.get(s["question_id"])
+        s["question_text"] = question.question_text[:100] if question else None
+        s["difficulty"] = question.difficulty if question else None
+        s["test_cases"] = len(question.test_cases or []) if question else None
+    return stats
+
+# ============ RESUME PARSING ============
+
+@router.get("/resumes/stats")
+async def get_resume_parsing_stats(
+    current_user: User = Depends(get_current_recruiter)
+):
+    """PDF backend timings and success rates, parse cache and parser pool usage (this worker)"""
+    pool = get_resume_pool()
+    return {
+        "pdf_extraction": extraction_stats.stats(),
+        "parse_cache": parse_cache.stats(),
+        "parser_pool": pool.stats() if pool else None
+    }
+
+
+@router.post("/resumes/bulk")
+async def bulk_upload_resumes(
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_recruiter)
+):
+    """
+    Ingest a zip archive of resumes (PDF/DOCX), creating or updating a candidate
+    per file. Progress streams back as server-sent events: "file" per resume,
+    "batch" per saved batch and a final "done" summary.
+    """
+    if not zipfile.is_zipfile(file.file):
+        raise HTTPException(status_code=400, detail="Upload a zip archive of resumes")
+    source = ResumeSource.from_zip(file.file, file.filename)
+    
+    async def events():
+        try:
+            async for event in ingest_resumes(source):
+                yield sse_event(event)
+        finally:
+            source.close()
+    
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
@@ -8,6 +8,63 @@ class Settings(BaseSettings):
     secret_key: str = os.getenv("SECRET_KEY", "your-super-secret-key-change-in-production")
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 1440
+    # Lifetime of the emailed invite that lets a bulk-imported candidate claim their account,
+    # and the frontend its link points to
+    invite_token_expire_hours: int = int(os.getenv("INVITE_TOKEN_EXPIRE_HOURS", "168"))
+    frontend_url: str = os.getenv("FRONTEND_URL", "http://localhost:3000")
+    # Outgoing mail for invites (an empty host disables sending; user/password enable STARTTLS login)
+    smtp_host: str = os.getenv("SMTP_HOST", "")
+    smtp_port: int = int(os.getenv("SMTP_PORT", "587"))
+    smtp_user: str = os.getenv("SMTP_USER", "")
+    smtp_password: str = os.getenv("SMTP_PASSWORD", "")
+    smtp_from: str = os.getenv("SMTP_FROM", "no-reply@localhost")
+    # Unix socket of the executor daemon (run_executor.py); unset runs code inside the API process
+    executor_socket: str = os.getenv("EXECUTOR_SOCKET", "")
+    # Connections each API worker keeps open to the daemon; requests are multiplexed over them
+    executor_connections: int = int(os.getenv("EXECUTOR_CONNECTIONS", "4"))
+    # Warm Python workers kept forked and idle for code execution (0 disables the pool)
+    python_pool_size: int = int(os.getenv("PYTHON_POOL_SIZE", "4"))
+    # Persistent Node.js workers for JavaScript execution (0 disables the pool)
+    node_pool_size: int = int(os.getenv("NODE_POOL_SIZE", "4"))
+    # Test cases run in parallel: per submission, and across all submissions in this process
+    max_parallel_cases: int = int(os.getenv("MAX_PARALLEL_CASES", "4"))
+    max_concurrent_cases: int = int(os.getenv("MAX_CONCURRENT_CASES", str(os.cpu_count() or 4)))
+    # Submissions executed at once per API worker (async routes await them off the event loop)
+    max_concurrent_submissions: int = int(os.getenv("MAX_CONCURRENT_SUBMISSIONS", "32"))
+    # Submissions allowed to wait for a slot before callers get 429
+    execution_queue_size: int = int(os.getenv("EXECUTION_QUEUE_SIZE", "200"))
+    # Execution results replayed for identical (code, language, test cases, limits) runs
+    result_cache_size: int = int(os.getenv("RESULT_CACHE_SIZE", "1024"))
+    result_cache_ttl_seconds: int = int(os.getenv("RESULT_CACHE_TTL_SECONDS", "600"))
+    # Compiled C/C++/Java builds kept on disk, keyed by source hash
+    artifact_cache_size: int = int(os.getenv("ARTIFACT_CACHE_SIZE", "256"))
+    # Longest a submission's whole test suite may run (seconds); a suite's own case time limits can lower it
+    max_suite_seconds: int = int(os.getenv("MAX_SUITE_SECONDS", "60"))
+    # Seconds between flushes of per-question executor telemetry to the database (0 disables flushing)
+    telemetry_flush_seconds: int = int(os.getenv("TELEMETRY_FLUSH_SECONDS", "60"))
+    # Worker processes parsing uploaded resumes (0 parses in a thread of the API process),
+    # and the longest one document may take before its worker is killed
+    resume_pool_size: int = int(os.getenv("RESUME_POOL_SIZE", "2"))
+    resume_parse_timeout_seconds: float = float(os.getenv("RESUME_PARSE_TIMEOUT_SECONDS", "30"))
+    # PDF text extraction: backends in the order tried (fastest first), and the most
+    # of one document that is read
+    pdf_backends: str = os.getenv("PDF_BACKENDS", "pdfium,pymupdf,pypdf2,pdfplumber")
+    pdf_max_pages: int = int(os.getenv("PDF_MAX_PAGES", "20"))
+    pdf_max_bytes: int = int(os.getenv("PDF_MAX_BYTES", str(10 * 1024 * 1024)))
+    # Candidates saved per transaction by bulk resume ingestion
+    bulk_ingest_batch_size: int = int(os.getenv("BULK_INGEST_BATCH_SIZE", "100"))
+    # Parsed resumes kept in memory per process, keyed by file hash (all of them are also kept in the database)
+    resume_cache_size: int = int(os.getenv("RESUME_CACHE_SIZE", "256"))
+    # Largest submission accepted for execution (bytes of source)
+    max_source_bytes: int = int(os.getenv("MAX_SOURCE_BYTES", str(64 * 1024)))
+    # Bytes a program may write to stdout or stderr before it is killed
+    max_output_bytes: int = int(os.getenv("MAX_OUTPUT_BYTES", str(1024 * 1024)))
+    # Performance cases: time budget as a multiple of the reference solution's time on this host,
+    # and the share of a coding question's score awarded for staying within those budgets
+    performance_slowdown: float = float(os.getenv("PERFORMANCE_SLOWDOWN", "3"))
+    performance_weight: float = float(os.getenv("PERFORMANCE_WEIGHT", "0.3"))
+    # Stop grading a submission at its first failing test case
+    graded_fail_fast: bool = os.getenv("GRADED_FAIL_FAST", "false").lower() == "true"
     
     class Config:
         env_file = ".env"
@@ -52,3 +52,14 @@ async def startup_event():
         Base.metadata.create_all(bind=engine)
     except Exception as e:
         print(f"Database initialization error: {e}")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    from app.services.python_pool import shutdown_python_pool
+    from app.services.node_pool import shutdown_node_pool
+    from app.services.execution_telemetry import telemetry
+    from app.services.resume_pool import shutdown_resume_pool
+    shutdown_python_pool()
+    shutdown_node_pool()
+    shutdown_resume_pool()
+    telemetry.shutdown()
@@ -1,11 +1,11 @@
 from app.models.models import (
     User, UserRole, CandidateProfile, CandidateStatus, RankingCategory,
     JobDescription, Question, Assessment, QuestionResponse,
-    ProctoringEvent, FinalEvaluation
+    ProctoringEvent, FinalEvaluation, QuestionExecutionStats, ParsedResumeCache
 )
 
 __all__ = [
     "User", "UserRole", "CandidateProfile", "CandidateStatus", "RankingCategory",
     "JobDescription", "Question", "Assessment", "QuestionResponse",
-    "ProctoringEvent", "FinalEvaluation"
+    "ProctoringEvent", "FinalEvaluation", "QuestionExecutionStats", "ParsedResumeCache"
 ]
@@ -164,3 +164,28 @@ class FinalEvaluation(Base):
     
     # Relationships
     candidate = relationship("CandidateProfile", back_populates="final_evaluation")
+
+class QuestionExecutionStats(Base):
+    __tablename__ = "question_execution_stats"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    question_id = Column(Integer, ForeignKey("questions.id"), unique=True, index=True)
+    runs = Column(Integer, default=0)  # Submissions executed in a sandbox
+    cached_runs = Column(Integer, default=0)  # Answered from the result cache
+    rejected_runs = Column(Integer, default=0)  # Turned away by the prescreen
+    timeouts = Column(Integer, default=0)  # Runs with a timed-out or budget-skipped test case
+    timed_out_cases = Column(Integer, default=0)
+    runtime_histogram = Column(JSON)  # Runs per latency bucket (see execution_telemetry)
+    runtime_total_ms = Column(Float, default=0.0)
+    peak_memory_kb = Column(Integer)  # Highest peak RSS of any run
+    memory_total_kb = Column(Float, default=0.0)
+    memory_samples = Column(Integer, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class ParsedResumeCache(Base):
+    __tablename__ = "parsed_resume_cache"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    cache_key = Column(String(128), unique=True, index=True)  # SHA-256 of the file, its type and the parser version
+    parsed_resume = Column(JSON)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -10,6 +10,7 @@ class UserBase(BaseModel):
 class UserCreate(UserBase):
     password: str
     role: str = "candidate"
+    invite_token: Optional[str] = None  # Required to claim a bulk-imported candidate account
 
 class UserLogin(BaseModel):
     email: EmailStr
@@ -11,9 +11,18 @@ from app.models import User
 
 security = HTTPBearer()
 
+# Stored instead of a hash for accounts that cannot sign in until claimed (bulk-imported candidates)
+UNUSABLE_PASSWORD = "!"
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
+    if not hashed_password or hashed_password.startswith(UNUSABLE_PASSWORD):
+        return False
     return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
 
+def has_usable_password(user: User) -> bool:
+    """False for accounts nobody has signed up for yet: they can only be claimed through register, with an invite"""
+    return bool(user.hashed_password) and not user.hashed_password.startswith(UNUSABLE_PASSWORD)
+
 def get_password_hash(password: str) -> str:
     return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
 
@@ -27,6 +36,21 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     encoded_jwt = jwt.encode(to_encode, settings.secret_key, algorithm=settings.algorithm)
     return encoded_jwt
 
+def create_invite_token(user: User) -> str:
+    """
+    Token that lets its holder claim an account without a usable password; it
+    is only ever emailed to that account's address. It carries no "sub", so it
+    cannot be used to sign in.
+    """
+    return create_access_token(
+        data={"claim": user.id, "email": user.email},
+        expires_delta=timedelta(hours=settings.invite_token_expire_hours)
+    )
+
+def verify_invite_token(token: Optional[str], user: User) -> bool:
+    payload = decode_token(token) if token else None
+    return payload is not None and payload.get("claim") == user.id and payload.get("email") == user.email
+
 def decode_token(token: str) -> Optional[dict]:
     try:
         payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
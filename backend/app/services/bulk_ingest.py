@@ -0,0 +1,315 @@
+"""
+Bulk resume ingestion from a zip archive or a directory.
+
+Used by the recruiter bulk upload endpoint and by ingest_resumes.py. Files are
+read one at a time as parse slots free up, so only a small window of documents
+is ever in memory whatever the archive size. Each one goes through the parse
+cache and the resume parser pool; parsed resumes are saved as candidate users
+and profiles in batches of BULK_INGEST_BATCH_SIZE, one transaction per batch.
+Progress comes back as a stream of event dicts (see ingest_resumes). File reads
+and database work run in the threadpool, off the event loop.
+
+Imported candidates get accounts without a password: nobody can sign in to one
+until its owner registers with that email and the invite a recruiter sends it
+(see auth.register and the recruiter invite route). An import only
+ever updates candidates that came from an import and are still unclaimed; a
+resume whose email belongs to a registered account is reported as failed.
+"""
+import asyncio
+import json
+import os
+import time
+import zipfile
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import CandidateProfile, ParsedResumeCache, User, UserRole
+from app.services.auth_service import UNUSABLE_PASSWORD, has_usable_password
+from app.services.resume_cache import cached_parse, is_cacheable, parse_cache, resume_cache_key
+from app.services.resume_pool import parse_in_pool
+from app.services.resume_service import parse_resume_from_bytes
+
+RESUME_EXTENSIONS = ('.pdf', '.docx', '.doc')
+# Larger files are reported as failed instead of being read into memory
+MAX_RESUME_BYTES = 10 * 1024 * 1024
+# Resumes without an email get a placeholder address derived from the file hash,
+# so ingesting the same file again updates the same candidate
+PLACEHOLDER_EMAIL_DOMAIN = "bulk-import.invalid"
+
+
+def _is_resume(name: str) -> bool:
+    base = os.path.basename(name)
+    return (
+        not base.startswith('.')
+        and '__MACOSX' not in name.split('/')
+        and os.path.splitext(base)[1].lower() in RESUME_EXTENSIONS
+    )
+
+
+class ResumeSource:
+    """Resume files in a zip archive or a directory tree, listed up front and read on demand"""
+
+    def __init__(self, label: str, names: List[str], read: Callable[[str], bytes], close: Callable[[], None] = None):
+        self.label = label
+        self.names = names
+        self._read = read
+        self._close = close
+
+    @classmethod
+    def from_zip(cls, fileobj: BinaryIO, label: str) -> "ResumeSource":
+        archive = zipfile.ZipFile(fileobj)
+        names = [info.filename for info in archive.infolist() if not info.is_dir() and _is_resume(info.filename)]
+
+        def read(name: str) -> bytes:
+            # Decompress at most one byte past the cap, whatever size the entry claims
+            with archive.open(name) as entry:
+                return _capped(entry.read(MAX_RESUME_BYTES + 1))
+
+        return cls(label, names, read, archive.close)
+
+    @classmethod
+    def from_directory(cls, path: str) -> "ResumeSource":
+        names = []
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for filename in sorted(files):
+                name = os.path.relpath(os.path.join(root, filename), path).replace(os.sep, '/')
+                if _is_resume(name):
+                    names.append(name)
+
+        def read(name: str) -> bytes:
+            with open(os.path.join(path, name), 'rb') as f:
+                return _capped(f.read(MAX_RESUME_BYTES + 1))
+
+        return cls(os.path.basename(os.path.abspath(path)), names, read)
+
+    @classmethod
+    def open(cls, path: str) -> "ResumeSource":
+        """A directory, or a zip archive on disk"""
+        if os.path.isdir(path):
+            return cls.from_directory(path)
+        if zipfile.is_zipfile(path):
+            return cls.from_zip(open(path, 'rb'), os.path.basename(path))
+        raise ValueError(f"{path} is neither a directory nor a zip archive")
+
+    @property
+    def total(self) -> int:
+        return len(self.names)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def read(self, name: str) -> bytes:
+        return self._read(name)
+
+    def close(self):
+        if self._close is not None:
+            self._close()
+
+
+def _capped(content: bytes) -> bytes:
+    if len(content) > MAX_RESUME_BYTES:
+        raise ValueError(f"File is larger than {MAX_RESUME_BYTES // (1024 * 1024)} MB")
+    return content
+
+
+def _read_entry(source: ResumeSource, name: str):
+    """(content, cache key, stored parse or None) of one file; blocking, run in the threadpool"""
+    content = source.read(name)
+    key = resume_cache_key(content, name)
+    # Lookups run side by side in the threadpool, so each gets its own session
+    db = SessionLocal()
+    try:
+        return content, key, cached_parse(db, key)
+    finally:
+        db.close()
+
+
+async def _parse_entry(source: ResumeSource, name: str) -> Dict[str, Any]:
+    try:
+        content, key, parsed = await run_in_threadpool(_read_entry, source, name)
+        cached = parsed is not None
+        if parsed is None:
+            parsed = await parse_in_pool(parse_resume_from_bytes, content, os.path.basename(name))
+    except Exception as e:
+        return {"file": name, "error": str(e) or type(e).__name__}
+    return {"file": name, "key": key, "cached": cached, "parsed": parsed, "error": parsed.get("error")}
+
+
+def _candidate_email(item: Dict[str, Any]) -> str:
+    email = ((item["parsed"].get("contact_info") or {}).get("email") or "").strip().lower()
+    return email or f"resume-{item['key'][:16]}@{PLACEHOLDER_EMAIL_DOMAIN}"
+
+
+def _candidate_name(item: Dict[str, Any]) -> str:
+    name = (item["parsed"].get("name") or "").strip()
+    return (name or os.path.splitext(os.path.basename(item["file"]))[0])[:255]
+
+
+def _write_batch(db: Session, batch: List[Dict[str, Any]], label: str) -> Dict[str, Any]:
+    """
+    Save one batch of parsed resumes in a single transaction; returns its "batch"
+    event. Blocking, run in the threadpool.
+    """
+    # Several files with one email: the last one wins, as if uploaded in turn
+    by_email = {_candidate_email(item): item for item in batch}
+    failed = []
+    created = updated = 0
+    try:
+        users = {user.email: user for user in db.query(User).filter(User.email.in_(list(by_email)))}
+        new_users = []
+        for email, item in list(by_email.items()):
+            user = users.get(email)
+            if user is None:
+                user = User(
+                    email=email,
+                    full_name=_candidate_name(item),
+                    hashed_password=UNUSABLE_PASSWORD,
+                    role=UserRole.CANDIDATE.value
+                )
+                users[email] = user
+                new_users.append(user)
+            elif user.role != UserRole.CANDIDATE.value:
+                failed.append({"file": item["file"], "error": f"{email} belongs to a {user.role} account"})
+                del by_email[email]
+            elif has_usable_password(user):
+                # Registered by the candidate: their own profile is never replaced by an import
+                failed.append({"file": item["file"], "error": f"{email} belongs to a registered candidate"})
+                del by_email[email]
+        db.add_all(new_users)
+        db.flush()
+
+        user_ids = [users[email].id for email in by_email]
+        profiles = {
+            profile.user_id: profile
+            for profile in db.query(CandidateProfile).filter(CandidateProfile.user_id.in_(user_ids))
+        }
+        new_profiles = []
+        for email, item in by_email.items():
+            user_id = users[email].id
+            profile = profiles.get(user_id)
+            if profile is None:
+                profile = CandidateProfile(user_id=user_id)
+                new_profiles.append(profile)
+                created += 1
+            else:
+                updated += 1
+            profile.resume_path = f"bulk://{label}/{item['file']}"
+            profile.parsed_resume = item["parsed"]
+        db.add_all(new_profiles)
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        print(f"Bulk ingest batch error: {e}")
+        return {
+            "event": "batch",
+            "saved": 0,
+            "created": 0,
+            "updated": 0,
+            "failed": [{"file": item["file"], "error": "Could not save candidate"} for item in batch]
+        }
+
+    _store_parses(db, batch)
+    return {"event": "batch", "saved": created + updated, "created": created, "updated": updated, "failed": failed}
+
+
+def _store_parses(db: Session, items: List[Dict[str, Any]]):
+    """Add this batch's fresh, successful parses to the parse cache, in a transaction of their own"""
+    fresh = {item["key"]: item["parsed"] for item in items if not item["cached"] and is_cacheable(item["parsed"])}
+    if not fresh:
+        return
+    try:
+        stored = {
+            row.cache_key
+            for row in db.query(ParsedResumeCache.cache_key).filter(ParsedResumeCache.cache_key.in_(list(fresh)))
+        }
+        db.add_all([
+            ParsedResumeCache(cache_key=key, parsed_resume=parsed)
+            for key, parsed in fresh.items() if key not in stored
+        ])
+        db.commit()
+    except SQLAlchemyError as e:
+        # The candidates are saved already; a missing cache entry only costs a re-parse
+        db.rollback()
+        print(f"Resume cache write error: {e}")
+    for key, parsed in fresh.items():
+        parse_cache.put(key, parsed)
+
+
+async def ingest_resumes(source: ResumeSource, batch_size: Optional[int] = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Parse every resume in source and save a candidate for each. Yields:
+        {"event": "file", "file", "status": "parsed" | "failed", "error", "processed", "total"}
+        {"event": "batch", "saved", "created", "updated", "failed": [{"file", "error"}]}
+        {"event": "done", "total", "parsed", "saved", "failed", "elapsed_ms"}
+    File events arrive in completion order. Candidates are found (or created)
+    by the email on their resume.
+    """
+    batch_size = batch_size or settings.bulk_ingest_batch_size
+    # Enough documents in flight to keep every parser busy, and no more
+    window = 2 * max(1, settings.resume_pool_size)
+    started = time.monotonic()
+    counts = {"processed": 0, "parsed": 0, "saved": 0, "failed": 0}
+    db = SessionLocal()
+    names = iter(source)
+    exhausted = False
+    pending = set()
+    batch: List[Dict[str, Any]] = []
+    try:
+        while True:
+            while not exhausted and len(pending) < window:
+                name = next(names, None)
+                if name is None:
+                    exhausted = True
+                else:
+                    pending.add(asyncio.ensure_future(_parse_entry(source, name)))
+            if not pending:
+                break
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                item = task.result()
+                counts["processed"] += 1
+                if item["error"]:
+                    counts["failed"] += 1
+                else:
+                    counts["parsed"] += 1
+                    batch.append(item)
+                yield {
+                    "event": "file",
+                    "file": item["file"],
+                    "status": "failed" if item["error"] else "parsed",
+                    "error": item["error"],
+                    "processed": counts["processed"],
+                    "total": source.total
+                }
+            if len(batch) >= batch_size or (batch and exhausted and not pending):
+                event = await run_in_threadpool(_write_batch, db, batch, source.label)
+                counts["saved"] += event["saved"]
+                counts["failed"] += len(event["failed"])
+                batch = []
+                yield event
+
+        yield {
+            "event": "done",
+            "total": source.total,
+            "parsed": counts["parsed"],
+            "saved": counts["saved"],
+            "failed": counts["failed"],
+            "elapsed_ms": round((time.monotonic() - started) * 1000, 2)
+        }
+    finally:
+        # The consumer went away (e.g. the client disconnected): drop what is still parsing
+        for task in pending:
+            task.cancel()
+        db.close()
+
+
+def sse_event(event: Dict[str, Any]) -> str:
+    """One ingest event as a server-sent event frame"""
+    payload = {key: value for key, value in event.items() if key != "event"}
+    return f"event: {event['event']}\ndata: {json.dumps(payload, default=str)}\n\n"
@@ -2,234 +2,1037 @@ import subprocess
 import tempfile
 import os
 import time
-import platform
-from typing import Dict, List, Any, Optional
+import copy
+import hashlib
+import json
+import math
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager, nullcontext
+from functools import partial
+from typing import Callable, Dict, List, Any, Optional, Tuple
 import sys
 
-# Only import resource on Unix-like systems
-if platform.system() != 'Windows':
-    import resource
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.services.process_runner import OUTPUT_WINDOW_BYTES, OutputLimitExceeded, RunResult, run_process
+from app.services.output_checkers import OutputChecker, get_checker
+from app.services.python_pool import get_python_pool
+from app.services.node_pool import get_node_pool
+from app.services.code_prescreen import prescreen_code, prescreen_cache, suite_digest
+from app.services.compiled_runner import (
+    COMPILED_ALIASES, Artifact, artifact_cache, canonical_language, run_artifact
+)
+from app.services.python_harness import HarnessReader, is_function_style, build_harness, harness_input
+from app.services.execution_scheduler import (
+    ExecutionScheduler, PRIORITY_GRADED, PRIORITY_PRACTICE
+)
+from app.services.executor_client import get_executor_client
+from app.services.execution_telemetry import telemetry
 
 # Timeout for code execution (seconds)
 EXECUTION_TIMEOUT = 10
 # Max memory (bytes) - 128MB
 MAX_MEMORY = 128 * 1024 * 1024
+# Most memory a test case may ask for (bytes) - 512MB
+MAX_MEMORY_CAP = 512 * 1024 * 1024
+
+BUDGET_EXHAUSTED = "Skipped: suite time budget exhausted"
+
+PYTHON_ALIASES = ["python", "py", "python3"]
+JAVASCRIPT_ALIASES = ["javascript", "js", "node"]
 
-def execute_python_code(code: str, test_cases: Optional[List[Dict]] = None) -> Dict[str, Any]:
+class SuiteBudget:
     """
-    Execute Python code in a sandboxed environment.
-    Returns execution result with output, errors, and test results.
+    Run-time budget of one suite. The clock only runs while at least one of
+    the suite's cases is running: time spent waiting for a case-pool thread is
+    not charged, and cases running side by side are charged once.
     """
-    start_time = time.time()
     
-    # Create temporary file for the code
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self._spent = 0.0
+        self._running = 0
+        self._since = 0.0
+        self._lock = threading.Lock()
+    
+    def remaining(self) -> float:
+        with self._lock:
+            spent = self._spent + (time.monotonic() - self._since if self._running else 0)
+        return self.seconds - spent
+    
+    def exhausted(self) -> bool:
+        return self.remaining() <= 0
+    
+    @contextmanager
+    def running(self):
+        """Charge the budget for the duration of the block"""
+        with self._lock:
+            if self._running == 0:
+                self._since = time.monotonic()
+            self._running += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._running -= 1
+                if self._running == 0:
+                    self._spent += time.monotonic() - self._since
+
+class ExecutionLimits:
+    """
+    Limits for one submission: a per-case timeout (wall clock and RLIMIT_CPU),
+    a memory cap, and a run-time budget for the whole suite after which the
+    remaining cases are skipped (and flagged "budget_exhausted"). Test cases
+    may set their own "time_limit" (seconds) and "memory_limit_mb", up to
+    EXECUTION_TIMEOUT and MAX_MEMORY_CAP.
+    """
+    
+    def __init__(
+        self,
+        case_timeout: float = EXECUTION_TIMEOUT,
+        memory_bytes: int = MAX_MEMORY,
+        suite_budget: Optional[float] = None
+    ):
+        self.suite_budget = min(suite_budget or settings.max_suite_seconds, settings.max_suite_seconds)
+        self.case_timeout = min(case_timeout, EXECUTION_TIMEOUT, self.suite_budget)
+        self.memory_bytes = min(memory_bytes, MAX_MEMORY_CAP)
+    
+    @classmethod
+    def for_suite(cls, test_cases: Optional[List[Dict]]) -> "ExecutionLimits":
+        """
+        Limits for a question's suite: the budget is the sum of its cases' own
+        time limits, at most MAX_SUITE_SECONDS. A question's time_limit_seconds
+        is the candidate's answer time and plays no part.
+        """
+        defaults = cls()
+        return cls(suite_budget=sum(defaults.timeout_for(test_case) for test_case in test_cases or []) or None)
+    
+    def budget(self) -> SuiteBudget:
+        """A fresh budget for one run of the suite"""
+        return SuiteBudget(self.suite_budget)
+    
+    def timeout_for(self, test_case: Dict, budget: Optional[SuiteBudget] = None) -> float:
+        """Timeout for one case, cut short when the suite budget runs out first"""
+        timeout = min(float(test_case.get("time_limit") or self.case_timeout), EXECUTION_TIMEOUT)
+        if budget is not None:
+            timeout = min(timeout, budget.remaining())
+        return max(timeout, 0.01)
+    
+    def memory_for(self, test_case: Dict) -> int:
+        memory_mb = test_case.get("memory_limit_mb")
+        if not memory_mb:
+            return self.memory_bytes
+        return min(int(memory_mb) * 1024 * 1024, MAX_MEMORY_CAP)
+    
+    def as_params(self) -> Dict[str, float]:
+        """Constructor arguments, for sending the limits to the executor daemon"""
+        return {
+            "case_timeout": self.case_timeout,
+            "memory_bytes": self.memory_bytes,
+            "suite_budget": self.suite_budget
+        }
+    
+    def key(self) -> List[float]:
+        return [self.case_timeout, self.memory_bytes, self.suite_budget]
+    
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "case_timeout_seconds": self.case_timeout,
+            "memory_mb": self.memory_bytes // (1024 * 1024),
+            "suite_budget_seconds": self.suite_budget
+        }
+
+class ResultCache:
+    """
+    LRU cache of execution results keyed by a content hash of the submission.
+    Entries expire after ttl_seconds; the oldest entry is evicted past max_entries.
+    """
+    
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.monotonic() - entry[0] > self.ttl_seconds:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry[1])
+    
+    def put(self, key: str, result: Dict[str, Any]):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), copy.deepcopy(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+result_cache = ResultCache(settings.result_cache_size, settings.result_cache_ttl_seconds)
+
+# Shared pool driving test-case processes; its size is the global concurrency cap
+_case_pool = ThreadPoolExecutor(max_workers=settings.max_concurrent_cases, thread_name_prefix="test-case")
+# Submissions wait here for one of the execution slots; async routes never block the event loop
+scheduler = ExecutionScheduler(settings.max_concurrent_submissions, settings.execution_queue_size)
+
+def _cpu_limit(timeout: float) -> int:
+    """RLIMIT_CPU for a run: the wall-clock timeout, rounded up to whole seconds"""
+    return math.ceil(timeout)
+
+def _run_python(
+    code: str,
+    stdin: Optional[str] = None,
+    timeout: float = EXECUTION_TIMEOUT,
+    checker: Optional[OutputChecker] = None,
+    output_limit: Optional[int] = None,
+    memory_bytes: int = MAX_MEMORY
+) -> RunResult:
+    """
+    Run Python code on a warm pool worker, or a fresh interpreter if the pool is unavailable.
+    RLIMIT_CPU, RLIMIT_AS (memory_bytes) and the output cap are enforced either way.
+    """
+    output_limit = output_limit or settings.max_output_bytes
+    pool = get_python_pool()
+    if pool is not None:
+        return pool.run(code, stdin, timeout, _cpu_limit(timeout), memory_bytes, checker, output_limit)
+    
     with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
         f.write(code)
         temp_file = f.name
+    try:
+        return run_process(
+            [sys.executable, temp_file],
+            stdin,
+            timeout,
+            cpu_seconds=_cpu_limit(timeout),
+            memory_bytes=memory_bytes,
+            cwd=tempfile.gettempdir(),
+            checker=checker,
+            output_limit=output_limit
+        )
+    finally:
+        try:
+            os.unlink(temp_file)
+        except:
+            pass
+
+def _run_python_case(
+    code: str,
+    i: int,
+    test_case: Dict,
+    limits: ExecutionLimits,
+    budget: Optional[SuiteBudget] = None
+) -> Dict[str, Any]:
+    """Run one Python test case and grade its output"""
+    test_input = test_case.get("input", "")
+    expected_output = str(test_case.get("expected_output", "")).strip()
     
     try:
-        result = {
-            "success": False,
-            "output": "",
-            "error": None,
-            "test_results": [],
-            "execution_time_ms": 0
+        # stdout is graded as it streams in (see output_checkers); only its head and tail are kept
+        proc = _run_python(
+            code,
+            test_input,
+            limits.timeout_for(test_case, budget),
+            checker=get_checker(test_case),
+            memory_bytes=limits.memory_for(test_case)
+        )
+        
+        actual_output = proc.stdout.strip()
+        return {
+            "test_case": i + 1,
+            "input": test_input[:100],  # Truncate for display
+            "expected": expected_output[:100],
+            "actual": actual_output[:100],
+            "passed": proc.matched,
+            "error": proc.stderr if proc.stderr else None,
+            **proc.usage
         }
         
-        # If no test cases, just run the code
-        if not test_cases:
-            try:
-                proc = subprocess.run(
-                    [sys.executable, temp_file],
-                    capture_output=True,
-                    text=True,
-                    timeout=EXECUTION_TIMEOUT,
-                    cwd=tempfile.gettempdir()
-                )
-                
-                result["output"] = proc.stdout
-                result["error"] = proc.stderr if proc.stderr else None
-                result["success"] = proc.returncode == 0
-                
-            except subprocess.TimeoutExpired:
-                result["error"] = "Execution timed out (limit: 10 seconds)"
-            except Exception as e:
-                result["error"] = str(e)
+    except subprocess.TimeoutExpired:
+        return {"test_case": i + 1, "passed": False, "error": "Timeout"}
+    except OutputLimitExceeded:
+        return {"test_case": i + 1, "passed": False, "error": "Output limit exceeded"}
+    except Exception as e:
+        return {"test_case": i + 1, "passed": False, "error": str(e)}
+
+def _run_python_harness(
+    code: str,
+    test_cases: List[Dict],
+    fail_fast: bool,
+    limits: ExecutionLimits,
+    budget: Optional[SuiteBudget]
+) -> List[Dict[str, Any]]:
+    """Run every function-style test case from one interpreter (see python_harness)"""
+    timeouts = [limits.timeout_for(test_case) for test_case in test_cases]
+    # Graded here as the harness streams each case's output back; results of
+    # cases that finished survive the process being stopped
+    reader = HarnessReader(test_cases)
+    try:
+        # Per-case timeouts inside the harness fire first; the process itself stops at the suite budget.
+        # Each case's output is capped inside the harness; the process cap bounds the whole stream.
+        timeout = sum(timeouts) + 1
+        if budget is not None:
+            timeout = min(timeout, budget.remaining())
+        with budget.running() if budget is not None else nullcontext():
+            proc = _run_python(
+                build_harness(code, limits.case_timeout, settings.max_output_bytes),
+                harness_input(test_cases, timeouts),
+                timeout,
+                checker=reader,
+                output_limit=settings.max_output_bytes + 4096 * len(test_cases),
+                memory_bytes=max(limits.memory_for(test_case) for test_case in test_cases)
+            )
+        process_error = proc.stderr or "Test harness exited early"
+    except (subprocess.TimeoutExpired, OutputLimitExceeded) as e:
+        if isinstance(e, OutputLimitExceeded):
+            process_error = "Output limit exceeded"
         else:
-            # Run with test cases
-            test_results = []
-            all_passed = True
-            
-            for i, test_case in enumerate(test_cases):
-                test_input = test_case.get("input", "")
-                expected_output = str(test_case.get("expected_output", "")).strip()
-                
-                try:
-                    proc = subprocess.run(
-                        [sys.executable, temp_file],
-                        input=test_input,
-                        capture_output=True,
-                        text=True,
-                        timeout=EXECUTION_TIMEOUT,
-                        cwd=tempfile.gettempdir()
-                    )
-                    
-                    actual_output = proc.stdout.strip()
-                    passed = actual_output == expected_output
-                    
-                    if not passed:
-                        all_passed = False
-                    
-                    test_results.append({
-                        "test_case": i + 1,
-                        "input": test_input[:100],  # Truncate for display
-                        "expected": expected_output[:100],
-                        "actual": actual_output[:100],
-                        "passed": passed,
-                        "error": proc.stderr if proc.stderr else None
-                    })
-                    
-                except subprocess.TimeoutExpired:
-                    test_results.append({
-                        "test_case": i + 1,
-                        "passed": False,
-                        "error": "Timeout"
-                    })
-                    all_passed = False
-                except Exception as e:
-                    test_results.append({
-                        "test_case": i + 1,
-                        "passed": False,
-                        "error": str(e)
-                    })
-                    all_passed = False
-            
-            result["test_results"] = test_results
-            result["success"] = all_passed
-            result["output"] = f"Passed {sum(1 for t in test_results if t['passed'])}/{len(test_results)} test cases"
+            process_error = BUDGET_EXHAUSTED if budget is not None and budget.exhausted() else "Timeout"
+    except Exception as e:
+        process_error = str(e)
+    outputs = reader.results
+    
+    test_results = []
+    failed = False
+    for i, test_case in enumerate(test_cases):
+        if "function" in test_case:
+            test_input = f"{test_case['function']}(*{test_case.get('args', [])})"
+        else:
+            test_input = test_case.get("input", "")
+        expected_output = str(test_case.get("expected_output", "")).strip()
         
-        result["execution_time_ms"] = round((time.time() - start_time) * 1000, 2)
-        return result
+        if failed:
+            test_results.append({"test_case": i + 1, "passed": False, "error": "Skipped after an earlier failure"})
+        elif outputs[i] is not None:
+            test_results.append({
+                "test_case": i + 1,
+                "input": test_input[:100],  # Truncate for display
+                "expected": expected_output[:100],
+                "actual": outputs[i]["output"][:100],
+                "passed": outputs[i]["error"] not in ("Timeout", "Output limit exceeded") and outputs[i]["matched"],
+                "error": outputs[i]["error"],
+                **outputs[i]["usage"]
+            })
+        elif process_error == BUDGET_EXHAUSTED:
+            test_results.append(_budget_exhausted(i))
+        else:
+            test_results.append({"test_case": i + 1, "passed": False, "error": process_error})
         
+        if fail_fast and not test_results[-1]["passed"]:
+            failed = True
+    
+    return test_results
+
+def _run_javascript(
+    code: str,
+    stdin: Optional[str] = None,
+    checker: Optional[OutputChecker] = None,
+    timeout: float = EXECUTION_TIMEOUT,
+    memory_bytes: int = MAX_MEMORY
+) -> RunResult:
+    """
+    Run JavaScript on a persistent pool worker, or a fresh node process if the
+    pool is unavailable. Memory is capped with V8's heap size flag rather than
+    RLIMIT_AS, since V8 reserves far more address space than it uses. Pool
+    workers share one MAX_MEMORY heap, so memory_bytes only binds fresh processes.
+    """
+    pool = get_node_pool(MAX_MEMORY // (1024 * 1024))
+    if pool is not None:
+        return pool.run(code, stdin, timeout, checker, settings.max_output_bytes)
+    
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.js', delete=False) as f:
+        f.write(code)
+        temp_file = f.name
+    try:
+        return run_process(
+            ["node", f"--max-old-space-size={memory_bytes // (1024 * 1024)}", temp_file],
+            stdin,
+            timeout,
+            cpu_seconds=_cpu_limit(timeout),
+            cwd=tempfile.gettempdir(),
+            checker=checker,
+            output_limit=settings.max_output_bytes
+        )
     finally:
-        # Clean up temp file
         try:
             os.unlink(temp_file)
         except:
             pass
 
-def execute_javascript_code(code: str, test_cases: Optional[List[Dict]] = None) -> Dict[str, Any]:
-    """Execute JavaScript code using Node.js"""
-    start_time = time.time()
-    
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.js', delete=False) as f:
-        f.write(code)
-        temp_file = f.name
+def _run_javascript_case(
+    code: str,
+    i: int,
+    test_case: Dict,
+    limits: ExecutionLimits,
+    budget: Optional[SuiteBudget] = None
+) -> Dict[str, Any]:
+    """Run one JavaScript test case and grade its output"""
+    test_input = test_case.get("input", "")
+    expected_output = str(test_case.get("expected_output", "")).strip()
     
     try:
-        result = {
-            "success": False,
-            "output": "",
-            "error": None,
-            "test_results": [],
-            "execution_time_ms": 0
+        proc = _run_javascript(
+            code,
+            test_input,
+            get_checker(test_case),
+            limits.timeout_for(test_case, budget),
+            limits.memory_for(test_case)
+        )
+        
+        actual_output = proc.stdout.strip()
+        return {
+            "test_case": i + 1,
+            "passed": proc.matched,
+            "expected": expected_output[:100],
+            "actual": actual_output[:100],
+            **proc.usage
         }
         
-        if not test_cases:
+    except subprocess.TimeoutExpired:
+        return {"test_case": i + 1, "passed": False, "error": "Timeout"}
+    except OutputLimitExceeded:
+        return {"test_case": i + 1, "passed": False, "error": "Output limit exceeded"}
+    except Exception as e:
+        return {"test_case": i + 1, "passed": False, "error": str(e)}
+
+def _total_usage(test_results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Suite totals: summed CPU and wall time, highest peak RSS"""
+    def total(key):
+        values = [t[key] for t in test_results if t.get(key) is not None]
+        return round(sum(values), 2) if values else None
+    
+    peaks = [t["peak_memory_kb"] for t in test_results if t.get("peak_memory_kb") is not None]
+    return {
+        "cpu_user_ms": total("cpu_user_ms"),
+        "cpu_system_ms": total("cpu_system_ms"),
+        "peak_memory_kb": max(peaks) if peaks else None,
+        "wall_time_ms": total("wall_time_ms")
+    }
+
+def _budget_exhausted(i: int) -> Dict[str, Any]:
+    """Result of a case the suite budget left no time for"""
+    return {"test_case": i + 1, "passed": False, "error": BUDGET_EXHAUSTED, "budget_exhausted": True}
+
+def _run_test_cases(
+    test_cases: List[Dict],
+    run_case: Callable[[int, Dict], Dict[str, Any]],
+    fail_fast: bool = False,
+    budget: Optional[SuiteBudget] = None
+) -> List[Dict[str, Any]]:
+    """
+    Run the test cases of one submission in parallel on the shared case pool.
+    At most max_parallel_cases of them are in flight at once, and the pool itself
+    caps concurrent cases across all submissions. Results keep test case order.
+    With fail_fast, cases not yet started are skipped after the first failure;
+    cases not started before the budget is spent are skipped as over it.
+    """
+    test_results: List[Optional[Dict[str, Any]]] = [None] * len(test_cases)
+    in_flight = {}
+    next_case = 0
+    failed = False
+    
+    def out_of_budget() -> bool:
+        return budget is not None and budget.exhausted()
+    
+    def budgeted_case(i: int, test_case: Dict) -> Dict[str, Any]:
+        # Cases of this suite that ran while it waited for a pool thread may have spent the budget
+        if out_of_budget():
+            return _budget_exhausted(i)
+        if budget is None:
+            return run_case(i, test_case)
+        with budget.running():
+            test_result = run_case(i, test_case)
+        if test_result.get("error") == "Timeout" and out_of_budget():
+            # Cut short by the suite budget rather than its own time limit
+            test_result.update(error=BUDGET_EXHAUSTED, budget_exhausted=True)
+        return test_result
+    
+    while in_flight or (next_case < len(test_cases) and not failed and not out_of_budget()):
+        while (not failed and not out_of_budget() and next_case < len(test_cases)
+               and len(in_flight) < settings.max_parallel_cases):
+            future = _case_pool.submit(budgeted_case, next_case, test_cases[next_case])
+            in_flight[future] = next_case
+            next_case += 1
+        
+        if not in_flight:
+            break
+        done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+        for future in done:
+            i = in_flight.pop(future)
             try:
-                proc = subprocess.run(
-                    ["node", temp_file],
-                    capture_output=True,
-                    text=True,
-                    timeout=EXECUTION_TIMEOUT,
-                    cwd=tempfile.gettempdir()
-                )
-                
-                result["output"] = proc.stdout
-                result["error"] = proc.stderr if proc.stderr else None
-                result["success"] = proc.returncode == 0
-                
-            except subprocess.TimeoutExpired:
-                result["error"] = "Execution timed out"
-            except FileNotFoundError:
-                result["error"] = "Node.js not installed"
+                test_results[i] = future.result()
             except Exception as e:
-                result["error"] = str(e)
+                test_results[i] = {"test_case": i + 1, "passed": False, "error": str(e)}
+            if fail_fast and not test_results[i]["passed"]:
+                failed = True
+    
+    for i, test_result in enumerate(test_results):
+        if test_result is None:
+            if failed:
+                test_results[i] = {"test_case": i + 1, "passed": False, "error": "Skipped after an earlier failure"}
+            else:
+                test_results[i] = _budget_exhausted(i)
+    
+    return test_results
+
+def execute_python_code(
+    code: str,
+    test_cases: Optional[List[Dict]] = None,
+    fail_fast: bool = False,
+    limits: Optional[ExecutionLimits] = None
+) -> Dict[str, Any]:
+    """
+    Execute Python code in a sandboxed environment.
+    Returns execution result with output, errors, and test results.
+    """
+    start_time = time.time()
+    limits = limits or ExecutionLimits()
+    budget = limits.budget()
+    
+    result = {
+        "success": False,
+        "output": "",
+        "error": None,
+        "test_results": [],
+        "execution_time_ms": 0
+    }
+    
+    # If no test cases, just run the code
+    if not test_cases:
+        try:
+            proc = _run_python(code, timeout=limits.case_timeout, memory_bytes=limits.memory_bytes)
+            
+            result["output"] = proc.stdout
+            result["error"] = proc.stderr if proc.stderr else None
+            result["success"] = proc.returncode == 0
+            result["resource_usage"] = proc.usage
+            
+        except subprocess.TimeoutExpired:
+            result["error"] = f"Execution timed out (limit: {limits.case_timeout:g} seconds)"
+        except OutputLimitExceeded as e:
+            result["output"] = e.stdout
+            result["error"] = str(e)
+        except Exception as e:
+            result["error"] = str(e)
+    else:
+        # Run with test cases: function-style cases share one process, stdin cases get one each
+        if is_function_style(code, test_cases):
+            test_results = _run_python_harness(code, test_cases, fail_fast, limits, budget)
         else:
-            # Similar test case handling as Python
-            test_results = []
-            all_passed = True
+            test_results = _run_test_cases(
+                test_cases,
+                lambda i, test_case: _run_python_case(code, i, test_case, limits, budget),
+                fail_fast,
+                budget
+            )
+        
+        result["test_results"] = test_results
+        result["success"] = all(t["passed"] for t in test_results)
+        result["resource_usage"] = _total_usage(test_results)
+        result["output"] = f"Passed {sum(1 for t in test_results if t['passed'])}/{len(test_results)} test cases"
+    
+    result["execution_time_ms"] = round((time.time() - start_time) * 1000, 2)
+    return result
+
+def execute_javascript_code(
+    code: str,
+    test_cases: Optional[List[Dict]] = None,
+    fail_fast: bool = False,
+    limits: Optional[ExecutionLimits] = None
+) -> Dict[str, Any]:
+    """Execute JavaScript code using Node.js"""
+    start_time = time.time()
+    limits = limits or ExecutionLimits()
+    budget = limits.budget()
+    
+    result = {
+        "success": False,
+        "output": "",
+        "error": None,
+        "test_results": [],
+        "execution_time_ms": 0
+    }
+    
+    if not test_cases:
+        try:
+            proc = _run_javascript(code, timeout=limits.case_timeout, memory_bytes=limits.memory_bytes)
             
-            for i, test_case in enumerate(test_cases):
-                test_input = test_case.get("input", "")
-                expected_output = str(test_case.get("expected_output", "")).strip()
-                
-                try:
-                    proc = subprocess.run(
-                        ["node", temp_file],
-                        input=test_input,
-                        capture_output=True,
-                        text=True,
-                        timeout=EXECUTION_TIMEOUT
-                    )
-                    
-                    actual_output = proc.stdout.strip()
-                    passed = actual_output == expected_output
-                    
-                    if not passed:
-                        all_passed = False
-                    
-                    test_results.append({
-                        "test_case": i + 1,
-                        "passed": passed,
-                        "expected": expected_output[:100],
-                        "actual": actual_output[:100]
-                    })
-                    
-                except Exception as e:
-                    test_results.append({
-                        "test_case": i + 1,
-                        "passed": False,
-                        "error": str(e)
-                    })
-                    all_passed = False
+            result["output"] = proc.stdout
+            result["error"] = proc.stderr if proc.stderr else None
+            result["success"] = proc.returncode == 0
+            result["resource_usage"] = proc.usage
             
-            result["test_results"] = test_results
-            result["success"] = all_passed
+        except subprocess.TimeoutExpired:
+            result["error"] = "Execution timed out"
+        except OutputLimitExceeded as e:
+            result["output"] = e.stdout
+            result["error"] = str(e)
+        except FileNotFoundError:
+            result["error"] = "Node.js not installed"
+        except Exception as e:
+            result["error"] = str(e)
+    else:
+        # Similar test case handling as Python
+        test_results = _run_test_cases(
+            test_cases,
+            lambda i, test_case: _run_javascript_case(code, i, test_case, limits, budget),
+            fail_fast,
+            budget
+        )
         
-        result["execution_time_ms"] = round((time.time() - start_time) * 1000, 2)
-        return result
+        result["test_results"] = test_results
+        result["success"] = all(t["passed"] for t in test_results)
+        result["resource_usage"] = _total_usage(test_results)
+    
+    result["execution_time_ms"] = round((time.time() - start_time) * 1000, 2)
+    return result
+
+def _run_compiled_case(
+    artifact: Artifact,
+    language: str,
+    i: int,
+    test_case: Dict,
+    limits: ExecutionLimits,
+    budget: Optional[SuiteBudget] = None
+) -> Dict[str, Any]:
+    """Run one test case against a compiled artifact and grade its output"""
+    test_input = test_case.get("input", "")
+    expected_output = str(test_case.get("expected_output", "")).strip()
+    
+    try:
+        proc = run_artifact(
+            artifact,
+            language,
+            test_input,
+            limits.timeout_for(test_case, budget),
+            limits.memory_for(test_case),
+            get_checker(test_case)
+        )
+        
+        actual_output = proc.stdout.strip()
+        return {
+            "test_case": i + 1,
+            "input": test_input[:100],  # Truncate for display
+            "expected": expected_output[:100],
+            "actual": actual_output[:100],
+            "passed": proc.matched,
+            "error": proc.stderr if proc.stderr else None,
+            **proc.usage
+        }
         
+    except subprocess.TimeoutExpired:
+        return {"test_case": i + 1, "passed": False, "error": "Timeout"}
+    except OutputLimitExceeded:
+        return {"test_case": i + 1, "passed": False, "error": "Output limit exceeded"}
+    except Exception as e:
+        return {"test_case": i + 1, "passed": False, "error": str(e)}
+
+def execute_compiled_code(
+    code: str,
+    language: str,
+    test_cases: Optional[List[Dict]] = None,
+    fail_fast: bool = False,
+    limits: Optional[ExecutionLimits] = None
+) -> Dict[str, Any]:
+    """
+    Execute C, C++ or Java code. The source is compiled once (or taken from the
+    artifact cache) and every test case runs against that build. Compile and run
+    time are reported separately; "compile_cached" tells whether the build was reused.
+    """
+    start_time = time.time()
+    language = canonical_language(language)
+    limits = limits or ExecutionLimits()
+    
+    result = {
+        "success": False,
+        "output": "",
+        "error": None,
+        "test_results": [],
+        "execution_time_ms": 0
+    }
+    
+    artifact, compile_cached = artifact_cache.get_or_compile(language, code)
+    try:
+        return _run_compiled_suite(artifact, compile_cached, language, test_cases, fail_fast, limits, result, start_time)
     finally:
+        artifact_cache.release(artifact)
+
+def _run_compiled_suite(
+    artifact: Artifact,
+    compile_cached: bool,
+    language: str,
+    test_cases: Optional[List[Dict]],
+    fail_fast: bool,
+    limits: ExecutionLimits,
+    result: Dict[str, Any],
+    start_time: float
+) -> Dict[str, Any]:
+    """The part of execute_compiled_code that runs a held artifact"""
+    result["compile_time_ms"] = 0 if compile_cached else artifact.compile_time_ms
+    result["compile_cached"] = compile_cached
+    
+    if not artifact.ok:
+        result["error"] = f"Compilation error:\n{artifact.error}"
+        result["run_time_ms"] = 0
+        result["execution_time_ms"] = round((time.time() - start_time) * 1000, 2)
+        return result
+    
+    # Compilation is not charged to the suite budget
+    run_start = time.time()
+    budget = limits.budget()
+    if not test_cases:
         try:
-            os.unlink(temp_file)
-        except:
-            pass
+            proc = run_artifact(artifact, language, None, limits.case_timeout, limits.memory_bytes)
+            
+            result["output"] = proc.stdout
+            result["error"] = proc.stderr if proc.stderr else None
+            result["success"] = proc.returncode == 0
+            result["resource_usage"] = proc.usage
+            
+        except subprocess.TimeoutExpired:
+            result["error"] = f"Execution timed out (limit: {limits.case_timeout:g} seconds)"
+        except OutputLimitExceeded as e:
+            result["output"] = e.stdout
+            result["error"] = str(e)
+        except Exception as e:
+            result["error"] = str(e)
+    else:
+        test_results = _run_test_cases(
+            test_cases,
+            lambda i, test_case: _run_compiled_case(artifact, language, i, test_case, limits, budget),
+            fail_fast,
+            budget
+        )
+        
+        result["test_results"] = test_results
+        result["success"] = all(t["passed"] for t in test_results)
+        result["resource_usage"] = _total_usage(test_results)
+        result["output"] = f"Passed {sum(1 for t in test_results if t['passed'])}/{len(test_results)} test cases"
+    
+    result["run_time_ms"] = round((time.time() - run_start) * 1000, 2)
+    result["execution_time_ms"] = round((time.time() - start_time) * 1000, 2)
+    return result
 
-def execute_code(code: str, language: str, test_cases: Optional[List[Dict]] = None) -> Dict[str, Any]:
-    """Execute code in specified language"""
+def reference_output(code: str, language: str, test_case: Dict) -> str:
+    """
+    Full stdout of a trusted reference solution on one test case, used to derive
+    the expected output of generated inputs (see performance_cases). Raises
+    ValueError if the reference fails or prints more than OUTPUT_WINDOW_BYTES.
+    """
     language = language.lower()
+    stdin = test_case.get("input", "")
+    try:
+        if language in PYTHON_ALIASES:
+            if "function" in test_case:
+                # Same call the harness makes: print the return value unless it is None
+                call = f"{test_case['function']}(*{test_case.get('args', [])!r}, **{test_case.get('kwargs', {})!r})"
+                proc = _run_python(f"{code}\n\n_value = {call}\nif _value is not None:\n    print(_value)\n")
+            elif is_function_style(code, [test_case]):
+                proc = _run_python(f"{code}\n\n{stdin}\n")
+            else:
+                proc = _run_python(code, stdin)
+        elif language in JAVASCRIPT_ALIASES:
+            proc = _run_javascript(code, stdin)
+        elif language in COMPILED_ALIASES:
+            language = canonical_language(language)
+            artifact, _ = artifact_cache.get_or_compile(language, code)
+            try:
+                if not artifact.ok:
+                    raise ValueError(f"Reference solution does not compile: {artifact.error}")
+                proc = run_artifact(artifact, language, stdin, EXECUTION_TIMEOUT, MAX_MEMORY)
+            finally:
+                artifact_cache.release(artifact)
+        else:
+            raise ValueError(f"Language '{language}' not supported")
+    except (subprocess.TimeoutExpired, OutputLimitExceeded) as e:
+        raise ValueError(f"Reference solution failed: {e}")
+    
+    if proc.returncode != 0:
+        raise ValueError(f"Reference solution failed: {(proc.stderr or '').strip()[:500]}")
+    if len(proc.stdout.encode("utf-8")) > OUTPUT_WINDOW_BYTES:
+        raise ValueError(f"Reference output is longer than {OUTPUT_WINDOW_BYTES} bytes")
+    return proc.stdout
+
+def _annotate_performance(result: Dict[str, Any], test_cases: Optional[List[Dict]]):
+    """
+    Mark performance cases that passed within their time budget (see
+    performance_cases). Cases whose budget is unknown (None) get None.
+    """
+    for test_result, test_case in zip(result.get("test_results", []), test_cases or []):
+        if "time_budget_ms" not in test_case:
+            continue
+        budget = test_case["time_budget_ms"]
+        wall_time = test_result.get("wall_time_ms")
+        test_result["time_budget_ms"] = budget
+        test_result["within_budget"] = None if budget is None else bool(
+            test_result.get("passed") and wall_time is not None and wall_time <= budget
+        )
+
+def _cache_key(
+    code: str,
+    language: str,
+    test_cases: Optional[List[Dict]],
+    fail_fast: bool,
+    use_cache: bool,
+    limits: ExecutionLimits,
+    digest: Optional[str] = None
+) -> Optional[str]:
+    """
+    Content hash identifying a run, or None if it must not be cached.
+    Questions opt out by marking any test case {"nondeterministic": true}.
+    digest is the suite_digest of test_cases, computed here if not given.
+    """
+    if not use_cache or settings.result_cache_size <= 0:
+        return None
+    if any(tc.get("nondeterministic") for tc in test_cases or []):
+        return None
     
-    if language in ["python", "py", "python3"]:
-        return execute_python_code(code, test_cases)
-    elif language in ["javascript", "js", "node"]:
-        return execute_javascript_code(code, test_cases)
+    language = language.lower()
+    if language in PYTHON_ALIASES:
+        language = "python"
+    elif language in JAVASCRIPT_ALIASES:
+        language = "javascript"
+    elif language in COMPILED_ALIASES:
+        language = COMPILED_ALIASES[language]
+    else:
+        return None
+    
+    # Line endings and trailing blank lines never change what a program does
+    normalized_code = code.replace("\r\n", "\n").rstrip()
+    payload = json.dumps({
+        "code": normalized_code,
+        "language": language,
+        "suite": digest or suite_digest(test_cases),
+        "limits": [*limits.key(), settings.max_output_bytes, fail_fast]
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _is_cacheable(result: Dict[str, Any]) -> bool:
+    """Timeouts and budget cut-offs depend on host load at the time, so they are never replayed"""
+    if result.get("error") and "timed out" in result["error"]:
+        return False
+    return not any(t.get("error") in ("Timeout", BUDGET_EXHAUSTED) for t in result.get("test_results", []))
+
+def _cached_result(key: Optional[str]) -> Optional[Dict[str, Any]]:
+    if key is None:
+        return None
+    start_time = time.time()
+    result = result_cache.get(key)
+    if result is not None:
+        result["cached"] = True
+        result["execution_time_ms"] = round((time.time() - start_time) * 1000, 2)
+    return result
+
+def _rejected_result(verdict: Dict[str, Any], test_cases: Optional[List[Dict]]) -> Dict[str, Any]:
+    """Result for code the prescreen stage rejected: nothing ran, every test case fails"""
+    return {
+        "success": False,
+        "output": "",
+        "error": verdict["error"],
+        "test_results": [
+            {"test_case": i + 1, "passed": False, "error": "Not run: rejected before execution"}
+            for i in range(len(test_cases or []))
+        ],
+        "execution_time_ms": 0,
+        "rejected": verdict["reason"],
+        "cached": False
+    }
+
+def execute_code(
+    code: str,
+    language: str,
+    test_cases: Optional[List[Dict]] = None,
+    fail_fast: bool = False,
+    use_cache: bool = True,
+    limits: Optional[ExecutionLimits] = None,
+    digest: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Execute code in specified language under limits (the defaults if not given).
+    Code that fails the static prescreen is rejected without running.
+    Identical runs are answered from the result cache and flagged "cached".
+    digest is the suite_digest of test_cases, if the caller has it.
+    """
+    limits = limits or ExecutionLimits()
+    result, key = _screen(code, language, test_cases, fail_fast, use_cache, limits, digest)
+    if result is not None:
+        return result
+    return _execute_screened(code, language, test_cases, fail_fast, key, limits)
+
+def _screen(
+    code: str,
+    language: str,
+    test_cases: Optional[List[Dict]],
+    fail_fast: bool,
+    use_cache: bool,
+    limits: ExecutionLimits,
+    digest: Optional[str]
+) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Prescreen and cache lookup, everything decided before a run is scheduled:
+    (result, None) for a rejection or a cache hit, else (None, cache key).
+    Blocking: hashing a suite that was not given a digest reads all of it.
+    """
+    if test_cases and digest is None:
+        digest = suite_digest(test_cases)
+    verdict = prescreen_code(code, language, test_cases, digest)
+    if not verdict["valid"]:
+        return _rejected_result(verdict, test_cases), None
+    key = _cache_key(code, language, test_cases, fail_fast, use_cache, limits, digest)
+    return _cached_result(key), key
+
+def _execute_screened(
+    code: str,
+    language: str,
+    test_cases: Optional[List[Dict]],
+    fail_fast: bool,
+    key: Optional[str],
+    limits: ExecutionLimits
+) -> Dict[str, Any]:
+    result = _execute_uncached(code, language, test_cases, fail_fast, limits)
+    result["limits"] = limits.describe()
+    skipped = sum(1 for t in result.get("test_results", []) if t.get("budget_exhausted"))
+    if skipped:
+        result["output"] += f" ({skipped} not run: suite time budget exhausted)"
+    _annotate_performance(result, test_cases)
+    if key is not None and _is_cacheable(result):
+        result_cache.put(key, result)
+    result["cached"] = False
+    return result
+
+def _execute_uncached(
+    code: str,
+    language: str,
+    test_cases: Optional[List[Dict]],
+    fail_fast: bool,
+    limits: ExecutionLimits
+) -> Dict[str, Any]:
+    language = language.lower()
+    
+    if language in PYTHON_ALIASES:
+        return execute_python_code(code, test_cases, fail_fast, limits)
+    elif language in JAVASCRIPT_ALIASES:
+        return execute_javascript_code(code, test_cases, fail_fast, limits)
+    elif language in COMPILED_ALIASES:
+        return execute_compiled_code(code, language, test_cases, fail_fast, limits)
     else:
         return {
             "success": False,
             "output": "",
-            "error": f"Language '{language}' not supported. Supported: python, javascript",
+            "error": f"Language '{language}' not supported. Supported: python, javascript, c, cpp, java",
             "test_results": [],
             "execution_time_ms": 0
         }
 
+async def execute_code_async(
+    code: str,
+    language: str,
+    test_cases: Optional[List[Dict]] = None,
+    fail_fast: bool = False,
+    graded: bool = False,
+    use_cache: bool = True,
+    limits: Optional[ExecutionLimits] = None,
+    question_id: Optional[int] = None,
+    digest: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Execute code without blocking the event loop (for async routes). With
+    EXECUTOR_SOCKET set the executor daemon runs it (see executor_client),
+    otherwise this process does. Runs with a question_id are counted in that
+    question's telemetry; digest is the suite_digest of test_cases, if known.
+    Raises QueueFullError when the execution queue has no room, and
+    ExecutorUnavailableError if the daemon is down.
+    """
+    client = get_executor_client()
+    if client is not None:
+        return await client.call(
+            "execute",
+            code=code,
+            language=language,
+            test_cases=test_cases,
+            fail_fast=fail_fast,
+            graded=graded,
+            use_cache=use_cache,
+            limits=limits.as_params() if limits else None,
+            question_id=question_id,
+            digest=digest
+        )
+    return await execute_code_local_async(
+        code, language, test_cases, fail_fast, graded, use_cache, limits, question_id, digest
+    )
+
+async def execute_code_local_async(
+    code: str,
+    language: str,
+    test_cases: Optional[List[Dict]] = None,
+    fail_fast: bool = False,
+    graded: bool = False,
+    use_cache: bool = True,
+    limits: Optional[ExecutionLimits] = None,
+    question_id: Optional[int] = None,
+    digest: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Execute code in this process without blocking the event loop.
+    Prescreen rejections and cache hits are answered from a worker thread
+    without waiting for an execution slot; everything else is scheduled,
+    graded submissions ahead of practice runs.
+    """
+    limits = limits or ExecutionLimits()
+    result, key = await run_in_threadpool(_screen, code, language, test_cases, fail_fast, use_cache, limits, digest)
+    if result is None:
+        result = await scheduler.run(
+            PRIORITY_GRADED if graded else PRIORITY_PRACTICE,
+            partial(_execute_screened, code, language, test_cases, fail_fast, key, limits)
+        )
+    telemetry.record(question_id, result)
+    return result
+
+def get_executor_stats() -> Dict[str, Any]:
+    """
+    Report executor capacity (queue depth and wait, result and artifact caches,
+    warm worker pool occupancy) and how much code the prescreen turned away
+    """
+    pool = get_python_pool()
+    node_pool = get_node_pool(MAX_MEMORY // (1024 * 1024))
+    return {
+        "queue": scheduler.stats(),
+        "prescreen": prescreen_cache.stats(),
+        "result_cache": result_cache.stats(),
+        "artifact_cache": artifact_cache.stats(),
+        "python_pool": pool.stats() if pool else {"size": 0, "idle": 0, "busy": 0},
+        "node_pool": node_pool.stats() if node_pool else {"size": 0, "idle": 0, "busy": 0, "replaced": 0}
+    }
+
+async def executor_stats_async() -> Dict[str, Any]:
+    """get_executor_stats of whichever process executes code (the daemon, if configured)"""
+    client = get_executor_client()
+    if client is None:
+        return get_executor_stats()
+    stats = await client.call("stats")
+    stats["client"] = client.stats()
+    return stats
+
 def validate_code_syntax(code: str, language: str) -> Dict[str, Any]:
-    """Validate code syntax without executing"""
-    if language.lower() in ["python", "py", "python3"]:
-        try:
-            compile(code, "<string>", "exec")
-            return {"valid": True, "error": None}
-        except SyntaxError as e:
-            return {"valid": False, "error": f"Line {e.lineno}: {e.msg}"}
-    
-    return {"valid": True, "error": None}  # Skip validation for other languages
+    """Validate code without executing it (size, syntax and banned imports; see code_prescreen)"""
+    verdict = prescreen_code(code, language)
+    return {"valid": verdict["valid"], "error": verdict["error"]}
@@ -0,0 +1,231 @@
+"""
+Static pre-screening of submissions before they reach a sandbox.
+
+One cheap pass over the source rejects code that cannot produce a useful run:
+oversize sources, syntax errors, imports of banned modules (processes, network,
+FFI), os process calls named directly (os.system, os.popen, os.exec*, ...) and,
+when test cases are given, Python code with no entry point - the tested
+function is missing, or nothing at top level ever calls anything. This is a
+filter, not the sandbox: calls reached dynamically (getattr and the like) are
+left to the rlimits. Verdicts are cached per hash of the code and the suite
+digest, and rejections are counted by reason.
+"""
+import ast
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from app.services.python_harness import defined_names, is_function_style
+
+# resource and signal stay allowed: solutions raise their stack limit with them, and rlimits still apply
+BANNED_PYTHON_MODULES = {
+    "subprocess", "socket", "ctypes", "multiprocessing", "pty", "shutil", "posix",
+    "urllib", "http", "requests", "ftplib", "smtplib", "telnetlib", "webbrowser"
+}
+# os stays allowed for os.path and friends, but not its process calls
+BANNED_OS_CALLS = {"system", "popen", "fork", "forkpty", "posix_spawn", "posix_spawnp", "kill", "killpg"}
+BANNED_OS_PREFIXES = ("exec", "spawn")
+BANNED_JAVASCRIPT_MODULES = {
+    "child_process", "cluster", "dgram", "net", "http", "https", "http2", "tls",
+    "worker_threads", "vm", "inspector"
+}
+
+_JS_MODULE_REFERENCE = re.compile(
+    r"""(?:require\s*\(\s*|import\s*\(\s*|\bfrom\s+|\bimport\s+)['"](?:node:)?([\w/]+)['"]"""
+)
+
+# Verdicts remembered per (language, code, suite digest) hash
+_CACHE_SIZE = 4096
+
+REJECTION_REASONS = ("oversize", "syntax", "banned_import", "no_entry_point")
+
+
+def _accept() -> Dict[str, Any]:
+    return {"valid": True, "error": None, "reason": None}
+
+
+def _reject(reason: str, error: str) -> Dict[str, Any]:
+    return {"valid": False, "error": error, "reason": reason}
+
+
+def _imported_module(node: ast.AST) -> List[str]:
+    """Top-level package names a node imports, including __import__("x") calls"""
+    if isinstance(node, ast.Import):
+        return [alias.name.split(".")[0] for alias in node.names]
+    if isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+        return [node.module.split(".")[0]]
+    if (
+        isinstance(node, ast.Call)
+        and isinstance(node.func, (ast.Name, ast.Attribute))
+        and getattr(node.func, "id", getattr(node.func, "attr", None)) in ("__import__", "import_module")
+        and node.args
+        and isinstance(node.args[0], ast.Constant)
+        and isinstance(node.args[0].value, str)
+    ):
+        return [node.args[0].value.split(".")[0]]
+    return []
+
+
+def _banned_os_call(name: str) -> bool:
+    return name in BANNED_OS_CALLS or name.startswith(BANNED_OS_PREFIXES)
+
+
+def _screen_python(code: str, test_cases: Optional[List[Dict]]) -> Dict[str, Any]:
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as e:
+        return _reject("syntax", f"Line {e.lineno}: {e.msg}")
+
+    # One walk over the whole tree: banned imports, names bound to os and the
+    # attributes read from them, and calls made outside def/class bodies
+    top_level_call = False
+    os_names = set()
+    os_attributes = []
+    definitions = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)
+    stack = [(node, True) for node in tree.body]
+    while stack:
+        node, top_level = stack.pop()
+        banned = [m for m in _imported_module(node) if m in BANNED_PYTHON_MODULES]
+        if banned:
+            return _reject("banned_import", f"Line {node.lineno}: importing '{banned[0]}' is not allowed")
+        if isinstance(node, ast.Import):
+            os_names.update(alias.asname or alias.name for alias in node.names if alias.name == "os")
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module == "os":
+            banned = [alias.name for alias in node.names if _banned_os_call(alias.name)]
+            if banned:
+                return _reject("banned_import", f"Line {node.lineno}: importing 'os.{banned[0]}' is not allowed")
+        elif isinstance(node, ast.Attribute) and _banned_os_call(node.attr):
+            if isinstance(node.value, ast.Name):
+                os_attributes.append((node.value.id, node))
+            elif _imported_module(node.value) == ["os"]:
+                os_attributes.append(("os", node))
+                os_names.add("os")
+        if top_level and isinstance(node, ast.Call):
+            top_level_call = True
+        inside = top_level and not isinstance(node, definitions)
+        stack.extend((child, inside) for child in ast.iter_child_nodes(node))
+
+    for name, node in sorted(os_attributes, key=lambda item: item[1].lineno):
+        if name in os_names:
+            return _reject("banned_import", f"Line {node.lineno}: calling 'os.{node.attr}' is not allowed")
+
+    if not test_cases:
+        return _accept()
+
+    names = defined_names(tree)
+    if all("function" in tc for tc in test_cases):
+        missing = sorted({tc["function"] for tc in test_cases} - names)
+        if missing:
+            return _reject("no_entry_point", f"Function '{missing[0]}' is not defined")
+    elif not top_level_call and not is_function_style(code, test_cases, names):
+        return _reject(
+            "no_entry_point",
+            "No entry point: the code only defines functions or classes and never calls them"
+        )
+    return _accept()
+
+
+def _screen_javascript(code: str) -> Dict[str, Any]:
+    for match in _JS_MODULE_REFERENCE.finditer(code):
+        module = match.group(1).split("/")[0]
+        if module in BANNED_JAVASCRIPT_MODULES:
+            line = code.count("\n", 0, match.start()) + 1
+            return _reject("banned_import", f"Line {line}: loading '{module}' is not allowed")
+    return _accept()
+
+
+class PrescreenCache:
+    """LRU of prescreen verdicts plus rejection counters"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.checked = 0
+        self.hits = 0
+        self.rejected = {reason: 0 for reason in REJECTION_REASONS}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            verdict = self._entries.get(key)
+            if verdict is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            return verdict
+
+    def put(self, key: str, verdict: Dict[str, Any]):
+        with self._lock:
+            self._entries[key] = verdict
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def record(self, verdict: Dict[str, Any]):
+        with self._lock:
+            self.checked += 1
+            if not verdict["valid"]:
+                self.rejected[verdict["reason"]] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "checked": self.checked,
+                "cache_hits": self.hits,
+                "rejected": dict(self.rejected),
+                "rejected_total": sum(self.rejected.values())
+            }
+
+
+prescreen_cache = PrescreenCache(_CACHE_SIZE)
+
+
+def suite_digest(test_cases: Optional[List[Dict]]) -> str:
+    """
+    Content hash of a test suite. Generated suites run to tens of megabytes, so
+    callers that already have one (see performance_cases) pass it down rather
+    than have every submission hash the suite again.
+    """
+    return hashlib.sha256(
+        json.dumps(test_cases or [], sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def prescreen_code(
+    code: str,
+    language: str,
+    test_cases: Optional[List[Dict]] = None,
+    digest: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Statically check a submission. Returns {"valid", "error", "reason"}, where
+    reason is one of REJECTION_REASONS for rejected code. digest is the
+    suite_digest of test_cases, computed here if not given.
+    """
+    language = language.lower()
+    source = code.encode("utf-8")
+    # Before anything is hashed: an oversize source is rejected whatever the suite
+    if len(source) > settings.max_source_bytes:
+        verdict = _reject("oversize", f"Source is {len(source)} bytes (limit: {settings.max_source_bytes})")
+        prescreen_cache.record(verdict)
+        return verdict
+    if test_cases and digest is None:
+        digest = suite_digest(test_cases)
+    key = hashlib.sha256(
+        f"{language}\0{digest if test_cases else ''}\0".encode("utf-8") + source
+    ).hexdigest()
+
+    verdict = prescreen_cache.get(key)
+    if verdict is None:
+        if language in ("python", "py", "python3"):
+            verdict = _screen_python(code, test_cases)
+        elif language in ("javascript", "js", "node"):
+            verdict = _screen_javascript(code)
+        else:
+            verdict = _accept()
+        prescreen_cache.put(key, verdict)
+
+    prescreen_cache.record(verdict)
+    return dict(verdict)
@@ -0,0 +1,280 @@
+"""
+Compiled-language backend (C, C++, Java) for the code executor.
+
+Each submission is compiled once into a directory keyed by a hash of its
+language, compiler command and source. Artifacts (and compile errors) are kept
+in an LRU cache, so every test case - and every later resubmission of the same
+source - runs against the cached build instead of recompiling. Callers hold an
+artifact from get_or_compile until release, and an evicted build is only
+deleted once nobody holds it.
+"""
+import hashlib
+import math
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.services.output_checkers import OutputChecker
+from app.services.process_runner import OutputLimitExceeded, RunResult, run_process
+
+# Wall-clock and CPU limit for one compilation (seconds)
+COMPILE_TIMEOUT = 30
+
+LANGUAGES = {
+    "c": {
+        "aliases": ["c"],
+        "compiler": "gcc",
+        "source": "solution.c",
+        "compile": ["gcc", "-O2", "-std=c11", "-o", "solution", "solution.c", "-lm"],
+        "run": ["./solution"],
+    },
+    "cpp": {
+        "aliases": ["cpp", "c++", "cxx"],
+        "compiler": "g++",
+        "source": "solution.cpp",
+        "compile": ["g++", "-O2", "-std=c++17", "-o", "solution", "solution.cpp"],
+        "run": ["./solution"],
+    },
+    "java": {
+        "aliases": ["java"],
+        "compiler": "javac",
+        # Named after the public class and launched by the class with main, see _java_classes
+        "source": "{file_class}.java",
+        "compile": ["javac", "-encoding", "UTF-8", "-d", ".", "{file_class}.java"],
+        "run": ["java", "-Xmx{heap_mb}m", "-Xss64m", "-cp", ".", "{main_class}"],
+    },
+}
+
+COMPILED_ALIASES = {alias: name for name, spec in LANGUAGES.items() for alias in spec["aliases"]}
+
+_JAVA_PUBLIC_CLASS = re.compile(r"\bpublic\s+(?:final\s+|abstract\s+)*class\s+([A-Za-z_$][\w$]*)")
+# Comments and string/char literals, blanked out before braces are counted
+_JAVA_NOISE = re.compile(r"//[^\n]*|/\*.*?\*/|\"(?:\\.|[^\"\\\n])*\"|'(?:\\.|[^'\\\n])*'", re.S)
+_JAVA_TOKENS = re.compile(
+    r"\b(?:class|interface|enum|record)\s+(?P<type>[A-Za-z_$][\w$]*)|(?P<main>\bvoid\s+main\s*\()|(?P<brace>[{}])"
+)
+
+
+def canonical_language(language: str) -> Optional[str]:
+    """"c", "cpp" or "java" for a compiled language alias, else None"""
+    return COMPILED_ALIASES.get(language.lower())
+
+
+def _java_main_class(code: str) -> Optional[str]:
+    """The top-level type that declares a main method, if any"""
+    code = _JAVA_NOISE.sub(lambda m: " " * len(m.group()), code)
+    depth = 0
+    top_level = None
+    for token in _JAVA_TOKENS.finditer(code):
+        if token.group("type"):
+            if depth == 0:
+                top_level = token.group("type")
+        elif token.group("main"):
+            if depth == 1 and top_level:
+                return top_level
+        elif token.group("brace") == "{":
+            depth += 1
+        else:
+            depth = max(0, depth - 1)
+    return None
+
+
+def _java_classes(code: str) -> Tuple[str, str]:
+    """
+    (file class, main class) of a Java source: the file is named after the
+    public class, and the program is launched by the class that declares main.
+    Either falls back to the other, then to "Main".
+    """
+    match = _JAVA_PUBLIC_CLASS.search(code)
+    public_class = match.group(1) if match else None
+    main_class = _java_main_class(code)
+    return public_class or main_class or "Main", main_class or public_class or "Main"
+
+
+class Artifact:
+    """
+    Outcome of compiling one source: a build directory (and for Java the class
+    to launch), or the compiler's error. Run commands are built per run by
+    run_artifact, since they depend on the run's limits. Retryable failures
+    (missing compiler, timeout) are not cached. users counts the callers
+    holding it; an evicted build is deleted when that reaches 0.
+    """
+
+    def __init__(self, key: str, directory: Optional[str], main_class: str, error: Optional[str],
+                 compile_time_ms: float, retryable: bool = False):
+        self.key = key
+        self.directory = directory
+        self.main_class = main_class
+        self.error = error
+        self.compile_time_ms = compile_time_ms
+        self.retryable = retryable
+        self.users = 0
+        self.evicted = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class ArtifactCache:
+    """
+    LRU cache of compiled artifacts keyed by source hash. Concurrent requests
+    for the same key wait for a single compilation. Evicted builds are deleted
+    once the last caller holding them releases them.
+    """
+
+    def __init__(self, max_entries: int, root: str):
+        self.max_entries = max_entries
+        self.root = root
+        self._entries: "OrderedDict[str, Artifact]" = OrderedDict()
+        self._compiling: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compile(self, language: str, code: str) -> Tuple[Artifact, bool]:
+        """
+        Return (artifact, cached) for this source, compiling it if needed.
+        The caller holds the artifact and must pass it to release when done.
+        """
+        spec = LANGUAGES[language]
+        file_class, main_class = _java_classes(code) if language == "java" else ("", "")
+        compile_args = [arg.format(file_class=file_class) for arg in spec["compile"]]
+        normalized_code = code.replace("\r\n", "\n").rstrip() + "\n"
+        key = hashlib.sha256("\0".join([language, *compile_args, normalized_code]).encode("utf-8")).hexdigest()
+
+        while True:
+            with self._lock:
+                artifact = self._entries.get(key)
+                if artifact is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    artifact.users += 1
+                    return artifact, True
+                pending = self._compiling.get(key)
+                if pending is None:
+                    self._compiling[key] = threading.Event()
+                    self.misses += 1
+                    break
+            pending.wait()
+
+        try:
+            artifact = self._compile(key, spec, file_class, main_class, compile_args, normalized_code)
+            if artifact.retryable:
+                return artifact, False
+            unused = []
+            with self._lock:
+                artifact.users += 1
+                self._entries[key] = artifact
+                while len(self._entries) > self.max_entries:
+                    _, evicted = self._entries.popitem(last=False)
+                    evicted.evicted = True
+                    if evicted.users == 0:
+                        unused.append(evicted)
+            for evicted in unused:
+                _delete_build(evicted)
+            return artifact, False
+        finally:
+            with self._lock:
+                self._compiling.pop(key).set()
+
+    def release(self, artifact: Artifact):
+        """Drop a hold taken by get_or_compile; deletes the build if it was evicted meanwhile"""
+        with self._lock:
+            artifact.users -= 1
+            unused = artifact.evicted and artifact.users == 0
+        if unused:
+            _delete_build(artifact)
+
+    def _compile(self, key: str, spec: Dict, file_class: str, main_class: str, compile_args: List[str],
+                 code: str) -> Artifact:
+        # A fresh directory per build: an evicted build of the same source may still be running
+        os.makedirs(self.root, exist_ok=True)
+        directory = tempfile.mkdtemp(prefix=f"{key[:16]}-", dir=self.root)
+        with open(os.path.join(directory, spec["source"].format(file_class=file_class)), "w") as f:
+            f.write(code)
+
+        start = time.monotonic()
+        error = None
+        retryable = False
+        try:
+            proc = run_process(
+                compile_args,
+                timeout=COMPILE_TIMEOUT,
+                cpu_seconds=COMPILE_TIMEOUT,
+                cwd=directory,
+                output_limit=settings.max_output_bytes
+            )
+            if proc.returncode != 0:
+                error = (proc.stderr or proc.stdout or "Compilation failed").strip()
+        except FileNotFoundError:
+            error = f"{spec['compiler']} is not installed"
+            retryable = True
+        except subprocess.TimeoutExpired:
+            error = f"Compilation timed out (limit: {COMPILE_TIMEOUT} seconds)"
+            retryable = True
+        except OutputLimitExceeded as e:
+            error = f"Compiler output: {e}"
+        compile_time_ms = round((time.monotonic() - start) * 1000, 2)
+
+        if error is not None:
+            # Keep the error, drop the build directory
+            shutil.rmtree(directory, ignore_errors=True)
+            return Artifact(key, None, main_class, error, compile_time_ms, retryable)
+        return Artifact(key, directory, main_class, None, compile_time_ms)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+def _delete_build(artifact: Artifact):
+    if artifact.directory:
+        shutil.rmtree(artifact.directory, ignore_errors=True)
+
+
+artifact_cache = ArtifactCache(
+    settings.artifact_cache_size,
+    os.path.join(tempfile.gettempdir(), "disco-artifacts")
+)
+
+
+def run_artifact(
+    artifact: Artifact,
+    language: str,
+    stdin: Optional[str],
+    timeout: float,
+    memory_bytes: int,
+    checker: Optional[OutputChecker] = None
+) -> RunResult:
+    """
+    Run a compiled artifact once. Native binaries get RLIMIT_AS; the JVM
+    reserves far more address space than it uses, so Java gets memory_bytes
+    as its -Xmx heap instead.
+    """
+    run_args = [
+        arg.format(main_class=artifact.main_class, heap_mb=max(1, memory_bytes // (1024 * 1024)))
+        for arg in LANGUAGES[language]["run"]
+    ]
+    return run_process(
+        run_args,
+        stdin,
+        timeout,
+        cpu_seconds=math.ceil(timeout),
+        memory_bytes=None if language == "java" else memory_bytes,
+        cwd=artifact.directory,
+        checker=checker,
+        output_limit=settings.max_output_bytes
+    )
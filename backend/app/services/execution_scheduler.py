@@ -0,0 +1,126 @@
+"""
+Admission control and prioritisation for code execution.
+
+Every submission goes through a bounded priority queue drained by a fixed
+number of execution slots. Graded submissions are dequeued before practice
+runs, and practice runs may only fill part of the queue so a burst of "Run"
+clicks can never lock graded work out.
+"""
+import asyncio
+import heapq
+import itertools
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List
+
+PRIORITY_GRADED = 0
+PRIORITY_PRACTICE = 1
+
+# Share of the queue kept free for graded submissions
+GRADED_RESERVE = 0.2
+
+
+class QueueFullError(Exception):
+    """Raised when the execution queue cannot admit another job"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Code execution queue is full, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class ExecutionScheduler:
+    """Bounded priority queue in front of the code executor"""
+
+    def __init__(self, slots: int, max_queue: int):
+        self.slots = slots
+        self.max_queue = max_queue
+        self.practice_limit = max(1, int(max_queue * (1 - GRADED_RESERVE)))
+        self._cond = threading.Condition()
+        self._heap: List[tuple] = []
+        self._seq = itertools.count()
+        self._threads: List[threading.Thread] = []
+        self._queued = {PRIORITY_GRADED: 0, PRIORITY_PRACTICE: 0}
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._waits: deque = deque(maxlen=500)
+        self._avg_run_seconds = 1.0
+
+    def submit(self, priority: int, fn: Callable[[], Any]) -> Future:
+        """Queue fn for execution, or raise QueueFullError if there is no room"""
+        future: Future = Future()
+        with self._cond:
+            limit = self.max_queue if priority == PRIORITY_GRADED else self.practice_limit
+            if len(self._heap) >= limit:
+                self._rejected += 1
+                raise QueueFullError(self._retry_after())
+            heapq.heappush(self._heap, (priority, next(self._seq), time.monotonic(), fn, future))
+            self._queued[priority] += 1
+            self._start_slots()
+            self._cond.notify()
+        return future
+
+    async def run(self, priority: int, fn: Callable[[], Any]) -> Any:
+        """Queue fn and await its result without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(priority, fn))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            waits = sorted(self._waits)
+            return {
+                "slots": self.slots,
+                "running": self._running,
+                "queued": len(self._heap),
+                "queued_graded": self._queued[PRIORITY_GRADED],
+                "queued_practice": self._queued[PRIORITY_PRACTICE],
+                "max_queue": self.max_queue,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": round(sum(waits) / len(waits) * 1000, 2) if waits else 0,
+                "p95_wait_ms": round(waits[int(len(waits) * 0.95)] * 1000, 2) if waits else 0
+            }
+
+    def _retry_after(self) -> int:
+        # Time for the slots to drain everything already queued
+        return max(1, math.ceil((len(self._heap) + 1) * self._avg_run_seconds / self.slots))
+
+    def _start_slots(self):
+        while len(self._threads) < self.slots:
+            thread = threading.Thread(
+                target=self._slot,
+                name=f"execution-slot-{len(self._threads)}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _slot(self):
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                priority, _, queued_at, fn, future = heapq.heappop(self._heap)
+                self._queued[priority] -= 1
+                self._waits.append(time.monotonic() - queued_at)
+                self._running += 1
+
+            # Skip jobs whose caller went away while they were queued
+            if not future.set_running_or_notify_cancel():
+                with self._cond:
+                    self._running -= 1
+                continue
+
+            started = time.monotonic()
+            try:
+                future.set_result(fn())
+            except BaseException as e:
+                future.set_exception(e)
+            finally:
+                with self._cond:
+                    self._running -= 1
+                    self._completed += 1
+                    elapsed = time.monotonic() - started
+                    self._avg_run_seconds = 0.8 * self._avg_run_seconds + 0.2 * elapsed
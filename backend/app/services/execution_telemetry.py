@@ -0,0 +1,271 @@
+"""
+Per-question executor telemetry.
+
+Every execution attributed to a Question.id is folded into an in-process
+aggregator: run, cache-hit, rejection and timeout counts, a latency histogram
+and memory peaks. A background thread flushes the accumulated deltas into
+question_execution_stats every TELEMETRY_FLUSH_SECONDS, merging them with what
+other processes (API workers, executor daemons) already wrote: missing rows are
+upserted, counters are incremented in SQL and the histogram is merged under a
+row lock, so concurrent flushes never lose each other's deltas. Latencies go
+into fixed geometric buckets, so histograms merge by adding counts and
+p50/p95/p99 are read back to within one bucket (+20%).
+"""
+import math
+import threading
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import case, func, update
+
+from app.config import settings
+
+# Upper bounds of the latency buckets (ms): 1ms to ~10 minutes, each 20% wider than the last
+BUCKET_RATIO = 1.2
+BUCKET_BOUNDS = [round(BUCKET_RATIO ** i, 2) for i in range(int(math.log(600000, BUCKET_RATIO)) + 1)]
+PERCENTILES = (50, 95, 99)
+
+TIMEOUT_ERRORS = ("Timeout", "Skipped: suite time budget exhausted")
+
+
+def _bucket(runtime_ms: float) -> int:
+    """Index of the bucket holding runtime_ms; the last one is open-ended"""
+    if runtime_ms <= 1:
+        return 0
+    return min(len(BUCKET_BOUNDS), math.ceil(math.log(runtime_ms, BUCKET_RATIO)))
+
+
+def percentile(histogram: List[int], p: float) -> Optional[float]:
+    """Upper bound of the bucket holding the p-th percentile, or None for an empty histogram"""
+    total = sum(histogram)
+    if not total:
+        return None
+    rank = math.ceil(total * p / 100)
+    seen = 0
+    for i, count in enumerate(histogram):
+        seen += count
+        if seen >= rank:
+            return BUCKET_BOUNDS[i] if i < len(BUCKET_BOUNDS) else BUCKET_BOUNDS[-1]
+    return BUCKET_BOUNDS[-1]
+
+
+def _empty() -> Dict[str, Any]:
+    return {
+        "runs": 0,
+        "cached_runs": 0,
+        "rejected_runs": 0,
+        "timeouts": 0,
+        "timed_out_cases": 0,
+        "runtime_histogram": [0] * (len(BUCKET_BOUNDS) + 1),
+        "runtime_total_ms": 0.0,
+        "peak_memory_kb": None,
+        "memory_total_kb": 0.0,
+        "memory_samples": 0
+    }
+
+
+def merge(into: Dict[str, Any], delta: Dict[str, Any]) -> Dict[str, Any]:
+    """Add one set of counters to another (histograms bucket by bucket, memory peak by max)"""
+    for key in ("runs", "cached_runs", "rejected_runs", "timeouts", "timed_out_cases",
+                "runtime_total_ms", "memory_total_kb", "memory_samples"):
+        into[key] = (into.get(key) or 0) + (delta.get(key) or 0)
+    histogram = list(into.get("runtime_histogram") or [])
+    histogram += [0] * (len(delta["runtime_histogram"]) - len(histogram))
+    into["runtime_histogram"] = [a + b for a, b in zip(histogram, delta["runtime_histogram"])]
+    peaks = [p for p in (into.get("peak_memory_kb"), delta.get("peak_memory_kb")) if p is not None]
+    into["peak_memory_kb"] = max(peaks) if peaks else None
+    return into
+
+
+def summarize(question_id: int, stats: Dict[str, Any]) -> Dict[str, Any]:
+    """Report form of one question's counters"""
+    runs = stats.get("runs") or 0
+    histogram = stats.get("runtime_histogram") or []
+    samples = stats.get("memory_samples") or 0
+    summary = {
+        "question_id": question_id,
+        "runs": runs,
+        "cached_runs": stats.get("cached_runs") or 0,
+        "rejected_runs": stats.get("rejected_runs") or 0,
+        "timeouts": stats.get("timeouts") or 0,
+        "timeout_rate": round((stats.get("timeouts") or 0) / runs, 4) if runs else 0.0,
+        "timed_out_cases": stats.get("timed_out_cases") or 0,
+        "avg_runtime_ms": round(stats["runtime_total_ms"] / runs, 2) if runs else None,
+        "peak_memory_kb": stats.get("peak_memory_kb"),
+        "avg_peak_memory_kb": round(stats["memory_total_kb"] / samples, 2) if samples else None
+    }
+    for p in PERCENTILES:
+        summary[f"p{p}_runtime_ms"] = percentile(histogram, p)
+    return summary
+
+
+class TelemetryAggregator:
+    """Counters per question since the last flush"""
+
+    def __init__(self):
+        self._pending: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def record(self, question_id: Optional[int], result: Dict[str, Any]):
+        """Fold one execution result into its question's counters (unattributed runs are ignored)"""
+        if question_id is None:
+            return
+        test_results = result.get("test_results") or []
+        timed_out = sum(1 for t in test_results if t.get("error") in TIMEOUT_ERRORS)
+        if "timed out" in (result.get("error") or ""):
+            timed_out += 1
+        peak_memory = (result.get("resource_usage") or {}).get("peak_memory_kb")
+
+        with self._lock:
+            stats = self._pending.setdefault(question_id, _empty())
+            if result.get("rejected"):
+                stats["rejected_runs"] += 1
+            elif result.get("cached"):
+                stats["cached_runs"] += 1
+            else:
+                runtime = result.get("execution_time_ms") or 0
+                stats["runs"] += 1
+                stats["runtime_histogram"][_bucket(runtime)] += 1
+                stats["runtime_total_ms"] += runtime
+                if timed_out:
+                    stats["timeouts"] += 1
+                    stats["timed_out_cases"] += timed_out
+                if peak_memory is not None:
+                    stats["peak_memory_kb"] = max(stats["peak_memory_kb"] or 0, peak_memory)
+                    stats["memory_total_kb"] += peak_memory
+                    stats["memory_samples"] += 1
+        self._start_flusher()
+
+    def pending(self) -> Dict[int, Dict[str, Any]]:
+        with self._lock:
+            return {qid: merge(_empty(), stats) for qid, stats in self._pending.items()}
+
+    def flush(self):
+        """Merge the pending counters into question_execution_stats"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        from app.database import SessionLocal, engine
+        from app.models import QuestionExecutionStats
+
+        db = SessionLocal()
+        try:
+            # Executor daemons never run the API's create_all
+            QuestionExecutionStats.__table__.create(bind=engine, checkfirst=True)
+            # Ascending question_id everywhere, so concurrent flushes lock rows in the same order
+            question_ids = sorted(pending)
+            _insert_missing(db, QuestionExecutionStats, question_ids)
+            histograms = {
+                question_id: histogram
+                for question_id, histogram in db.query(
+                    QuestionExecutionStats.question_id, QuestionExecutionStats.runtime_histogram
+                ).filter(
+                    QuestionExecutionStats.question_id.in_(question_ids)
+                ).order_by(QuestionExecutionStats.question_id).with_for_update()
+            }
+            for question_id in question_ids:
+                delta = pending[question_id]
+                histogram = merge({"runtime_histogram": histograms.get(question_id)}, delta)["runtime_histogram"]
+                db.execute(
+                    update(QuestionExecutionStats)
+                    .where(QuestionExecutionStats.question_id == question_id)
+                    .values(runtime_histogram=histogram, **_increments(QuestionExecutionStats, delta))
+                    .execution_options(synchronize_session=False)
+                )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"Telemetry flush error: {e}")
+            # Keep the counters for the next attempt
+            with self._lock:
+                for question_id, delta in pending.items():
+                    merge(self._pending.setdefault(question_id, _empty()), delta)
+        finally:
+            db.close()
+
+    def _start_flusher(self):
+        if self._flusher is not None or settings.telemetry_flush_seconds <= 0:
+            return
+        with self._lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_loop, name="telemetry-flush", daemon=True)
+                self._flusher.start()
+
+    def _flush_loop(self):
+        while not self._stop.wait(settings.telemetry_flush_seconds):
+            self.flush()
+
+    def shutdown(self):
+        """Stop the flusher and write what is left"""
+        self._stop.set()
+        self.flush()
+
+
+def _insert_missing(db, model, question_ids: List[int]):
+    """Create empty stats rows for questions that have none; rows another process just created are left alone"""
+    if db.bind.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif db.bind.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        existing = {qid for (qid,) in db.query(model.question_id).filter(model.question_id.in_(question_ids))}
+        for question_id in question_ids:
+            if question_id not in existing:
+                db.add(model(question_id=question_id))
+        db.flush()
+        return
+    db.execute(
+        insert(model)
+        .values([{"question_id": question_id} for question_id in question_ids])
+        .on_conflict_do_nothing(index_elements=["question_id"])
+    )
+
+
+def _increments(model, delta: Dict[str, Any]) -> Dict[str, Any]:
+    """SET clauses adding a delta's counters to a row in place, and raising its memory peak"""
+    values = {
+        key: func.coalesce(getattr(model, key), 0) + delta[key]
+        for key in ("runs", "cached_runs", "rejected_runs", "timeouts", "timed_out_cases",
+                    "runtime_total_ms", "memory_total_kb", "memory_samples")
+    }
+    peak = delta.get("peak_memory_kb")
+    if peak is not None:
+        values["peak_memory_kb"] = case(
+            (model.peak_memory_kb.is_(None) | (model.peak_memory_kb < peak), peak),
+            else_=model.peak_memory_kb
+        )
+    return values
+
+
+def _row_stats(row) -> Dict[str, Any]:
+    stats = _empty()
+    for key in stats:
+        value = getattr(row, key, None)
+        if value is not None:
+            stats[key] = value
+    return stats
+
+
+telemetry = TelemetryAggregator()
+
+
+def question_stats(db, question_ids: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+    """
+    Flushed counters plus this process's pending ones, per question, slowest p95 first.
+    Pass question_ids to restrict the report.
+    """
+    from app.models import QuestionExecutionStats
+
+    query = db.query(QuestionExecutionStats)
+    if question_ids is not None:
+        query = query.filter(QuestionExecutionStats.question_id.in_(question_ids))
+    combined = {row.question_id: _row_stats(row) for row in query}
+    for question_id, delta in telemetry.pending().items():
+        if question_ids is None or question_id in question_ids:
+            merge(combined.setdefault(question_id, _empty()), delta)
+
+    report = [summarize(question_id, stats) for question_id, stats in combined.items()]
+    report.sort(key=lambda s: s["p95_runtime_ms"] or 0, reverse=True)
+    return report
@@ -0,0 +1,144 @@
+"""
+Client for the out-of-process executor daemon (see executor_service and run_executor.py).
+
+When EXECUTOR_SOCKET is set, API workers send code execution over that Unix
+socket instead of running it themselves. Frames are JSON lines:
+
+    request  {"id": 7, "method": "execute", "params": {...}}
+    reply    {"id": 7, "result": {...}}  or  {"id": 7, "error": {"type": ..., "message": ...}}
+
+Each connection is multiplexed - any number of requests may be in flight and
+replies come back in completion order, matched by id. The client keeps a small
+pool of connections and opens another only while every open one is busy.
+"""
+import asyncio
+import itertools
+import json
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from app.services.execution_scheduler import QueueFullError
+
+# Largest frame either side accepts; generated performance inputs can be megabytes
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+
+class ExecutorUnavailableError(Exception):
+    """Raised when the executor daemon cannot be reached or drops the connection"""
+
+
+class _Connection:
+    """One socket to the daemon, with a reader task routing replies to their requests"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.pending: Dict[int, asyncio.Future] = {}
+        self.closed = False
+        self._reader_task = asyncio.ensure_future(self._read_replies())
+
+    async def _read_replies(self):
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                reply = json.loads(line)
+                future = self.pending.pop(reply.get("id"), None)
+                if future is not None and not future.done():
+                    future.set_result(reply)
+        except (OSError, ValueError) as e:
+            print(f"Executor connection error: {e}")
+        finally:
+            self.close()
+
+    def close(self):
+        self.closed = True
+        for future in self.pending.values():
+            if not future.done():
+                future.set_exception(ExecutorUnavailableError("Lost connection to the code executor"))
+        self.pending.clear()
+        self.writer.close()
+
+    async def request(self, request_id: int, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        try:
+            self.writer.write(json.dumps({"id": request_id, "method": method, "params": params}).encode("utf-8") + b"\n")
+            await self.writer.drain()
+        except OSError as e:
+            self.close()
+            raise ExecutorUnavailableError(f"Lost connection to the code executor: {e}")
+        return await future
+
+
+class ExecutorClient:
+    """Pooled, multiplexed connections to the executor daemon at socket_path"""
+
+    def __init__(self, socket_path: str, max_connections: int):
+        self.socket_path = socket_path
+        self.max_connections = max(1, max_connections)
+        self._connections: List[_Connection] = []
+        self._ids = itertools.count(1)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._connect_lock: Optional[asyncio.Lock] = None
+
+    async def _connection(self) -> _Connection:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Streams belong to the loop that opened them
+            self._loop = loop
+            self._connections = []
+            self._connect_lock = asyncio.Lock()
+
+        async with self._connect_lock:
+            self._connections = [c for c in self._connections if not c.closed]
+            idle = min(self._connections, key=lambda c: len(c.pending), default=None)
+            if idle is not None and (not idle.pending or len(self._connections) >= self.max_connections):
+                return idle
+            try:
+                reader, writer = await asyncio.open_unix_connection(self.socket_path, limit=MAX_FRAME_BYTES)
+            except OSError as e:
+                if idle is not None:
+                    return idle
+                raise ExecutorUnavailableError(f"Code executor is unavailable at {self.socket_path}: {e}")
+            connection = _Connection(reader, writer)
+            self._connections.append(connection)
+            return connection
+
+    async def call(self, method: str, **params) -> Any:
+        """
+        Send one request and await its result. Raises QueueFullError,
+        ExecutorUnavailableError, or ValueError for invalid input.
+        """
+        connection = await self._connection()
+        reply = await connection.request(next(self._ids), method, params)
+        error = reply.get("error")
+        if error is None:
+            return reply["result"]
+        if error.get("type") == "queue_full":
+            raise QueueFullError(error.get("retry_after", 1))
+        if error.get("type") == "invalid":
+            raise ValueError(error.get("message", "Invalid request"))
+        raise RuntimeError(error.get("message", "Code executor error"))
+
+    def stats(self) -> Dict[str, Any]:
+        open_connections = [c for c in self._connections if not c.closed]
+        return {
+            "socket": self.socket_path,
+            "connections": len(open_connections),
+            "in_flight": sum(len(c.pending) for c in open_connections)
+        }
+
+
+_client: Optional[ExecutorClient] = None
+
+
+def get_executor_client() -> Optional[ExecutorClient]:
+    """The daemon client when EXECUTOR_SOCKET is set, else None (execute in process)"""
+    global _client
+    if not settings.executor_socket:
+        return None
+    if _client is None:
+        _client = ExecutorClient(settings.executor_socket, settings.executor_connections)
+    return _client
@@ -0,0 +1,105 @@
+"""
+Executor daemon: serves code execution to API workers over a Unix socket.
+
+Started by run_executor.py, so executor hosts can be scaled and CPU-pinned apart
+from the API. Speaks the JSON-lines protocol described in executor_client; every
+request on a connection is handled concurrently and answered as soon as it is
+done, so one slow submission never holds up the replies behind it. Admission
+control, prioritisation, caching and the sandbox pools all live here.
+"""
+import asyncio
+import json
+import os
+from typing import Any, Dict
+
+from app.services.code_executor import ExecutionLimits, execute_code_local_async, get_executor_stats
+from app.services.execution_scheduler import QueueFullError
+from app.services.executor_client import MAX_FRAME_BYTES
+from app.services.performance_cases import prepare_test_cases_local_async
+
+
+async def _execute(
+    code: str,
+    language: str,
+    test_cases=None,
+    fail_fast: bool = False,
+    graded: bool = False,
+    use_cache: bool = True,
+    limits: Dict[str, float] = None,
+    question_id: int = None,
+    digest: str = None
+) -> Dict[str, Any]:
+    return await execute_code_local_async(
+        code, language, test_cases, fail_fast, graded, use_cache,
+        ExecutionLimits(**limits) if limits else None, question_id, digest
+    )
+
+
+async def _stats() -> Dict[str, Any]:
+    return get_executor_stats()
+
+
+METHODS = {
+    "execute": _execute,
+    "prepare_test_cases": prepare_test_cases_local_async,
+    "stats": _stats,
+}
+
+
+async def _respond(request: Dict[str, Any], writer: asyncio.StreamWriter, write_lock: asyncio.Lock):
+    request_id = request.get("id")
+    try:
+        method = METHODS.get(request.get("method"))
+        if method is None:
+            raise ValueError(f"Unknown method '{request.get('method')}'")
+        reply = {"id": request_id, "result": await method(**request.get("params", {}))}
+    except QueueFullError as e:
+        reply = {"id": request_id, "error": {"type": "queue_full", "message": str(e), "retry_after": e.retry_after}}
+    except ValueError as e:
+        reply = {"id": request_id, "error": {"type": "invalid", "message": str(e)}}
+    except Exception as e:
+        reply = {"id": request_id, "error": {"type": "error", "message": str(e)}}
+
+    frame = json.dumps(reply, default=str).encode("utf-8") + b"\n"
+    async with write_lock:
+        try:
+            writer.write(frame)
+            await writer.drain()
+        except OSError:
+            # The client went away; its requests die with the connection
+            pass
+
+
+async def _handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    write_lock = asyncio.Lock()
+    tasks = set()
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            task = asyncio.ensure_future(_respond(json.loads(line), writer, write_lock))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+    except (OSError, ValueError) as e:
+        print(f"Executor client error: {e}")
+    finally:
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        writer.close()
+
+
+async def serve(socket_path: str):
+    """Listen on socket_path until cancelled"""
+    if os.path.exists(socket_path):
+        # Left behind by a previous daemon
+        os.unlink(socket_path)
+    server = await asyncio.start_unix_server(_handle_connection, socket_path, limit=MAX_FRAME_BYTES)
+    os.chmod(socket_path, 0o660)
+    print(f"Code executor listening on {socket_path}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
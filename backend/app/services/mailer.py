@@ -0,0 +1,32 @@
+"""
+Outgoing mail over SMTP, used for account invites.
+
+Sending is disabled while SMTP_HOST is empty. With SMTP_USER set the
+connection is upgraded with STARTTLS and logs in before sending.
+"""
+import smtplib
+from email.message import EmailMessage
+
+from app.config import settings
+
+# Seconds to wait for the SMTP server
+SMTP_TIMEOUT = 10
+
+
+def mail_configured() -> bool:
+    return bool(settings.smtp_host)
+
+
+def send_mail(to: str, subject: str, body: str):
+    """Send a plain-text message; raises smtplib.SMTPException or OSError on failure"""
+    message = EmailMessage()
+    message["From"] = settings.smtp_from
+    message["To"] = to
+    message["Subject"] = subject
+    message.set_content(body)
+
+    with smtplib.SMTP(settings.smtp_host, settings.smtp_port, timeout=SMTP_TIMEOUT) as smtp:
+        if settings.smtp_user:
+            smtp.starttls()
+            smtp.login(settings.smtp_user, settings.smtp_password)
+        smtp.send_message(message)
@@ -0,0 +1,112 @@
+"""
+Batch resume-to-job matching.
+
+match_resume_to_job scores one resume against one job; listing jobs for a
+candidate or ranking a job's candidates means calling it in a loop. Here the
+whole batch is encoded once - resumes as a skill matrix over the skills the
+jobs ask for, plus experience and education vectors; jobs as required and
+preferred skill-count matrices - and every resume x job score comes out of
+a few matrix operations. Scores equal match_resume_to_job's.
+"""
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.services.resume_service import MATCH_WEIGHTS, candidate_education_text, match_ranking
+from app.services.skill_taxonomy import resume_skill_keys, skill_key
+
+
+def job_match_fields(job) -> Dict[str, Any]:
+    """The fields of a JobDescription that matching reads, as a job dict"""
+    return {
+        "required_skills": job.required_skills or [],
+        "preferred_skills": job.preferred_skills or [],
+        "min_experience_years": job.min_experience_years,
+        "education_requirements": job.education_requirements or []
+    }
+
+
+def _skill_counts(skill_lists: List[List[str]], columns: Dict[Any, int]) -> np.ndarray:
+    """Jobs x skill columns; a skill listed twice (or as two synonyms) counts twice, as in the scalar match"""
+    counts = np.zeros((len(skill_lists), len(columns)))
+    for row, skills in enumerate(skill_lists):
+        for skill in skills:
+            counts[row, columns[skill_key(skill)]] += 1
+    return counts
+
+
+def match_score_matrix(parsed_resumes: List[Dict[str, Any]], jobs: List[Dict[str, Any]]) -> np.ndarray:
+    """
+    Unrounded match_score of every resume against every job, shape
+    (len(parsed_resumes), len(jobs)). Jobs are dicts with the keys
+    match_resume_to_job reads.
+    """
+    required = [job.get("required_skills") or [] for job in jobs]
+    preferred = [job.get("preferred_skills") or [] for job in jobs]
+
+    # One column per distinct skill the jobs ask for; resume skills no job wants do not matter
+    columns: Dict[Any, int] = {}
+    for skills in required + preferred:
+        for skill in skills:
+            columns.setdefault(skill_key(skill), len(columns))
+
+    resume_skills = np.zeros((len(parsed_resumes), len(columns)))
+    for row, parsed_resume in enumerate(parsed_resumes):
+        for key in resume_skill_keys(parsed_resume):
+            column = columns.get(key)
+            if column is not None:
+                resume_skills[row, column] = 1
+
+    # Skill scores: matched count over listed count, with the scalar defaults for empty lists
+    required_counts = _skill_counts(required, columns)
+    preferred_counts = _skill_counts(preferred, columns)
+    required_total = required_counts.sum(axis=1)
+    preferred_total = preferred_counts.sum(axis=1)
+    required_score = np.where(
+        required_total > 0, (resume_skills @ required_counts.T) / np.maximum(required_total, 1), 1.0
+    )
+    preferred_score = np.where(
+        preferred_total > 0, (resume_skills @ preferred_counts.T) / np.maximum(preferred_total, 1), 0.5
+    )
+
+    # Experience: years over the job minimum (at least 1), capped at 1
+    candidate_exp = np.array([float(p.get("experience_years") or 0) for p in parsed_resumes])
+    min_exp = np.array([float(job.get("min_experience_years") or 0) for job in jobs])
+    experience_score = np.minimum(1.0, candidate_exp[:, None] / np.maximum(min_exp, 1)[None, :])
+
+    # Education: each distinct requirement is looked up once per resume, then OR-ed per job
+    education_reqs = [[req.lower() for req in job.get("education_requirements") or []] for job in jobs]
+    distinct_reqs = sorted({req for reqs in education_reqs for req in reqs})
+    req_columns = {req: column for column, req in enumerate(distinct_reqs)}
+    education_texts = [candidate_education_text(p) for p in parsed_resumes]
+    resume_has_req = np.array(
+        [[req in text for req in distinct_reqs] for text in education_texts], dtype=float
+    ).reshape(len(parsed_resumes), len(distinct_reqs))
+    job_reqs = np.zeros((len(jobs), len(distinct_reqs)))
+    for row, reqs in enumerate(education_reqs):
+        job_reqs[row, [req_columns[req] for req in reqs]] = 1
+    education_match = ((resume_has_req @ job_reqs.T) > 0) | (job_reqs.sum(axis=1) == 0)[None, :]
+    education_score = np.where(education_match, 1.0, 0.5)
+
+    return (
+        required_score * MATCH_WEIGHTS["required_skills"] +
+        preferred_score * MATCH_WEIGHTS["preferred_skills"] +
+        experience_score * MATCH_WEIGHTS["experience"] +
+        education_score * MATCH_WEIGHTS["education"]
+    ) * 100
+
+
+def batch_match(
+    parsed_resumes: List[Optional[Dict[str, Any]]],
+    jobs: List[Dict[str, Any]]
+) -> List[List[Optional[Dict[str, Any]]]]:
+    """
+    {"match_score", "ranking"} of every resume against every job, indexed
+    [resume][job]; rows of resumes that are None (not uploaded yet) hold None.
+    """
+    present = [i for i, parsed_resume in enumerate(parsed_resumes) if parsed_resume]
+    scores = match_score_matrix([parsed_resumes[i] for i in present], jobs)
+    results: List[List[Optional[Dict[str, Any]]]] = [[None] * len(jobs) for _ in parsed_resumes]
+    for i, row in zip(present, scores.tolist()):
+        results[i] = [{"match_score": round(score, 2), "ranking": match_ranking(score)} for score in row]
+    return results
@@ -0,0 +1,228 @@
+"""
+Warm Node.js worker pool for JavaScript code execution.
+
+Workers are node processes running node_runner.js, started ahead of time so a
+job never waits for node to boot. Each one runs exactly one job and is then
+discarded: code that escapes the runner's vm context reaches only its own
+process, so nothing it does can leak into a later submission. A replacement
+is started in the background as soon as a worker is taken. Timeouts are
+enforced inside the worker (vm timeout) and again here.
+"""
+import json
+import os
+import queue
+import selectors
+import subprocess
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+from app.config import settings
+from app.services.output_checkers import OutputChecker
+from app.services.process_runner import OutputLimitExceeded, RunResult, build_usage, output_captures
+
+RUNNER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "node_runner.js")
+
+# Grace period for the worker to report a vm timeout before it is treated as hung
+_HANG_GRACE_SECONDS = 2
+
+
+class _NodeWorker:
+    """One node process running node_runner.js, good for a single job"""
+
+    def __init__(self, heap_mb: int):
+        self.proc = subprocess.Popen(
+            ["node", f"--max-old-space-size={heap_mb}", RUNNER_PATH],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=tempfile.gettempdir(),
+        )
+        self._buffer = b""
+        self._next_id = 0
+        self.jobs = 0
+
+    def request(self, job: Dict, deadline: float) -> Optional[Dict]:
+        """Send one job and wait for its reply. None if the deadline passed or the worker died."""
+        self._next_id += 1
+        job["id"] = self._next_id
+        try:
+            self.proc.stdin.write((json.dumps(job) + "\n").encode("utf-8"))
+            self.proc.stdin.flush()
+        except (BrokenPipeError, OSError):
+            return None
+
+        fd = self.proc.stdout.fileno()
+        with selectors.DefaultSelector() as sel:
+            sel.register(fd, selectors.EVENT_READ)
+            while b"\n" not in self._buffer:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not sel.select(remaining):
+                    return None
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    return None
+                self._buffer += chunk
+        line, self._buffer = self._buffer.split(b"\n", 1)
+        self.jobs += 1
+        reply = json.loads(line)
+        return reply if reply.get("id") == job["id"] else None
+
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def kill(self):
+        if self.proc.poll() is None:
+            self.proc.kill()
+        self.proc.wait()
+        for stream in (self.proc.stdin, self.proc.stdout):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+
+class NodeWorkerPool:
+    """`size` warm Node.js workers, each used for one job and then replaced"""
+
+    def __init__(self, size: int, heap_mb: int):
+        self.size = size
+        self.heap_mb = heap_mb
+        self._idle: "queue.Queue[_NodeWorker]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._busy = 0
+        self._jobs = 0
+        self._replaced = 0
+        self._closed = False
+
+    def start(self):
+        for _ in range(self.size):
+            self._idle.put(_NodeWorker(self.heap_mb))
+
+    def shutdown(self):
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().kill()
+            except queue.Empty:
+                break
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": self.size,
+                "idle": self._idle.qsize(),
+                "busy": self._busy,
+                "jobs": self._jobs,
+                "replaced": self._replaced
+            }
+
+    def run(
+        self,
+        code: str,
+        stdin: Optional[str],
+        timeout: float,
+        checker: Optional[OutputChecker] = None,
+        output_limit: Optional[int] = None
+    ) -> RunResult:
+        """
+        Run code on a warm worker, mirroring process_runner.run_process.
+        Raises subprocess.TimeoutExpired if the job does not finish in time,
+        and OutputLimitExceeded if it writes more than output_limit bytes
+        (the runner stops the job as soon as it passes the cap).
+        """
+        args: List[str] = ["node", "solution.js"]
+        worker = self._idle.get()
+        with self._lock:
+            self._busy += 1
+            self._jobs += 1
+        # Start its replacement now, so it boots while this job runs
+        self._spawn_in_background()
+        start = time.monotonic()
+        healthy = False
+        try:
+            reply = worker.request(
+                {
+                    "code": code,
+                    "stdin": stdin or "",
+                    "timeout_ms": int(timeout * 1000),
+                    "max_output": output_limit or 0
+                },
+                start + timeout + _HANG_GRACE_SECONDS
+            )
+            wall_seconds = time.monotonic() - start
+            if reply is None:
+                if wall_seconds >= timeout:
+                    raise subprocess.TimeoutExpired(args, timeout)
+                # The worker died mid-job (e.g. V8 ran out of heap)
+                return RunResult(args, -1, "", "JavaScript worker crashed",
+                                 build_usage(None, None, None, wall_seconds))
+            healthy = True
+            stdout_capture, stderr_capture = output_captures(checker, output_limit)
+            stdout_capture.feed(reply["stdout"].encode("utf-8"))
+            stderr_capture.feed(reply["stderr"].encode("utf-8"))
+            stdout = stdout_capture.text()
+            stderr = stderr_capture.text()
+            if reply["timed_out"]:
+                raise subprocess.TimeoutExpired(args, timeout, output=stdout, stderr=stderr)
+            if reply["output_limited"] or stdout_capture.overflowed or stderr_capture.overflowed:
+                raise OutputLimitExceeded(args, output_limit, output=stdout, stderr=stderr)
+            return RunResult(args, reply["exit_code"], stdout, stderr, reply["usage"], stdout_capture.matched)
+        finally:
+            self._release(worker, healthy)
+
+    def _release(self, worker: _NodeWorker, healthy: bool):
+        # Never reused, whether or not the job went well
+        worker.kill()
+        with self._lock:
+            self._busy -= 1
+            if not healthy:
+                self._replaced += 1
+
+    def _spawn_in_background(self):
+        threading.Thread(target=self._spawn, name="node-pool-spawn", daemon=True).start()
+
+    def _spawn(self):
+        if self._closed:
+            return
+        try:
+            worker = _NodeWorker(self.heap_mb)
+        except OSError as e:
+            print(f"Node pool respawn error: {e}")
+            return
+        if self._closed:
+            worker.kill()
+        else:
+            self._idle.put(worker)
+
+
+_pool: Optional[NodeWorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_node_pool(heap_mb: int) -> Optional[NodeWorkerPool]:
+    """Return the shared pool, starting it on first use. None if disabled or node is missing."""
+    global _pool
+    if settings.node_pool_size <= 0:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                pool = NodeWorkerPool(settings.node_pool_size, heap_mb)
+                try:
+                    pool.start()
+                except OSError as e:
+                    print(f"Node pool start error: {e}")
+                    pool.shutdown()
+                    return None
+                _pool = pool
+    return _pool
+
+
+def shutdown_node_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
@@ -0,0 +1,232 @@
+'use strict';
+// Single-use Node.js worker for the code executor (see node_pool.py).
+// Started ahead of time, it reads one JSON job line on stdin, answers with one
+// JSON line on stdout and exits. The job runs in a vm context whose global
+// starts from a null-prototype object, with console, process, require, stdin
+// and timers defined as shims inside it and code generation from strings
+// disabled. A vm context is not a security boundary, though: what keeps
+// submissions apart is that each worker process serves exactly one of them.
+const vm = require('vm');
+const util = require('util');
+const readline = require('readline');
+
+const PRELUDE = String.raw`
+(() => {
+  const g = globalThis;
+  const stdinText = g.__stdin;
+  const lines = stdinText.split('\n');
+  if (lines.length && lines[lines.length - 1] === '') lines.pop();
+  const streams = { out: [], err: [] };
+  const maxOutput = g.__maxOutput;
+  let written = 0;
+
+  class ExitSignal { constructor(code) { this.code = code; } }
+  class OutputLimitSignal {}
+
+  // Rough size of a console argument once formatted; exact for strings
+  const sizeOf = value => {
+    if (typeof value === 'string') return value.length;
+    if (Array.isArray(value)) return value.length * 2 + 2;
+    if (value !== null && typeof value === 'object') return Object.keys(value).length * 8 + 2;
+    return String(value).length;
+  };
+  const account = size => {
+    written += size;
+    if (maxOutput && written > maxOutput) throw new OutputLimitSignal();
+  };
+
+  const snapshot = (value, depth) => {
+    if (value === null || typeof value !== 'object' || depth > 8) return value;
+    if (Array.isArray(value)) return value.map(v => snapshot(v, depth + 1));
+    if (Object.getPrototypeOf(value) === Object.prototype) {
+      const copy = {};
+      for (const key of Object.keys(value)) copy[key] = snapshot(value[key], depth + 1);
+      return copy;
+    }
+    return value;
+  };
+  const log = name => (...args) => {
+    account(args.reduce((total, a) => total + sizeOf(a) + 1, 0));
+    streams[name].push({ args: args.map(a => snapshot(a, 0)) });
+  };
+  const write = name => chunk => {
+    const text = String(chunk);
+    account(text.length);
+    streams[name].push({ raw: text });
+    return true;
+  };
+
+  const emitter = () => {
+    const handlers = {};
+    const self = {
+      on(event, fn) { (handlers[event] = handlers[event] || []).push(fn); return self; },
+      emit(event, ...args) { for (const fn of handlers[event] || []) fn(...args); return true; }
+    };
+    self.once = self.on;
+    self.addListener = self.on;
+    return self;
+  };
+
+  const stdin = emitter();
+  stdin.setEncoding = () => stdin;
+  stdin.resume = () => stdin;
+  stdin.pause = () => stdin;
+  stdin.fd = 0;
+
+  const interfaces = [];
+  const readlineModule = {
+    createInterface() {
+      const rl = emitter();
+      rl.close = () => {};
+      rl[Symbol.asyncIterator] = async function* () { yield* lines; };
+      interfaces.push(rl);
+      return rl;
+    }
+  };
+  const fsModule = {
+    readFileSync(path, options) {
+      if (path === 0 || path === '/dev/stdin') return stdinText;
+      throw new Error('File system access is disabled');
+    }
+  };
+  const modules = { fs: fsModule, readline: readlineModule };
+
+  g.console = { log: log('out'), info: log('out'), debug: log('out'), error: log('err'), warn: log('err') };
+  g.process = {
+    stdin,
+    stdout: { write: write('out') },
+    stderr: { write: write('err') },
+    argv: ['node', 'solution.js'],
+    env: {},
+    exit(code) { throw new ExitSignal(code === undefined ? 0 : code); }
+  };
+  g.require = name => {
+    const key = String(name).replace(/^node:/, '');
+    if (key in modules) return modules[key];
+    throw new Error("Cannot find module '" + name + "'");
+  };
+  g.module = { exports: {} };
+  g.exports = g.module.exports;
+  // No event loop inside the sandbox: timers run as soon as pending microtasks allow
+  g.setTimeout = (fn, ms, ...args) => { Promise.resolve().then(() => fn(...args)); return 0; };
+  g.setImmediate = (fn, ...args) => g.setTimeout(fn, 0, ...args);
+  g.clearTimeout = () => {};
+  g.clearImmediate = () => {};
+
+  g.__streams = streams;
+  g.__ExitSignal = ExitSignal;
+  g.__OutputLimitSignal = OutputLimitSignal;
+  g.__dispatchStdin = () => {
+    if (stdinText) stdin.emit('data', stdinText);
+    stdin.emit('end');
+    for (const rl of interfaces) {
+      for (const line of lines) rl.emit('line', line);
+      rl.emit('close');
+    }
+  };
+})();
+`;
+
+let currentRejections = null;
+process.on('unhandledRejection', reason => {
+  if (currentRejections) currentRejections.push(reason);
+});
+
+function formatStreams(entries) {
+  return entries.map(entry => (
+    'raw' in entry ? entry.raw : util.formatWithOptions({ customInspect: false }, ...entry.args) + '\n'
+  )).join('');
+}
+
+function describeError(error) {
+  if (!error || !error.stack) return 'Uncaught ' + String(error) + '\n';
+  // Drop the frames of this runner so the trace ends at the candidate's code
+  const frames = String(error.stack).split('\n').filter(line => !/node:vm|node_runner\.js/.test(line));
+  return frames.join('\n') + '\n';
+}
+
+async function runJob(job) {
+  const started = process.hrtime.bigint();
+  const cpuStart = process.cpuUsage();
+  const sandbox = Object.create(null);
+  sandbox.__stdin = String(job.stdin || '');
+  sandbox.__maxOutput = Number(job.max_output) || 0;
+  const context = vm.createContext(sandbox, {
+    microtaskMode: 'afterEvaluate',
+    codeGeneration: { strings: false, wasm: false }
+  });
+  vm.runInContext(PRELUDE, context);
+  const errors = [];
+  currentRejections = [];
+
+  let exitCode = 0;
+  let timedOut = false;
+  let outputLimited = false;
+  const deadline = Date.now() + job.timeout_ms;
+  const steps = [
+    () => new vm.Script(job.code, { filename: 'solution.js' }),
+    script => script.runInContext(context, { timeout: Math.max(1, deadline - Date.now()) }),
+    () => vm.runInContext('__dispatchStdin()', context, { timeout: Math.max(1, deadline - Date.now()) })
+  ];
+  let value;
+  for (const step of steps) {
+    try {
+      value = step(value);
+    } catch (error) {
+      if (error && error.code === 'ERR_SCRIPT_EXECUTION_TIMEOUT') {
+        timedOut = true;
+      } else if (error instanceof context.__ExitSignal) {
+        exitCode = error.code;
+      } else if (error instanceof context.__OutputLimitSignal) {
+        outputLimited = true;
+      } else {
+        errors.push(describeError(error));
+        exitCode = 1;
+      }
+      break;
+    }
+  }
+
+  // Let rejection tracking report promises the job left unhandled
+  await new Promise(resolve => setImmediate(resolve));
+  for (const reason of currentRejections) {
+    if (reason instanceof context.__ExitSignal) {
+      exitCode = reason.code;
+    } else if (reason instanceof context.__OutputLimitSignal) {
+      outputLimited = true;
+    } else {
+      errors.push(describeError(reason));
+      exitCode = exitCode || 1;
+    }
+  }
+  currentRejections = null;
+
+  const cpu = process.cpuUsage(cpuStart);
+  return {
+    id: job.id,
+    timed_out: timedOut,
+    output_limited: outputLimited,
+    exit_code: Number(exitCode) || 0,
+    stdout: formatStreams(context.__streams.out),
+    stderr: formatStreams(context.__streams.err) + errors.join(''),
+    usage: {
+      cpu_user_ms: Math.round(cpu.user / 10) / 100,
+      cpu_system_ms: Math.round(cpu.system / 10) / 100,
+      // Includes the worker's own baseline
+      peak_memory_kb: process.resourceUsage().maxRSS,
+      wall_time_ms: Math.round(Number(process.hrtime.bigint() - started) / 1e4) / 100
+    }
+  };
+}
+
+// Warm up the vm and prelude paths on a throwaway job while the worker waits
+// in the pool; then run one real job and exit, so whatever the job did to this
+// process goes with it
+runJob({ code: '', stdin: '', timeout_ms: 1000, max_output: 0 }).then(() => {
+  const input = readline.createInterface({ input: process.stdin });
+  input.once('line', async line => {
+    input.close();
+    const result = await runJob(JSON.parse(line));
+    process.stdout.write(JSON.stringify(result) + '\n', () => process.exit(0));
+  });
+});
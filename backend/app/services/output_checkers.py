@@ -0,0 +1,269 @@
+"""
+Streaming output checkers for grading test cases.
+
+A checker is fed a program's stdout chunk by chunk and decides whether it
+matches the expected output without holding the stream: memory is bounded by
+the expected output plus one pending line or token. Each test case picks its
+mode through its metadata in Question.test_cases, e.g.
+
+    {"input": "2", "expected_output": "1.41421", "checker": "float", "epsilon": 1e-4}
+
+Modes:
+    exact       same text, ignoring surrounding whitespace (the default)
+    whitespace  same lines, with runs of spaces collapsed and blank lines at either end ignored
+    tokens      same whitespace-separated tokens in the same order
+    float       like tokens, but numbers may differ by epsilon (absolute or relative)
+    unordered   same lines in any order (trailing spaces and blank lines ignored)
+
+Checkers only ever run in the grading process, on output streamed back from
+the sandbox: a checker holds the expected output, so it must never run where
+candidate code can reach it (see python_harness for function-style cases).
+"""
+import hashlib
+import re
+from typing import Dict, List, Optional
+
+DEFAULT_CHECKER = "exact"
+DEFAULT_EPSILON = 1e-6
+
+# Extra bytes a pending line or token may grow past the longest expected one before it cannot match
+_UNIT_SLACK = 256
+
+_NUMBER = re.compile(rb"[+-]?(\d+\.?\d*|\.\d+)([eE][+-]?\d+)?")
+
+
+class OutputChecker:
+    """Base class: feed() the output as it arrives, then read matched"""
+
+    def __init__(self):
+        self._result: Optional[bool] = None
+
+    def feed(self, chunk: bytes):
+        raise NotImplementedError
+
+    def finish(self) -> bool:
+        raise NotImplementedError
+
+    @property
+    def matched(self) -> bool:
+        if self._result is None:
+            self._result = self.finish()
+        return self._result
+
+
+class ExactChecker(OutputChecker):
+    """Same result as actual.strip() == expected.strip(), computed incrementally"""
+
+    def __init__(self, expected: str):
+        super().__init__()
+        self.expected = expected.strip().encode("utf-8")
+        self._pos = 0
+        self._started = False
+        self._pending_ws = b""
+        self._mismatch = False
+
+    def feed(self, chunk: bytes):
+        if self._mismatch:
+            return
+        if not self._started:
+            chunk = chunk.lstrip()
+            if not chunk:
+                return
+            self._started = True
+        body = chunk.rstrip()
+        trailing_ws = chunk[len(body):]
+        if body:
+            # Whitespace held back from earlier chunks is only significant if content follows it
+            piece = self._pending_ws + body
+            if self.expected[self._pos:self._pos + len(piece)] != piece:
+                self._mismatch = True
+                return
+            self._pos += len(piece)
+            self._pending_ws = trailing_ws
+        else:
+            self._pending_ws += trailing_ws
+        # Longer than what is left to match: any further content is a mismatch either way
+        self._pending_ws = self._pending_ws[:len(self.expected) - self._pos + 1]
+
+    def finish(self) -> bool:
+        return not self._mismatch and self._pos == len(self.expected)
+
+
+class _UnitStream:
+    """Splits a byte stream into lines or whitespace-separated tokens across chunk boundaries"""
+
+    def __init__(self, by_line: bool, max_unit: int):
+        self.by_line = by_line
+        self.max_unit = max_unit
+        self.overlong = False
+        self._pending = b""
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        data = self._pending + chunk
+        if self.by_line:
+            units = data.split(b"\n")
+            self._pending = units.pop()
+        else:
+            units = data.split()
+            self._pending = units.pop() if units and not data[-1:].isspace() else b""
+        if len(self._pending) > self.max_unit:
+            # Longer than anything expected: it cannot match, so stop buffering it
+            self.overlong = True
+            self._pending = b""
+        return units
+
+    def finish(self) -> List[bytes]:
+        pending, self._pending = self._pending, b""
+        return [pending] if pending else []
+
+
+class WhitespaceChecker(OutputChecker):
+    """Line by line, comparing each line's whitespace-separated words"""
+
+    def __init__(self, expected: str):
+        super().__init__()
+        lines = [b" ".join(line.split()) for line in expected.encode("utf-8").split(b"\n")]
+        while lines and not lines[-1]:
+            lines.pop()
+        while lines and not lines[0]:
+            lines.pop(0)
+        self.expected = lines
+        self._stream = _UnitStream(True, max((len(l) for l in lines), default=0) + _UNIT_SLACK)
+        self._index = 0
+        self._started = False
+        self._blank_run = 0
+        self._mismatch = False
+
+    def _line(self, line: bytes):
+        normalized = b" ".join(line.split())
+        if not normalized:
+            # Blank lines only count if more content follows them
+            if self._started:
+                self._blank_run += 1
+            return
+        self._started = True
+        for _ in range(self._blank_run):
+            self._expect(b"")
+        self._blank_run = 0
+        self._expect(normalized)
+
+    def _expect(self, line: bytes):
+        if self._index >= len(self.expected) or self.expected[self._index] != line:
+            self._mismatch = True
+        self._index += 1
+
+    def feed(self, chunk: bytes):
+        if self._mismatch:
+            return
+        for line in self._stream.feed(chunk):
+            self._line(line)
+
+    def finish(self) -> bool:
+        for line in self._stream.finish():
+            self._line(line)
+        return not self._mismatch and not self._stream.overlong and self._index == len(self.expected)
+
+
+class TokenChecker(OutputChecker):
+    """Same whitespace-separated tokens in the same order"""
+
+    def __init__(self, expected: str, slack: int = _UNIT_SLACK):
+        super().__init__()
+        self.expected = expected.encode("utf-8").split()
+        self._stream = _UnitStream(False, max((len(t) for t in self.expected), default=0) + slack)
+        self._index = 0
+        self._mismatch = False
+
+    def same_token(self, actual: bytes, expected: bytes) -> bool:
+        return actual == expected
+
+    def _tokens(self, tokens: List[bytes]):
+        for token in tokens:
+            if self._index >= len(self.expected) or not self.same_token(token, self.expected[self._index]):
+                self._mismatch = True
+                return
+            self._index += 1
+
+    def feed(self, chunk: bytes):
+        if not self._mismatch:
+            self._tokens(self._stream.feed(chunk))
+
+    def finish(self) -> bool:
+        if not self._mismatch:
+            self._tokens(self._stream.finish())
+        return not self._mismatch and not self._stream.overlong and self._index == len(self.expected)
+
+
+class FloatChecker(TokenChecker):
+    """Tokens, with numbers compared to within epsilon (absolute or relative)"""
+
+    def __init__(self, expected: str, epsilon: float = DEFAULT_EPSILON):
+        # Numbers may be printed with many more digits than the expected answer
+        super().__init__(expected, slack=_UNIT_SLACK + 64)
+        self.epsilon = epsilon
+
+    def same_token(self, actual: bytes, expected: bytes) -> bool:
+        if actual == expected:
+            return True
+        if not (_NUMBER.fullmatch(actual) and _NUMBER.fullmatch(expected)):
+            return False
+        a, b = float(actual), float(expected)
+        return abs(a - b) <= self.epsilon or abs(a - b) <= self.epsilon * abs(b)
+
+
+class UnorderedChecker(OutputChecker):
+    """Same multiset of lines, compared through an order-independent hash"""
+
+    def __init__(self, expected: str):
+        super().__init__()
+        lines = [line.rstrip() for line in expected.encode("utf-8").split(b"\n")]
+        lines = [line for line in lines if line]
+        self._expected = (len(lines), sum(self._hash(line) for line in lines) % (1 << 128))
+        self._stream = _UnitStream(True, max((len(l) for l in lines), default=0) + _UNIT_SLACK)
+        self._count = 0
+        self._sum = 0
+
+    @staticmethod
+    def _hash(line: bytes) -> int:
+        return int.from_bytes(hashlib.blake2b(line, digest_size=16).digest(), "little")
+
+    def _lines(self, lines: List[bytes]):
+        for line in lines:
+            line = line.rstrip()
+            if line:
+                self._count += 1
+                self._sum = (self._sum + self._hash(line)) % (1 << 128)
+
+    def feed(self, chunk: bytes):
+        self._lines(self._stream.feed(chunk))
+
+    def finish(self) -> bool:
+        self._lines(self._stream.finish())
+        return not self._stream.overlong and (self._count, self._sum) == self._expected
+
+
+CHECKERS = {
+    "exact": ExactChecker,
+    "whitespace": WhitespaceChecker,
+    "tokens": TokenChecker,
+    "float": FloatChecker,
+    "unordered": UnorderedChecker,
+}
+
+
+def get_checker(test_case: Dict) -> OutputChecker:
+    """Build the checker a test case asks for. Raises ValueError for an unknown mode."""
+    expected = str(test_case.get("expected_output", ""))
+    mode = test_case.get("checker") or DEFAULT_CHECKER
+    if mode not in CHECKERS:
+        raise ValueError(f"Unknown output checker '{mode}'. Supported: {', '.join(CHECKERS)}")
+    if mode == "float":
+        return FloatChecker(expected, float(test_case.get("epsilon", DEFAULT_EPSILON)))
+    return CHECKERS[mode](expected)
+
+
+def check_output(test_case: Dict, output: str) -> bool:
+    """Grade a complete output string against a test case"""
+    checker = get_checker(test_case)
+    checker.feed(output.encode("utf-8"))
+    return checker.matched
@@ -0,0 +1,215 @@
+"""
+PDF text extraction shared by every resume parsing path.
+
+Backends are tried in PDF_BACKENDS order (fastest first by default) until one
+returns text. A PDF with no text layer is recognised before any backend runs
+when its bytes show no fonts, and otherwise as soon as one backend reads it
+cleanly but finds no text - the other backends would read the same empty
+layer. Documents over PDF_MAX_BYTES are refused and only the first
+PDF_MAX_PAGES pages are read. Every extraction reports which backends ran and
+how long each took; ExtractionStats aggregates those reports per backend.
+"""
+import io
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.config import settings
+
+# Optional backends; whichever are installed take part
+try:
+    import pypdfium2
+    HAS_PDFIUM = True
+except ImportError:
+    HAS_PDFIUM = False
+
+try:
+    import fitz  # PyMuPDF
+    HAS_FITZ = True
+except ImportError:
+    HAS_FITZ = False
+
+try:
+    from PyPDF2 import PdfReader
+    HAS_PYPDF2 = True
+except ImportError:
+    HAS_PYPDF2 = False
+
+try:
+    import pdfplumber
+    HAS_PDFPLUMBER = True
+except ImportError:
+    HAS_PDFPLUMBER = False
+
+
+class PdfTooLargeError(ValueError):
+    """Raised for a PDF over PDF_MAX_BYTES"""
+
+
+def _pdfium_pages(data: bytes, max_pages: int) -> Tuple[List[str], int]:
+    pdf = pypdfium2.PdfDocument(data)
+    try:
+        page_count = len(pdf)
+        pages = []
+        for i in range(min(page_count, max_pages)):
+            page = pdf[i]
+            textpage = page.get_textpage()
+            pages.append(textpage.get_text_range().replace("\r\n", "\n"))
+            textpage.close()
+            page.close()
+        return pages, page_count
+    finally:
+        pdf.close()
+
+
+def _pymupdf_pages(data: bytes, max_pages: int) -> Tuple[List[str], int]:
+    doc = fitz.open(stream=data, filetype="pdf")
+    try:
+        return [doc[i].get_text() for i in range(min(doc.page_count, max_pages))], doc.page_count
+    finally:
+        doc.close()
+
+
+def _pypdf2_pages(data: bytes, max_pages: int) -> Tuple[List[str], int]:
+    reader = PdfReader(io.BytesIO(data))
+    page_count = len(reader.pages)
+    return [reader.pages[i].extract_text() or "" for i in range(min(page_count, max_pages))], page_count
+
+
+def _pdfplumber_pages(data: bytes, max_pages: int) -> Tuple[List[str], int]:
+    with pdfplumber.open(io.BytesIO(data)) as pdf:
+        return [page.extract_text() or "" for page in pdf.pages[:max_pages]], len(pdf.pages)
+
+
+# name -> (installed, reader returning (page texts, total page count))
+BACKENDS: Dict[str, Tuple[bool, Callable[[bytes, int], Tuple[List[str], int]]]] = {
+    "pdfium": (HAS_PDFIUM, _pdfium_pages),
+    "pymupdf": (HAS_FITZ, _pymupdf_pages),
+    "pypdf2": (HAS_PYPDF2, _pypdf2_pages),
+    "pdfplumber": (HAS_PDFPLUMBER, _pdfplumber_pages),
+}
+
+
+def available_backends() -> List[str]:
+    """Installed backends in PDF_BACKENDS order (unknown names are ignored)"""
+    order = [name.strip().lower() for name in settings.pdf_backends.split(",") if name.strip()]
+    return [name for name in order if name in BACKENDS and BACKENDS[name][0]]
+
+
+def has_text_layer(data: bytes) -> Optional[bool]:
+    """
+    False when the file plainly has no fonts, so no text to extract (scans,
+    photos); None when that cannot be told from the bytes, e.g. because the
+    object dictionaries are in compressed object streams.
+    """
+    if b"/Font" in data:
+        return True
+    if b"/ObjStm" in data:
+        return None
+    return False
+
+
+def extract_pdf(source) -> Dict[str, Any]:
+    """
+    Text of a PDF given as a path or bytes. Returns
+        {"text", "backend", "pages", "page_count", "truncated", "image_only",
+         "attempts": [{"backend", "status": "text" | "empty" | "error", "ms", "error"?}]}
+    where backend is the one that produced the text (None if none did).
+    Raises PdfTooLargeError for documents over PDF_MAX_BYTES.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        data = bytes(source)
+    else:
+        with open(source, "rb") as f:
+            data = f.read(settings.pdf_max_bytes + 1)
+    if len(data) > settings.pdf_max_bytes:
+        raise PdfTooLargeError(f"PDF is over the size limit ({settings.pdf_max_bytes} bytes)")
+
+    result = {
+        "text": "",
+        "backend": None,
+        "pages": 0,
+        "page_count": None,
+        "truncated": False,
+        "image_only": False,
+        "attempts": []
+    }
+    if has_text_layer(data) is False:
+        result["image_only"] = True
+        return result
+
+    for name in available_backends():
+        start = time.perf_counter()
+        try:
+            pages, page_count = BACKENDS[name][1](data, settings.pdf_max_pages)
+        except Exception as e:
+            result["attempts"].append({
+                "backend": name,
+                "status": "error",
+                "ms": round((time.perf_counter() - start) * 1000, 2),
+                "error": str(e)
+            })
+            continue
+        text = "".join(page + "\n" for page in pages if page)
+        status = "text" if text.strip() else "empty"
+        result["attempts"].append({"backend": name, "status": status, "ms": round((time.perf_counter() - start) * 1000, 2)})
+        result["pages"] = len(pages)
+        result["page_count"] = page_count
+        result["truncated"] = page_count > len(pages)
+        if status == "text":
+            result["text"] = text
+            result["backend"] = name
+        else:
+            # Read cleanly with nothing on it: the text layer is empty for every backend
+            result["image_only"] = True
+        break
+    return result
+
+
+class ExtractionStats:
+    """Per-backend attempts, outcomes and time, from extraction reports"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._backends: Dict[str, Dict[str, float]] = {}
+        self.documents = 0
+        self.image_only = 0
+        self.truncated = 0
+
+    def record(self, extraction: Optional[Dict[str, Any]]):
+        if not extraction:
+            return
+        with self._lock:
+            self.documents += 1
+            self.image_only += 1 if extraction.get("image_only") else 0
+            self.truncated += 1 if extraction.get("truncated") else 0
+            for attempt in extraction.get("attempts", []):
+                stats = self._backends.setdefault(
+                    attempt["backend"], {"attempts": 0, "text": 0, "empty": 0, "error": 0, "total_ms": 0.0}
+                )
+                stats["attempts"] += 1
+                stats[attempt["status"]] += 1
+                stats["total_ms"] += attempt["ms"]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "order": available_backends(),
+                "documents": self.documents,
+                "image_only": self.image_only,
+                "truncated": self.truncated,
+                "backends": {
+                    name: {
+                        "attempts": s["attempts"],
+                        "text": s["text"],
+                        "empty": s["empty"],
+                        "errors": s["error"],
+                        "success_rate": round(s["text"] / s["attempts"], 4),
+                        "avg_ms": round(s["total_ms"] / s["attempts"], 2)
+                    }
+                    for name, s in self._backends.items()
+                }
+            }
+
+
+extraction_stats = ExtractionStats()
@@ -0,0 +1,317 @@
+"""
+Performance test cases: large generated inputs timed against a reference solution.
+
+A test case marked {"performance": true} describes its input with a generator
+instead of spelling it out, e.g.
+
+    {"performance": true, "generate": {"kind": "ints", "n": 200000, "high": 1000, "seed": 7},
+     "input_template": "{n}\\n{values}"}
+
+    {"performance": true, "function": "find_duplicates",
+     "generate": {"kind": "ints", "n": 200000, "high": 1000, "seed": 7, "as": "args"}}
+
+Before grading, the question's reference solution (Question.correct_answer) is
+run on the generated input on this host: its output becomes the expected output
+(unless the case gives one), and its best wall time times PERFORMANCE_SLOWDOWN
+becomes the case's "time_budget_ms" (unless the case gives one). The reference
+is timed the way submissions are graded - the whole suite through execute_code
+under the question's limits - so both see the same harness, parallelism and
+limits. If timing it fails, the case is still graded for correctness and its
+budget is unknown (None). The executor marks each performance result
+"within_budget", and scoring awards efficiency credit separately from
+correctness. Prepared suites are kept per process, so a
+question's reference is benchmarked once, and the suite is hashed once: the
+digest travels with it so submissions need not hash megabytes of input again.
+
+Generators are bounded: at most MAX_GENERATED_N values per case, and at most
+MAX_CASE_INPUT_CHARS of input per case and MAX_SUITE_INPUT_CHARS per suite
+(both measured on the largest input a spec can produce). validate_test_cases
+checks a suite when its question is saved; preparing an invalid suite raises
+ValueError rather than grade a different number of cases.
+"""
+import hashlib
+import json
+import random
+import string
+import threading
+from collections import OrderedDict
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.services.code_executor import ExecutionLimits, execute_code, reference_output, scheduler, suite_digest
+from app.services.execution_scheduler import PRIORITY_GRADED
+from app.services.executor_client import get_executor_client
+
+# Runs of the reference solution per performance case; the fastest one sets the budget
+REFERENCE_RUNS = 3
+# Floor for a time budget, so tiny reference times are not dominated by timer noise (ms)
+MIN_BUDGET_MS = 50
+# Prepared test suites remembered per (language, reference, test cases) hash
+_CACHE_SIZE = 256
+# Most values one generator may produce
+MAX_GENERATED_N = 1_000_000
+# Largest generated ints, in absolute value
+MAX_GENERATED_INT = 10 ** 18
+# Longest generated input of one case, and of all the cases of a suite (characters)
+MAX_CASE_INPUT_CHARS = 16 * 1024 * 1024
+MAX_SUITE_INPUT_CHARS = 64 * 1024 * 1024
+
+DEFAULT_TEMPLATES = {"ints": "{n}\n{values}", "string": "{values}"}
+
+
+def is_performance_case(test_case: Dict) -> bool:
+    return bool(test_case.get("performance"))
+
+
+def _generator_size(spec: Dict) -> int:
+    """Validated number of values a spec generates"""
+    kind = spec.get("kind", "ints")
+    if kind not in DEFAULT_TEMPLATES:
+        raise ValueError(f"Unknown generator kind '{kind}'. Supported: {', '.join(DEFAULT_TEMPLATES)}")
+    n = int(spec.get("n", 1000))
+    if not 0 <= n <= MAX_GENERATED_N:
+        raise ValueError(f"Generator n must be between 0 and {MAX_GENERATED_N}")
+    if kind == "ints":
+        low, high = int(spec.get("low", 0)), int(spec.get("high", 10 ** 9))
+        if not -MAX_GENERATED_INT <= low <= high <= MAX_GENERATED_INT:
+            raise ValueError(f"Generator bounds must satisfy -{MAX_GENERATED_INT} <= low <= high <= {MAX_GENERATED_INT}")
+    else:
+        alphabet = spec.get("alphabet", string.ascii_lowercase)
+        if not isinstance(alphabet, str) or not alphabet:
+            raise ValueError("Generator alphabet must be a non-empty string")
+    return n
+
+
+def _item_width(spec: Dict, literal: bool) -> int:
+    """Most characters one generated item takes in the input: an int and its separator, or a (repr'd) character"""
+    if spec.get("kind", "ints") == "ints":
+        return max(len(str(int(spec.get("low", 0)))), len(str(int(spec.get("high", 10 ** 9))))) + 2
+    return 10 if literal else 1
+
+
+def _generate_value(spec: Dict) -> Any:
+    """The generated value: a list of ints or a string, seeded so every run sees the same input"""
+    kind = spec.get("kind", "ints")
+    n = _generator_size(spec)
+    rng = random.Random(int(spec.get("seed", 0)))
+    if kind == "ints":
+        low, high = int(spec.get("low", 0)), int(spec.get("high", 10 ** 9))
+        values = [rng.randint(low, high) for _ in range(n)]
+        return sorted(values) if spec.get("sorted") else values
+    alphabet = spec.get("alphabet", string.ascii_lowercase)
+    return "".join(rng.choice(alphabet) for _ in range(n))
+
+
+def _template_fields(template: str) -> List[str]:
+    """Placeholders of an input template; only {n}, {values} and {value} are allowed"""
+    fields = [field for _, field, _, _ in string.Formatter().parse(template) if field is not None]
+    for field in fields:
+        if field not in ("n", "values", "value"):
+            raise ValueError(f"Unsupported input_template placeholder '{{{field}}}'. Supported: {{n}}, {{values}}, {{value}}")
+    return fields
+
+
+def _input_size(test_case: Dict) -> int:
+    """
+    Validated size of a case's input, for generated inputs the largest its spec
+    can produce. Raises ValueError for a malformed spec or one over MAX_CASE_INPUT_CHARS.
+    """
+    spec = test_case.get("generate")
+    if not spec:
+        if "input" in test_case:
+            return len(str(test_case["input"]))
+        return sum(len(value) if isinstance(value, (list, str)) else 1 for value in test_case.get("args", []))
+    if not isinstance(spec, dict):
+        raise ValueError("generate must be an object")
+    try:
+        # Checked before generating anything: a template may repeat the values many times
+        n = _generator_size(spec)
+        if spec.get("as") == "args":
+            size = n * _item_width(spec, False)
+        else:
+            template = test_case.get("input_template") or DEFAULT_TEMPLATES[spec.get("kind", "ints")]
+            if not isinstance(template, str):
+                raise ValueError("input_template must be a string")
+            fields = _template_fields(template)
+            size = len(template) + n * (
+                fields.count("values") * _item_width(spec, False) + fields.count("value") * _item_width(spec, True)
+            )
+    except TypeError as e:
+        raise ValueError(f"Malformed generate spec: {e}")
+    if size > MAX_CASE_INPUT_CHARS:
+        raise ValueError(f"Generated input would exceed {MAX_CASE_INPUT_CHARS} characters")
+    return size
+
+
+def validate_test_cases(test_cases: Optional[List[Dict]], reference: Optional[str]):
+    """
+    Check a question's performance cases without generating them: their specs,
+    the size caps, and that each can get an expected output and a time budget.
+    Raises ValueError naming the first bad case.
+    """
+    total = 0
+    for i, test_case in enumerate(test_cases or []):
+        if not is_performance_case(test_case):
+            continue
+        try:
+            total += _input_size(test_case)
+        except ValueError as e:
+            raise ValueError(f"Test case {i + 1}: {e}")
+        if not reference and ("expected_output" not in test_case or not test_case.get("time_budget_ms")):
+            raise ValueError(
+                f"Test case {i + 1}: a performance case needs a reference solution (correct_answer) "
+                "unless it gives both expected_output and time_budget_ms"
+            )
+    if total > MAX_SUITE_INPUT_CHARS:
+        raise ValueError(f"Generated inputs of the suite would exceed {MAX_SUITE_INPUT_CHARS} characters")
+
+
+def generate_case(test_case: Dict) -> Dict:
+    """
+    Fill in a performance case's input from its "generate" spec. With "as": "args"
+    the value becomes the single argument of a function-style case; otherwise
+    "input_template" is formatted with {n}, {values} (space-separated ints, or the
+    string itself) and {value} (a Python literal, for snippet-style cases).
+    Raises ValueError for specs that are malformed or would exceed the size caps.
+    """
+    spec = test_case.get("generate")
+    if not spec:
+        return dict(test_case)
+    _input_size(test_case)
+
+    value = _generate_value(spec)
+    generated = {k: v for k, v in test_case.items() if k != "generate"}
+    if spec.get("as") == "args":
+        generated["args"] = [value]
+    else:
+        template = test_case.get("input_template") or DEFAULT_TEMPLATES[spec.get("kind", "ints")]
+        values = " ".join(map(str, value)) if isinstance(value, list) else value
+        generated["input"] = template.format(n=len(value), values=values, value=repr(value))
+    return generated
+
+
+def _benchmark(reference: str, language: str, suite: List[Dict]) -> List[Optional[float]]:
+    """
+    Fastest wall time (ms) of the reference on each case of a prepared suite,
+    None where it never passed. The whole suite runs as a graded submission
+    does: through execute_code, cases in parallel, under the suite's limits.
+    """
+    limits = ExecutionLimits.for_suite(suite)
+    best: List[Optional[float]] = [None] * len(suite)
+    for _ in range(REFERENCE_RUNS):
+        result = execute_code(reference, language, suite, use_cache=False, limits=limits)
+        for i, case_result in enumerate(result.get("test_results", [])):
+            wall_time = case_result.get("wall_time_ms")
+            if case_result.get("passed") and wall_time is not None:
+                best[i] = wall_time if best[i] is None else min(best[i], wall_time)
+    return best
+
+
+def _prepare(test_cases: List[Dict], reference: Optional[str], language: str) -> List[Dict]:
+    validate_test_cases(test_cases, reference)
+    prepared = [generate_case(tc) if is_performance_case(tc) else tc for tc in test_cases]
+    for i, case in enumerate(prepared):
+        if is_performance_case(case) and "expected_output" not in case:
+            try:
+                case["expected_output"] = reference_output(reference, language, case).strip()
+            except ValueError as e:
+                raise ValueError(f"Test case {i + 1}: {e}")
+
+    pending = [i for i, case in enumerate(prepared) if is_performance_case(case) and not case.get("time_budget_ms")]
+    if pending:
+        timings = _benchmark(reference, language, prepared)
+        for i in pending:
+            if timings[i] is None:
+                # Still graded for correctness; scoring leaves it out of efficiency credit
+                print(f"Performance case {i + 1}: reference solution could not be timed, time budget unknown")
+                prepared[i]["time_budget_ms"] = None
+                continue
+            prepared[i]["reference_time_ms"] = timings[i]
+            prepared[i]["time_budget_ms"] = round(max(MIN_BUDGET_MS, timings[i] * settings.performance_slowdown), 2)
+    return prepared
+
+
+class PreparedSuites:
+    """LRU of prepared test suites and their digests, so generation and benchmarking happen once per question"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[List[Dict], str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[List[Dict], str]]:
+        with self._lock:
+            suite = self._entries.get(key)
+            if suite is not None:
+                self._entries.move_to_end(key)
+            return suite
+
+    def put(self, key: str, suite: Tuple[List[Dict], str]):
+        with self._lock:
+            self._entries[key] = suite
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+prepared_suites = PreparedSuites(_CACHE_SIZE)
+
+
+def prepare_test_cases(
+    test_cases: Optional[List[Dict]],
+    reference: Optional[str] = None,
+    language: str = "python"
+) -> Tuple[Optional[List[Dict]], Optional[str]]:
+    """
+    Expand the performance cases of a suite: generate their inputs and derive
+    expected outputs and time budgets from the reference solution. Returns the
+    suite and its suite_digest, to be passed on to execute_code. Suites without
+    performance cases are returned unchanged, with no digest. Raises
+    ValueError for an invalid suite or a reference solution that fails on it.
+    Blocking: async routes run it through the executor's scheduler.
+    """
+    if not test_cases or not any(is_performance_case(tc) for tc in test_cases):
+        return test_cases, None
+    key = hashlib.sha256(json.dumps(
+        [language.lower(), reference or "", test_cases, settings.performance_slowdown],
+        sort_keys=True, default=str
+    ).encode("utf-8")).hexdigest()
+
+    prepared = prepared_suites.get(key)
+    if prepared is None:
+        suite = _prepare(test_cases, reference, language)
+        prepared = (suite, suite_digest(suite))
+        # A failed benchmark may be transient (host under load): only keep complete suites
+        if all(tc.get("time_budget_ms") for tc in suite if is_performance_case(tc)):
+            prepared_suites.put(key, prepared)
+    return prepared
+
+
+async def prepare_test_cases_async(
+    test_cases: Optional[List[Dict]],
+    reference: Optional[str] = None,
+    language: str = "python"
+) -> Tuple[Optional[List[Dict]], Optional[str]]:
+    """
+    prepare_test_cases for async routes. References are benchmarked where
+    submissions run: on the executor daemon if configured, else in an
+    execution slot of this process. Raises QueueFullError.
+    """
+    if not test_cases or not any(is_performance_case(tc) for tc in test_cases):
+        return test_cases, None
+    client = get_executor_client()
+    if client is not None:
+        suite, digest = await client.call(
+            "prepare_test_cases", test_cases=test_cases, reference=reference, language=language
+        )
+        return suite, digest
+    return await prepare_test_cases_local_async(test_cases, reference, language)
+
+
+async def prepare_test_cases_local_async(
+    test_cases: Optional[List[Dict]],
+    reference: Optional[str] = None,
+    language: str = "python"
+) -> Tuple[Optional[List[Dict]], Optional[str]]:
+    """prepare_test_cases in an execution slot of this process"""
+    return await scheduler.run(PRIORITY_GRADED, partial(prepare_test_cases, test_cases, reference, language))
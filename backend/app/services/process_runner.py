@@ -0,0 +1,280 @@
+"""
+Low-level process execution for the code sandbox.
+
+Runs a command under CPU time and address-space limits, pumps its stdin,
+stdout and stderr through a selector, and reaps it with wait4 so the CPU
+time and peak RSS of the run can be reported next to its output.
+
+Output is streamed into bounded captures: a process that writes past the byte
+cap is killed, only a head and a tail window of each stream are kept, and
+stdout can be checked against the expected answer as it arrives.
+"""
+import os
+import selectors
+import subprocess
+import time
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.services.output_checkers import OutputChecker
+
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:  # Windows
+    HAS_RESOURCE = False
+
+# Bytes kept from each end of an output stream that is too long to keep whole
+OUTPUT_WINDOW_BYTES = 64 * 1024
+
+
+class RunResult(subprocess.CompletedProcess):
+    """
+    CompletedProcess plus the resource usage of the run, and whether stdout
+    matched the expected output (None when no checker was given)
+    """
+
+    def __init__(
+        self,
+        args,
+        returncode: int,
+        stdout: str,
+        stderr: str,
+        usage: Dict[str, Any],
+        matched: Optional[bool] = None
+    ):
+        super().__init__(args, returncode, stdout, stderr)
+        self.usage = usage
+        self.matched = matched
+
+
+class OutputLimitExceeded(subprocess.SubprocessError):
+    """Raised when a process writes more than its output byte cap"""
+
+    def __init__(self, cmd, limit: int, output: Optional[str] = None, stderr: Optional[str] = None):
+        self.cmd = cmd
+        self.limit = limit
+        self.output = output
+        self.stderr = stderr
+
+    def __str__(self):
+        return f"Output limit exceeded ({self.limit} bytes)"
+
+    @property
+    def stdout(self):
+        return self.output
+
+
+class OutputCapture:
+    """
+    Bounded sink for one output stream. Keeps the first and last `window` bytes,
+    counts the rest, and feeds every accepted byte to an optional checker.
+    """
+
+    def __init__(
+        self,
+        limit: Optional[int] = None,
+        checker: Optional[OutputChecker] = None,
+        window: int = OUTPUT_WINDOW_BYTES
+    ):
+        self.limit = limit
+        self.checker = checker
+        self.window = window
+        self.total = 0
+        self.overflowed = False
+        self._head = bytearray()
+        self._tail = bytearray()
+
+    def feed(self, chunk: bytes) -> bool:
+        """Accept a chunk; False once the byte cap has been passed"""
+        if self.limit is not None and self.total + len(chunk) > self.limit:
+            chunk = chunk[:self.limit - self.total]
+            self.overflowed = True
+        self.total += len(chunk)
+        if self.checker is not None:
+            self.checker.feed(chunk)
+        room = self.window - len(self._head)
+        if room > 0:
+            self._head += chunk[:room]
+            chunk = chunk[room:]
+        if chunk:
+            self._tail += chunk
+            if len(self._tail) > self.window:
+                del self._tail[:len(self._tail) - self.window]
+        return not self.overflowed
+
+    def text(self) -> str:
+        omitted = self.total - len(self._head) - len(self._tail)
+        if omitted <= 0:
+            return bytes(self._head + self._tail).decode("utf-8", errors="replace")
+        return (
+            bytes(self._head).decode("utf-8", errors="replace")
+            + f"\n... [{omitted} bytes omitted] ...\n"
+            + bytes(self._tail).decode("utf-8", errors="replace")
+        )
+
+    @property
+    def matched(self) -> Optional[bool]:
+        return self.checker.matched if self.checker is not None else None
+
+
+def limit_resources(cpu_seconds: Optional[int] = None, memory_bytes: Optional[int] = None):
+    """Apply RLIMIT_CPU / RLIMIT_AS to the calling process (run in the child)"""
+    if cpu_seconds:
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+    if memory_bytes:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+
+
+def build_usage(
+    user_seconds: Optional[float],
+    system_seconds: Optional[float],
+    maxrss_kb: Optional[int],
+    wall_seconds: float
+) -> Dict[str, Any]:
+    return {
+        "cpu_user_ms": round(user_seconds * 1000, 2) if user_seconds is not None else None,
+        "cpu_system_ms": round(system_seconds * 1000, 2) if system_seconds is not None else None,
+        "peak_memory_kb": maxrss_kb,
+        "wall_time_ms": round(wall_seconds * 1000, 2)
+    }
+
+
+def output_captures(
+    checker: Optional[OutputChecker] = None,
+    output_limit: Optional[int] = None
+) -> Tuple[OutputCapture, OutputCapture]:
+    """stdout (graded by checker, if given) and stderr captures for one run"""
+    return OutputCapture(output_limit, checker), OutputCapture(output_limit)
+
+
+def pump(stdin_fd: int, payload: bytes, captures: Dict[int, OutputCapture], timeout: float) -> bool:
+    """
+    Write payload to stdin_fd while draining the captured fds until they all
+    reach EOF or one of them passes its byte cap. stdin_fd is always closed by
+    the time this returns. Returns whether the timeout expired first.
+    """
+    sel = selectors.DefaultSelector()
+    stdin_open = True
+    try:
+        os.set_blocking(stdin_fd, False)
+        sel.register(stdin_fd, selectors.EVENT_WRITE)
+        for fd in captures:
+            sel.register(fd, selectors.EVENT_READ)
+
+        offset = 0
+        deadline = time.monotonic() + timeout
+        timed_out = False
+        overflowed = False
+        while sel.get_map() and not overflowed:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                timed_out = True
+                break
+            for key, _ in sel.select(remaining):
+                fd = key.fd
+                if fd == stdin_fd:
+                    try:
+                        offset += os.write(fd, payload[offset:offset + 65536])
+                    except BrokenPipeError:
+                        offset = len(payload)
+                    if offset >= len(payload):
+                        sel.unregister(fd)
+                        os.close(fd)
+                        stdin_open = False
+                    continue
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    sel.unregister(fd)
+                elif not captures[fd].feed(chunk):
+                    overflowed = True
+                    break
+    finally:
+        sel.close()
+        if stdin_open:
+            os.close(stdin_fd)
+
+    return timed_out
+
+
+def run_process(
+    args: List[str],
+    stdin: Optional[str] = None,
+    timeout: float = 10,
+    cpu_seconds: Optional[int] = None,
+    memory_bytes: Optional[int] = None,
+    cwd: Optional[str] = None,
+    checker: Optional[OutputChecker] = None,
+    output_limit: Optional[int] = None
+) -> RunResult:
+    """
+    Run a command like subprocess.run(..., capture_output=True, text=True),
+    with resource limits and usage accounting where the platform allows it.
+    stdout and stderr are cut down to their head and tail windows, and
+    RunResult.matched is the verdict of checker, which grades stdout as it streams.
+    Raises subprocess.TimeoutExpired if it does not finish in time, and
+    OutputLimitExceeded (after killing it) if it writes more than output_limit bytes.
+    """
+    stdout_capture, stderr_capture = output_captures(checker, output_limit)
+    if not HAS_RESOURCE or not hasattr(os, "wait4"):
+        start = time.monotonic()
+        proc = subprocess.run(args, input=stdin, capture_output=True, timeout=timeout, cwd=cwd)
+        stdout_capture.feed(proc.stdout)
+        stderr_capture.feed(proc.stderr)
+        if stdout_capture.overflowed or stderr_capture.overflowed:
+            raise OutputLimitExceeded(args, output_limit, output=stdout_capture.text(), stderr=stderr_capture.text())
+        return RunResult(args, proc.returncode, stdout_capture.text(), stderr_capture.text(),
+                         build_usage(None, None, None, time.monotonic() - start), stdout_capture.matched)
+
+    stdin_r, stdin_w = os.pipe()
+    stdout_r, stdout_w = os.pipe()
+    stderr_r, stderr_w = os.pipe()
+    try:
+        start = time.monotonic()
+        proc = subprocess.Popen(
+            args,
+            stdin=stdin_r,
+            stdout=stdout_w,
+            stderr=stderr_w,
+            cwd=cwd,
+            preexec_fn=partial(limit_resources, cpu_seconds, memory_bytes)
+        )
+    except BaseException:
+        for fd in (stdin_r, stdin_w, stdout_r, stdout_w, stderr_r, stderr_w):
+            os.close(fd)
+        raise
+    for fd in (stdin_r, stdout_w, stderr_w):
+        os.close(fd)
+
+    try:
+        timed_out = pump(
+            stdin_w,
+            (stdin or "").encode("utf-8"),
+            {stdout_r: stdout_capture, stderr_r: stderr_capture},
+            timeout
+        )
+        overflowed = stdout_capture.overflowed or stderr_capture.overflowed
+        if timed_out or overflowed:
+            proc.kill()
+        _, status, rusage = os.wait4(proc.pid, 0)
+        wall_seconds = time.monotonic() - start
+        # Reaped here, so tell Popen not to wait again
+        proc.returncode = os.waitstatus_to_exitcode(status)
+    except BaseException:
+        if proc.returncode is None:
+            proc.kill()
+            proc.wait()
+        raise
+    finally:
+        os.close(stdout_r)
+        os.close(stderr_r)
+
+    stdout = stdout_capture.text()
+    stderr = stderr_capture.text()
+    if timed_out:
+        raise subprocess.TimeoutExpired(args, timeout, output=stdout, stderr=stderr)
+    if overflowed:
+        raise OutputLimitExceeded(args, output_limit, output=stdout, stderr=stderr)
+    return RunResult(args, proc.returncode, stdout, stderr,
+                     build_usage(rusage.ru_utime, rusage.ru_stime, rusage.ru_maxrss, wall_seconds),
+                     stdout_capture.matched)
@@ -0,0 +1,328 @@
+"""
+Single-interpreter test harness for function-style Python questions.
+
+Function-style test cases either name a function and its arguments
+({"function": "add", "args": [2, 3], "expected_output": "5"}) or are small
+snippets that call something the candidate defined
+({"input": "print(add(2, 3))", "expected_output": "5"}). Instead of starting
+an interpreter per case, the harness compiles the candidate's code once and
+forks a child of the warm interpreter for each case, which runs the compiled
+module body in a fresh namespace and then the call.
+
+Candidate code only ever runs in those children, and they hold none of the
+harness's pipes: the harness reads each child's capped stdout and stderr,
+times and reaps it with wait4, and streams the output to this process in
+frames. Only the calls go into the sandbox - never expected outputs or
+checker settings - and HarnessReader grades each case's output here as the
+frames arrive, with the case's output checker.
+"""
+import ast
+import json
+from typing import Any, Dict, List, Optional
+
+from app.services.output_checkers import get_checker
+
+# Characters of each case's output kept for display (results only show 100)
+OUTPUT_PREVIEW_CHARS = 1000
+# Bytes of a failing case's stderr reported as its error
+ERROR_CHARS = 8192
+# The only test case fields the sandbox sees
+_CASE_FIELDS = ("function", "args", "kwargs", "input")
+# Longest frame header the harness writes ("R <case> <size>")
+_MAX_HEADER = 64
+
+_HARNESS_TEMPLATE = r'''
+import io, json, linecache, os, select, signal, sys, time
+try:
+    import resource
+except ImportError:
+    resource = None
+
+SOURCE = %(source)r
+CASE_TIMEOUT = %(case_timeout)r
+OUTPUT_LIMIT = %(output_limit)r
+ERROR_CHARS = %(error_chars)r
+OUT_FD = 1
+
+def _write_all(data):
+    view = memoryview(data)
+    while view:
+        view = view[os.write(OUT_FD, view):]
+
+def _frame(kind, index, payload):
+    # "O": a chunk of the case's stdout; "R": the case's result record
+    _write_all(b"%%s %%d %%d\n" %% (kind, index, len(payload)) + payload)
+
+def _child(case, out_w, err_w, timeout):
+    """Run one case in a forked child; never returns"""
+    code = 0
+    try:
+        os.setpgid(0, 0)
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        os.dup2(out_w, 1)
+        os.dup2(err_w, 2)
+        # Nothing of the harness stays reachable: its own stdout pipe included
+        os.closerange(3, 65536)
+        sys.stdin = io.StringIO("")
+        if resource is not None:
+            # Never above the harness's own hard limit, which a child may not raise
+            hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+            cpu = int(timeout) + 1
+            if hard != resource.RLIM_INFINITY:
+                cpu = min(cpu, max(hard - 1, 0))
+            resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1 if hard == resource.RLIM_INFINITY else hard))
+        namespace = {"__name__": "solution", "__builtins__": __builtins__}
+        exec(module_code, namespace)
+        if "function" in case:
+            value = namespace[case["function"]](*case.get("args", []), **case.get("kwargs", {}))
+            if value is not None:
+                print(value)
+        else:
+            exec(compile(case.get("input", ""), "<test>", "exec"), namespace)
+    except SystemExit:
+        pass
+    except BaseException as exc:
+        import traceback
+        traceback.print_exception(type(exc), exc, exc.__traceback__.tb_next)
+        code = 1
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except BaseException:
+            code = code or 1
+    os._exit(code)
+
+def _run(index, case):
+    timeout = case.get("timeout", CASE_TIMEOUT)
+    out_r, out_w = os.pipe()
+    err_r, err_w = os.pipe()
+    start = time.perf_counter()
+    pid = os.fork()
+    if pid == 0:
+        os.close(out_r)
+        os.close(err_r)
+        _child(case, out_w, err_w, timeout)
+    os.close(out_w)
+    os.close(err_w)
+
+    # Readable once the child exits, even if processes it started still hold its pipes
+    try:
+        pidfd = os.pidfd_open(pid)
+    except (AttributeError, OSError):
+        pidfd = None
+    error = None
+    size = 0
+    stderr = b""
+    exited = False
+    deadline = time.monotonic() + timeout
+    watched = [out_r, err_r] + ([pidfd] if pidfd is not None else [])
+    while watched and error is None:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            error = "Timeout"
+            break
+        # After the child has exited, only collect what is already in its pipes
+        ready, _, _ = select.select(watched, [], [], 0 if exited else remaining)
+        if exited and not ready:
+            break
+        for fd in ready:
+            if fd == pidfd:
+                exited = True
+                watched.remove(fd)
+                continue
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                watched.remove(fd)
+            elif fd == err_r:
+                stderr = (stderr + chunk)[:ERROR_CHARS]
+            elif OUTPUT_LIMIT and size + len(chunk) > OUTPUT_LIMIT:
+                error = "Output limit exceeded"
+                break
+            else:
+                size += len(chunk)
+                _frame(b"O", index, chunk)
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except OSError:
+        pass
+    _, status, usage = os.wait4(pid, 0)
+    wall_ms = round((time.perf_counter() - start) * 1000, 2)
+    for fd in (out_r, err_r, pidfd):
+        if fd is not None:
+            os.close(fd)
+
+    returncode = os.waitstatus_to_exitcode(status)
+    if error is None and returncode != 0:
+        error = stderr.decode("utf-8", errors="replace") or "Exited with status %%d" %% returncode
+    _frame(b"R", index, json.dumps({
+        "error": error,
+        "usage": {
+            "cpu_user_ms": round(usage.ru_utime * 1000, 2),
+            "cpu_system_ms": round(usage.ru_stime * 1000, 2),
+            "peak_memory_kb": usage.ru_maxrss,
+            "wall_time_ms": wall_ms
+        }
+    }).encode("utf-8"))
+
+try:
+    # Not dumpable: the children cannot open this process's fds through /proc
+    import ctypes
+    ctypes.CDLL(None).prctl(4, 0, 0, 0, 0)  # PR_SET_DUMPABLE
+except Exception:
+    pass
+cases = json.loads(sys.stdin.read())
+linecache.cache["solution.py"] = (len(SOURCE), None, SOURCE.splitlines(True), "solution.py")
+module_code = compile(SOURCE, "solution.py", "exec")
+for index, case in enumerate(cases):
+    _run(index, case)
+'''
+
+
+class HarnessReader:
+    """
+    Reads the harness's stdout as it streams in (it is passed to the runner
+    in place of an output checker) and grades each case's output with that
+    case's checker. results[i] is filled in once case i has finished.
+    """
+
+    matched = None
+
+    def __init__(self, test_cases: List[Dict]):
+        self.results: List[Optional[Dict[str, Any]]] = [None] * len(test_cases)
+        self._checkers = []
+        self._previews = [bytearray() for _ in test_cases]
+        self._errors: List[Optional[str]] = []
+        for test_case in test_cases:
+            try:
+                self._checkers.append(get_checker(test_case))
+                self._errors.append(None)
+            except ValueError as e:
+                self._checkers.append(None)
+                self._errors.append(str(e))
+        self._buffer = bytearray()
+        self._header = None
+        self._broken = False
+
+    def feed(self, chunk: bytes):
+        if self._broken:
+            return
+        self._buffer += chunk
+        while True:
+            if self._header is None:
+                newline = self._buffer.find(b"\n", 0, _MAX_HEADER)
+                if newline < 0:
+                    self._broken = len(self._buffer) >= _MAX_HEADER
+                    return
+                try:
+                    kind, index, size = self._buffer[:newline].decode("ascii").split(" ")
+                    self._header = (kind, int(index), int(size))
+                except ValueError:
+                    self._broken = True
+                    return
+                del self._buffer[:newline + 1]
+            kind, index, size = self._header
+            if len(self._buffer) < size:
+                return
+            payload = bytes(self._buffer[:size])
+            del self._buffer[:size]
+            self._header = None
+            if 0 <= index < len(self.results):
+                self._handle(kind, index, payload)
+            if self._broken:
+                return
+
+    def _handle(self, kind: str, index: int, payload: bytes):
+        if kind == "O":
+            if self._checkers[index] is not None:
+                self._checkers[index].feed(payload)
+            preview = self._previews[index]
+            if len(preview) < OUTPUT_PREVIEW_CHARS:
+                preview += payload[:OUTPUT_PREVIEW_CHARS - len(preview)]
+        elif kind == "R" and self.results[index] is None:
+            try:
+                record = json.loads(payload)
+            except ValueError:
+                self._broken = True
+                return
+            checker = self._checkers[index]
+            self.results[index] = {
+                "output": self._previews[index].decode("utf-8", errors="replace").strip(),
+                "matched": checker.matched if checker is not None else False,
+                "error": self._errors[index] or record["error"],
+                "usage": record["usage"]
+            }
+
+
+def defined_names(tree: ast.Module) -> set:
+    """Top-level names defined by a parsed module"""
+    names = set()
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            names.update(t.id for t in targets if isinstance(t, ast.Name))
+    return names
+
+
+def _defined_names(code: str) -> Optional[set]:
+    """Top-level names defined by the candidate's code, or None if it does not parse"""
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return None
+    return defined_names(tree)
+
+
+def _calls_defined_name(snippet: Any, names: set) -> bool:
+    if not isinstance(snippet, str) or not snippet.strip():
+        return False
+    try:
+        tree = ast.parse(snippet)
+    except SyntaxError:
+        return False
+    return any(
+        isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in names
+        for node in ast.walk(tree)
+    )
+
+
+def is_function_style(code: str, test_cases: List[Dict], names: Optional[set] = None) -> bool:
+    """
+    True if every test case calls into the candidate's code rather than feeding stdin.
+    Pass the code's defined_names() if they are already known to skip re-parsing it.
+    """
+    if not test_cases:
+        return False
+    if all("function" in tc for tc in test_cases):
+        return True
+    if names is None:
+        names = _defined_names(code)
+    if not names:
+        return False
+    return all(_calls_defined_name(tc.get("input"), names) for tc in test_cases)
+
+
+def build_harness(code: str, case_timeout: float, output_limit: Optional[int] = None) -> str:
+    """
+    Return the harness source. output_limit caps the bytes each case may print
+    (None for no cap).
+    """
+    return _HARNESS_TEMPLATE % {
+        "source": code,
+        "case_timeout": float(case_timeout),
+        "output_limit": output_limit,
+        "error_chars": ERROR_CHARS
+    }
+
+
+def harness_input(test_cases: List[Dict], timeouts: Optional[List[float]] = None) -> str:
+    """The calls of the test cases as the harness reads them, each with its own timeout if given"""
+    cases = []
+    for i, test_case in enumerate(test_cases):
+        case = {field: test_case[field] for field in _CASE_FIELDS if field in test_case}
+        if timeouts is not None:
+            case["timeout"] = timeouts[i]
+        cases.append(case)
+    return json.dumps(cases)
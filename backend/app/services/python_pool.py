@@ -0,0 +1,357 @@
+"""
+Warm interpreter pool for Python code execution.
+
+A single template process is started once with a clean interpreter. Workers are
+forked from it ahead of time, wait with their stdio already wired to pipes, and
+run exactly one (code, stdin) job before exiting. A worker is never reused, so
+state cannot leak between submissions, and a crashed or killed worker is simply
+replaced by the next fork. The job itself runs in a child of the worker with no
+fds beyond stdio, and the worker reports its exit status and usage, so the
+submission cannot forge them.
+"""
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+from app.config import settings
+from app.services.output_checkers import OutputChecker
+from app.services.process_runner import (
+    HAS_RESOURCE, OutputCapture, OutputLimitExceeded, RunResult, build_usage, output_captures, pump
+)
+
+# Forking workers from a template needs fork(), fd passing (Unix, Python 3.9+) and rlimits
+POOL_SUPPORTED = hasattr(os, "fork") and hasattr(socket, "send_fds") and HAS_RESOURCE
+
+# Header fields (code length, CPU seconds, address-space bytes), sent before the code and the test input
+_FIELD_SIZE = 12
+_HEADER_SIZE = 3 * _FIELD_SIZE
+
+# Source of the template process. It never runs candidate code itself: each
+# request carries the pipe ends of a new worker, which is forked, wired to them
+# and left blocking until its job arrives on stdin.
+_TEMPLATE_SOURCE = r'''
+import linecache, os, resource, signal, socket, sys, traceback
+
+def _read_exact(fd, size):
+    data = b""
+    while len(data) < size:
+        chunk = os.read(fd, size - len(data))
+        if not chunk:
+            os._exit(70)
+        data += chunk
+    return data
+
+def _exit_code(exc):
+    if exc.code is None:
+        return 0
+    if isinstance(exc.code, int):
+        return exc.code
+    print(exc.code, file=sys.stderr)
+    return 1
+
+def _no_dump():
+    try:
+        import ctypes
+        ctypes.CDLL(None).prctl(4, 0, 0, 0, 0)  # PR_SET_DUMPABLE
+    except Exception:
+        pass
+
+def _run(source, cpu_seconds, memory_bytes):
+    if cpu_seconds:
+        resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 1))
+    if memory_bytes:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+    filename = "solution.py"
+    linecache.cache[filename] = (len(source), None, source.splitlines(True), filename)
+    sys.argv = [filename]
+    namespace = {"__name__": "__main__", "__builtins__": __builtins__}
+    returncode = 0
+    try:
+        exec(compile(source, filename, "exec"), namespace)
+    except SystemExit as exc:
+        returncode = _exit_code(exc)
+    except BaseException as exc:
+        traceback.print_exception(type(exc), exc, exc.__traceback__.tb_next)
+        returncode = 1
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except Exception:
+            pass
+    os._exit(returncode & 0xFF)
+
+def _serve_one(status_fd):
+    # The worker only supervises: candidate code runs in a child that cannot
+    # reach the status pipe, so the status line always comes from wait4()
+    header = _read_exact(0, %(header)d)
+    size, cpu_seconds, memory_bytes = (int(header[i:i + %(field)d]) for i in range(0, %(header)d, %(field)d))
+    source = _read_exact(0, size).decode("utf-8")
+    _no_dump()
+    pid = os.fork()
+    if pid == 0:
+        os.closerange(3, os.sysconf("SC_OPEN_MAX"))
+        _run(source, cpu_seconds, memory_bytes)
+    _, wait_status, usage = os.wait4(pid, 0)
+    os.write(status_fd, ("%%d %%f %%f %%d" %% (
+        os.waitstatus_to_exitcode(wait_status), usage.ru_utime, usage.ru_stime, usage.ru_maxrss
+    )).encode())
+    os._exit(0)
+
+def main():
+    sock = socket.socket(fileno=int(sys.argv[1]))
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    while True:
+        try:
+            msg, fds, _, _ = socket.recv_fds(sock, 16, 4)
+        except OSError:
+            break
+        if not msg or len(fds) != 4:
+            break
+        pid = os.fork()
+        if pid == 0:
+            sock.close()
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            # Own process group, so a timeout kills the candidate's processes too
+            os.setpgid(0, 0)
+            for target, fd in enumerate(fds[:3]):
+                os.dup2(fd, target)
+                os.close(fd)
+            _serve_one(fds[3])
+        for fd in fds:
+            os.close(fd)
+        sock.sendall(pid.to_bytes(8, "little"))
+
+main()
+''' % {"header": _HEADER_SIZE, "field": _FIELD_SIZE}
+
+
+class _Worker:
+    """Parent-side handles of one forked, idle worker"""
+
+    def __init__(self, pid: int, stdin_fd: int, stdout_fd: int, stderr_fd: int, status_fd: int):
+        self.pid = pid
+        self.stdin_fd = stdin_fd
+        self.stdout_fd = stdout_fd
+        self.stderr_fd = stderr_fd
+        self.status_fd = status_fd
+
+    def kill(self):
+        # The worker leads its own process group, holding the process running the job
+        for kill in (os.killpg, os.kill):
+            try:
+                kill(self.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass
+
+    def close(self):
+        # stdin is closed by pump() once the job has been written
+        for fd in (self.stdout_fd, self.stderr_fd, self.status_fd):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+
+class PythonWorkerPool:
+    """Pool of pre-forked, single-use Python workers"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self._lock = threading.Lock()
+        self._idle: List[_Worker] = []
+        self._busy = 0
+        self._template: Optional[subprocess.Popen] = None
+        self._sock: Optional[socket.socket] = None
+
+    def start(self):
+        with self._lock:
+            self._start_template()
+            self._fill()
+
+    def shutdown(self):
+        with self._lock:
+            for worker in self._idle:
+                worker.kill()
+                os.close(worker.stdin_fd)
+                worker.close()
+            self._idle = []
+            self._stop_template()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": self.size, "idle": len(self._idle), "busy": self._busy}
+
+    def run(
+        self,
+        code: str,
+        stdin: Optional[str],
+        timeout: float,
+        cpu_seconds: Optional[int] = None,
+        memory_bytes: Optional[int] = None,
+        checker: Optional[OutputChecker] = None,
+        output_limit: Optional[int] = None
+    ) -> RunResult:
+        """
+        Run code on a warm worker, mirroring process_runner.run_process.
+        Raises subprocess.TimeoutExpired if the job does not finish in time,
+        and OutputLimitExceeded if it writes more than output_limit bytes.
+        """
+        args = ["python", "solution.py"]
+        stdout_capture, stderr_capture = output_captures(checker, output_limit)
+        status_capture = OutputCapture()
+        worker = self._acquire()
+        try:
+            source = code.encode("utf-8")
+            header = b"".join(
+                str(value or 0).encode().rjust(_FIELD_SIZE)
+                for value in (len(source), cpu_seconds, memory_bytes)
+            )
+            start = time.monotonic()
+            timed_out = pump(
+                worker.stdin_fd,
+                header + source + (stdin or "").encode("utf-8"),
+                {
+                    worker.stdout_fd: stdout_capture,
+                    worker.stderr_fd: stderr_capture,
+                    worker.status_fd: status_capture
+                },
+                timeout
+            )
+            wall_seconds = time.monotonic() - start
+            stdout = stdout_capture.text()
+            stderr = stderr_capture.text()
+            if timed_out:
+                worker.kill()
+                raise subprocess.TimeoutExpired(args, timeout, output=stdout, stderr=stderr)
+            if stdout_capture.overflowed or stderr_capture.overflowed:
+                worker.kill()
+                raise OutputLimitExceeded(args, output_limit, output=stdout, stderr=stderr)
+            
+            status = status_capture.text().split()
+            if status:
+                returncode = int(status[0])
+                usage = build_usage(float(status[1]), float(status[2]), int(status[3]), wall_seconds)
+            else:
+                # A worker that dies without reporting its status has been killed
+                returncode = -1
+                usage = build_usage(None, None, None, wall_seconds)
+            return RunResult(args, returncode, stdout, stderr, usage, stdout_capture.matched)
+        finally:
+            worker.close()
+            self._release()
+
+    def _acquire(self) -> _Worker:
+        with self._lock:
+            self._busy += 1
+            try:
+                if self._idle:
+                    return self._idle.pop()
+                return self._spawn()
+            except Exception:
+                self._busy -= 1
+                raise
+
+    def _release(self):
+        # Every job consumes its worker, so top the pool back up
+        with self._lock:
+            self._busy -= 1
+            try:
+                self._fill()
+            except Exception as e:
+                print(f"Python pool refill error: {e}")
+
+    def _fill(self):
+        while len(self._idle) < self.size:
+            self._idle.append(self._spawn())
+
+    def _spawn(self) -> _Worker:
+        try:
+            return self._fork_worker()
+        except OSError:
+            # Template died; start a fresh one and retry once
+            self._stop_template()
+            self._start_template()
+            return self._fork_worker()
+
+    def _fork_worker(self) -> _Worker:
+        stdin_r, stdin_w = os.pipe()
+        stdout_r, stdout_w = os.pipe()
+        stderr_r, stderr_w = os.pipe()
+        status_r, status_w = os.pipe()
+        child_ends = [stdin_r, stdout_w, stderr_w, status_w]
+        try:
+            socket.send_fds(self._sock, [b"F"], child_ends)
+            reply = b""
+            while len(reply) < 8:
+                chunk = self._sock.recv(8 - len(reply))
+                if not chunk:
+                    raise OSError("Python pool template exited")
+                reply += chunk
+        except OSError:
+            for fd in child_ends + [stdin_w, stdout_r, stderr_r, status_r]:
+                os.close(fd)
+            raise
+        for fd in child_ends:
+            os.close(fd)
+        return _Worker(int.from_bytes(reply, "little"), stdin_w, stdout_r, stderr_r, status_r)
+
+    def _start_template(self):
+        parent_sock, child_sock = socket.socketpair()
+        try:
+            self._template = subprocess.Popen(
+                [sys.executable, "-c", _TEMPLATE_SOURCE, str(child_sock.fileno())],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                pass_fds=[child_sock.fileno()],
+                cwd=tempfile.gettempdir(),
+            )
+        finally:
+            child_sock.close()
+        self._sock = parent_sock
+
+    def _stop_template(self):
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+        if self._template is not None:
+            self._template.kill()
+            self._template.wait()
+            self._template = None
+
+
+_pool: Optional[PythonWorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_python_pool() -> Optional[PythonWorkerPool]:
+    """Return the shared pool, starting it on first use. None if unavailable."""
+    global _pool
+    if not POOL_SUPPORTED or settings.python_pool_size <= 0:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                pool = PythonWorkerPool(settings.python_pool_size)
+                try:
+                    pool.start()
+                except Exception as e:
+                    print(f"Python pool start error: {e}")
+                    pool.shutdown()
+                    return None
+                _pool = pool
+    return _pool
+
+
+def shutdown_python_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
@@ -0,0 +1,118 @@
+"""
+Cache of parsed resumes keyed by file content.
+
+Retries and test uploads send the same file over and over; parsing it again
+means reopening the PDF and rerunning every extractor. Parses are stored under
+the SHA-256 of the file bytes, its type and PARSER_VERSION: an in-process LRU
+answers repeats on the same worker, and the parsed_resume_cache table answers
+them for every other worker and across restarts. Bumping PARSER_VERSION
+retires every stored parse at once. Failed parses (those with an "error", e.g.
+no PDF backend could read the file) are never stored, so they are retried.
+"""
+import copy
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import ParsedResumeCache
+from app.services.resume_service import PARSER_VERSION
+
+
+def resume_cache_key(file_content: bytes, filename: str) -> str:
+    """Content hash plus the parser inputs that change the result (file type, parser version)"""
+    file_ext = os.path.splitext(filename)[1].lower()
+    return f"{hashlib.sha256(file_content).hexdigest()}:{file_ext}:{PARSER_VERSION}"
+
+
+def is_cacheable(parsed: Dict[str, Any]) -> bool:
+    """Whether a parse may be stored: failures may succeed on a retry or on another backend"""
+    return not parsed.get("error")
+
+
+class ParseCache:
+    """LRU of parsed resumes; callers get copies, so they may modify what they receive"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            parsed = self._entries.get(key)
+            if parsed is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(parsed)
+
+    def put(self, key: str, parsed: Dict[str, Any]):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = copy.deepcopy(parsed)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses
+            }
+
+
+parse_cache = ParseCache(settings.resume_cache_size)
+
+
+def cached_parse(db: Session, key: str) -> Optional[Dict[str, Any]]:
+    """The stored parse for a resume_cache_key, from memory or the database, or None"""
+    parsed = parse_cache.get(key)
+    if parsed is not None:
+        return parsed
+    row = db.query(ParsedResumeCache).filter(ParsedResumeCache.cache_key == key).first()
+    if row is None or not is_cacheable(row.parsed_resume):
+        return None
+    parse_cache.put(key, row.parsed_resume)
+    return copy.deepcopy(row.parsed_resume)
+
+
+async def get_parsed_resume(
+    db: Session,
+    file_content: bytes,
+    filename: str,
+    parse: Callable[[], Awaitable[Dict[str, Any]]]
+) -> Tuple[Dict[str, Any], bool]:
+    """
+    The parsed resume for these file bytes and whether it came from the cache.
+    On a miss in both tiers parse() is awaited and its result stored, unless it failed.
+    """
+    key = resume_cache_key(file_content, filename)
+    parsed = cached_parse(db, key)
+    if parsed is not None:
+        return parsed, True
+
+    parsed = await parse()
+    if not is_cacheable(parsed):
+        return parsed, False
+    parse_cache.put(key, parsed)
+    try:
+        db.add(ParsedResumeCache(cache_key=key, parsed_resume=parsed))
+        db.commit()
+    except SQLAlchemyError as e:
+        # Most likely another worker stored the same file first
+        db.rollback()
+        print(f"Resume cache write error: {e}")
+    return parsed, False
@@ -0,0 +1,132 @@
+"""
+Preprocessed resume text shared by the resume extractors.
+
+A ResumeDocument is built once per resume: the text is normalized (Unicode
+compatibility forms, PDF hyphen variants, line endings), lowercased and split
+into lines once, and section headings (Experience, Education, Skills, ...) are
+located so each extractor can scan just the lines it cares about instead of
+re-deriving everything from the raw text.
+"""
+import re
+import unicodedata
+from typing import Dict, List, Tuple, Union
+
+# Section names and the headings that open them, as letters only: PDF extraction
+# often letter-spaces headings ("E D U C A TI O N"), so spaces and punctuation are
+# dropped before matching. A heading matches when it ends with one of these
+# ("Professional Experience", "Technical Skills"); "other" headings only close the
+# section before them.
+SECTION_HEADINGS = {
+    "experience": [
+        "experience", "employment", "employmenthistory", "workhistory", "careerhistory",
+        "internships", "internship"
+    ],
+    "education": [
+        "education", "academics", "academicbackground", "qualifications", "coursework",
+        "educationandtraining", "educationcertifications"
+    ],
+    "skills": [
+        "skills", "skillset", "competencies", "technologies", "technicalexpertise",
+        "toolsandtechnologies", "skillscertificates", "programminglanguages"
+    ],
+    "other": [
+        "summary", "objective", "profile", "aboutme", "projects", "certifications",
+        "certificates", "awards", "achievements", "honors", "publications", "languages",
+        "interests", "hobbies", "references", "activities", "volunteering", "contact",
+        "personaldetails", "declaration"
+    ],
+}
+
+# Longest first, so "skillscertificates" is tried before "certificates"
+_HEADING_SUFFIXES = sorted(
+    ((alias, name) for name, aliases in SECTION_HEADINGS.items() for alias in aliases),
+    key=lambda item: len(item[0]),
+    reverse=True
+)
+# Headings are short and never carry dates or numbers
+MAX_HEADING_CHARS = 40
+_NON_LETTERS = re.compile(r"[^a-z]+")
+
+# Characters PDF extractors emit for a plain hyphen
+_HYPHENS = str.maketrans({"‐": "-", "‑": "-", "­": ""})
+
+
+def normalize_text(text: str) -> str:
+    """NFKC-normalize text (ligatures, non-breaking spaces), unify line endings and hyphens"""
+    text = unicodedata.normalize("NFKC", text)
+    return text.replace("\r\n", "\n").replace("\r", "\n").translate(_HYPHENS)
+
+
+def section_heading(line_lower: str) -> Union[str, None]:
+    """Name of the section a line opens, or None if it is not a heading"""
+    stripped = line_lower.strip()
+    if not stripped or len(stripped) > MAX_HEADING_CHARS or any(c.isdigit() for c in stripped):
+        return None
+    key = _NON_LETTERS.sub("", stripped)
+    if not key:
+        return None
+    for alias, name in _HEADING_SUFFIXES:
+        if key.endswith(alias):
+            return name
+    return None
+
+
+class ResumeDocument:
+    """
+    Normalized resume text with its lines and sections.
+
+    line_offsets[i] is where line i starts in `lower`. sections maps each
+    section name to the (start, end) line ranges under its headings, heading
+    line excluded; a name can have several ranges ("Experience" and
+    "Internships").
+    """
+
+    def __init__(self, raw_text: str):
+        self.text = normalize_text(raw_text)
+        self.lower = self.text.lower()
+        self.lines = self.text.split("\n")
+        self.lower_lines = self.lower.split("\n")
+
+        self.line_offsets: List[int] = []
+        offset = 0
+        for line in self.lower_lines:
+            self.line_offsets.append(offset)
+            offset += len(line) + 1
+
+        self.sections: Dict[str, List[Tuple[int, int]]] = {}
+        current, start = None, 0
+        for i, line in enumerate(self.lower_lines):
+            name = section_heading(line)
+            if name is None:
+                continue
+            if current is not None:
+                self.sections.setdefault(current, []).append((start, i))
+            current, start = name, i + 1
+        if current is not None:
+            self.sections.setdefault(current, []).append((start, len(self.lines)))
+
+    @classmethod
+    def of(cls, text: Union[str, "ResumeDocument"]) -> "ResumeDocument":
+        """Extractors accept raw text or an already built document"""
+        return text if isinstance(text, cls) else cls(text)
+
+    def has_section(self, name: str) -> bool:
+        return name in self.sections
+
+    def section_line_numbers(self, name: str) -> List[int]:
+        """Line numbers in the named section, or every line when the resume has no such heading"""
+        ranges = self.sections.get(name)
+        if ranges is None:
+            return list(range(len(self.lines)))
+        return [i for start, end in ranges for i in range(start, end)]
+
+    def section_lower(self, name: str) -> str:
+        """Lowercased text of the named section, or the whole text when it has no such heading"""
+        ranges = self.sections.get(name)
+        if ranges is None:
+            return self.lower
+        return "\n".join(self.lower[self.line_offsets[start]:self._line_end(end)] for start, end in ranges)
+
+    def _line_end(self, end: int) -> int:
+        # Offset just past the last line of a range, without its newline
+        return self.line_offsets[end] - 1 if end < len(self.line_offsets) else len(self.lower)
@@ -0,0 +1,194 @@
+"""
+Process pool for resume parsing.
+
+PDF and DOCX extraction is CPU-bound and can take seconds on a long document,
+so upload handlers hand it to RESUME_POOL_SIZE worker processes instead of
+running it on the event loop. Workers are spawned (not forked from the threaded
+API process), import the parsers once and then serve one document at a time.
+A document still running after RESUME_PARSE_TIMEOUT_SECONDS gets its worker
+killed and fails on its own; the worker is replaced by the next request.
+"""
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from app.config import settings
+from app.services.pdf_text import extraction_stats
+
+# Longest a new worker may take to import the parsers and report ready
+WORKER_START_TIMEOUT = 60
+
+
+class ResumeParseTimeout(Exception):
+    """Raised when a document takes longer than the per-document timeout to parse"""
+
+
+def _worker_main(conn):
+    # Import the parsers before reporting ready, so startup is not billed to the first document
+    import app.services.resume_service  # noqa: F401
+
+    conn.send(("ready", None))
+    while True:
+        try:
+            fn, args = conn.recv()
+        except (EOFError, OSError):
+            break
+        try:
+            reply = ("ok", fn(*args))
+        except Exception as e:
+            reply = ("error", f"{type(e).__name__}: {e}")
+        conn.send(reply)
+
+
+class _Worker:
+    """Parent-side handle of one parser process"""
+
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), name="resume-parser", daemon=True)
+        self.process.start()
+        child_conn.close()
+        if not self.conn.poll(WORKER_START_TIMEOUT) or self.conn.recv()[0] != "ready":
+            self.kill()
+            raise RuntimeError("Resume parser worker did not start")
+
+    def kill(self):
+        self.conn.close()
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+
+
+class ResumeParserPool:
+    """Up to `size` parser processes; each document gets `timeout` seconds"""
+
+    def __init__(self, size: int, timeout: float):
+        self.size = size
+        self.timeout = timeout
+        self._context = multiprocessing.get_context("spawn")
+        self._lock = threading.Lock()
+        self._idle: List[_Worker] = []
+        # One dispatch thread per worker: waiting requests queue here, off the event loop
+        self._dispatch = ThreadPoolExecutor(max_workers=size, thread_name_prefix="resume-parse")
+        self._busy = 0
+        self.parsed = 0
+        self.timed_out = 0
+        self.crashed = 0
+
+    def run(self, fn: Callable[..., Any], *args) -> Any:
+        """
+        Call fn(*args) in a worker process and return its result. fn must be a
+        module-level function. Raises ResumeParseTimeout when the document takes
+        too long, RuntimeError when fn raises or the worker dies.
+        """
+        worker = self._acquire()
+        healthy = False
+        try:
+            worker.conn.send((fn, args))
+            if not worker.conn.poll(self.timeout):
+                with self._lock:
+                    self.timed_out += 1
+                raise ResumeParseTimeout(f"Resume parsing took longer than {self.timeout:g}s")
+            status, value = worker.conn.recv()
+            healthy = True
+        except (EOFError, OSError):
+            with self._lock:
+                self.crashed += 1
+            raise RuntimeError("Resume parser worker crashed")
+        finally:
+            self._release(worker, healthy)
+
+        if status == "error":
+            raise RuntimeError(value)
+        with self._lock:
+            self.parsed += 1
+        return value
+
+    async def run_async(self, fn: Callable[..., Any], *args) -> Any:
+        """run() awaited from the event loop"""
+        return await asyncio.wrap_future(self._dispatch.submit(self.run, fn, *args))
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": self.size,
+                "idle": len(self._idle),
+                "busy": self._busy,
+                "parsed": self.parsed,
+                "timed_out": self.timed_out,
+                "crashed": self.crashed
+            }
+
+    def shutdown(self):
+        self._dispatch.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            for worker in self._idle:
+                worker.kill()
+            self._idle = []
+
+    def _acquire(self) -> _Worker:
+        with self._lock:
+            self._busy += 1
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.process.is_alive():
+                    return worker
+                worker.kill()
+        try:
+            # At most `size` dispatch threads get here, so the pool never exceeds `size` workers
+            return _Worker(self._context)
+        except Exception:
+            with self._lock:
+                self._busy -= 1
+            raise
+
+    def _release(self, worker: _Worker, healthy: bool):
+        if not healthy:
+            # Stuck or dead; whatever it was doing dies with it
+            worker.kill()
+        with self._lock:
+            self._busy -= 1
+            if healthy:
+                self._idle.append(worker)
+
+
+_pool: Optional[ResumeParserPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_resume_pool() -> Optional[ResumeParserPool]:
+    """The shared parser pool, or None when RESUME_POOL_SIZE is 0"""
+    global _pool
+    if settings.resume_pool_size <= 0:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ResumeParserPool(settings.resume_pool_size, settings.resume_parse_timeout_seconds)
+    return _pool
+
+
+async def parse_in_pool(fn: Callable[..., Any], *args) -> Any:
+    """
+    Run a resume parser off the event loop: in the process pool, or in a thread
+    (without a timeout) when the pool is disabled. The PDF extraction report
+    that comes back with the parse is added to this process's extraction_stats.
+    """
+    pool = get_resume_pool()
+    if pool is None:
+        parsed = await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+    else:
+        parsed = await pool.run_async(fn, *args)
+    if isinstance(parsed, dict):
+        extraction_stats.record(parsed.get("extraction"))
+    return parsed
+
+
+def shutdown_resume_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+            _pool = None
@@ -1,93 +1,20 @@
 import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Union
 import os
 
-# Try to import PDF libraries (may not be available on serverless)
-try:
-    import pdfplumber
-    HAS_PDFPLUMBER = True
-except ImportError:
-    HAS_PDFPLUMBER = False
+from app.services.pdf_text import PdfTooLargeError, available_backends, extract_pdf
+from app.services.resume_document import ResumeDocument
+from app.services.skill_taxonomy import EXTRACTED_SKILL_NAMES, resume_skill_keys, skill_ids, skill_key
 
+# PDF backends may not be available on serverless (see pdf_text)
 try:
     from docx import Document
     HAS_DOCX = True
 except ImportError:
     HAS_DOCX = False
 
-try:
-    import fitz  # PyMuPDF
-    HAS_FITZ = True
-except ImportError:
-    HAS_FITZ = False
-
-try:
-    from PyPDF2 import PdfReader
-    HAS_PYPDF2 = True
-except ImportError:
-    HAS_PYPDF2 = False
-
-# Common skills database for matching
-TECH_SKILLS = [
-    # Programming Languages
-    "python", "javascript", "java", "c++", "c#", "ruby", "go", "rust", "typescript",
-    "r", "scala", "kotlin", "swift", "php", "perl", "matlab",
-    
-    # Web Frameworks
-    "react", "reactjs", "react.js", "react native", "angular", "angularjs", "angular.js",
-    "vue", "vue.js", "vuejs", "node.js", "nodejs", "node",
-    "express", "expressjs", "express.js", "django", "flask", "fastapi",
-    "spring", "spring boot", ".net", "asp.net", "laravel", "rails", "next.js", "nextjs",
-    "jquery", "backbone", "ember",
-    
-    # Databases
-    "sql", "mysql", "postgresql", "postgres", "mongodb", "redis", "elasticsearch", "cassandra",
-    "oracle", "sqlite", "dynamodb", "firebase", "supabase", "mariadb",
-    
-    # Cloud & DevOps
-    "aws", "azure", "gcp", "google cloud", "docker", "kubernetes", "k8s",
-    "jenkins", "ci/cd", "circleci", "travis", "terraform", "ansible", "cloudformation",
-    "heroku", "vercel", "netlify", "tomcat", "nginx", "apache",
-    
-    # Build Tools
-    "maven", "gradle", "grunt", "gulp", "npm", "yarn", "pnpm",
-    
-    # Tools & Version Control
-    "git", "github", "gitlab", "bitbucket", "linux", "bash", "powershell", "unix",
-    "rest api", "rest", "graphql", "microservices", "api integration", "soap",
-    
-    # AI/ML & Data Science
-    "machine learning", "deep learning", "tensorflow", "pytorch", "scikit-learn",
-    "data analysis", "pandas", "numpy", "data science", "nlp", "computer vision",
-    "rag", "langchain", "langgraph", "llm", "large language model", "gpt", "openai",
-    "hugging face", "transformers", "vector database", "embeddings", "prompt engineering",
-    "generative ai", "ai agents", "agentic ai",
-    
-    # Automation & Testing
-    "selenium", "playwright", "puppeteer", "cypress", "pytest", "junit", "mocha", "jest",
-    "web scraping", "beautifulsoup", "scrapy", "automation", "exponentjs",
-    
-    # Data & BI Tools
-    "power bi", "tableau", "excel", "looker", "metabase", "superset",
-    "apache spark", "hadoop", "airflow", "kafka", "etl",
-    
-    # Low-code/No-code & Integration
-    "n8n", "zapier", "make", "integromat", "retool", "appsmith",
-    
-    # Frontend
-    "html", "css", "sass", "scss", "less", "tailwind", "tailwindcss", "bootstrap", "webpack", "vite",
-    "figma", "ui/ux", "responsive design",
-    
-    # Project Management & Agile
-    "agile", "scrum", "jira", "confluence", "trello", "asana", "notion"
-]
-
-SOFT_SKILLS = [
-    "leadership", "communication", "teamwork", "problem solving", "analytical",
-    "time management", "project management", "mentoring", "collaboration",
-    "adaptability", "creativity", "critical thinking", "decision making",
-    "presentation", "negotiation", "stakeholder management"
-]
+# Bump whenever extraction output changes, so cached parses from older code are not served
+PARSER_VERSION = "6"
 
 EDUCATION_KEYWORDS = [
     "bachelor", "master", "phd", "b.tech", "m.tech", "b.e", "m.e", "bsc", "msc",
@@ -99,61 +26,32 @@ EDUCATION_KEYWORDS = [
 ]
 
 def extract_text_from_pdf(file_path: str) -> str:
-    """Extract text content from PDF file using multiple methods"""
-    text = ""
-    
-    # Method 1: Try pdfplumber first
-    if HAS_PDFPLUMBER:
-        try:
-            import pdfplumber
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-            if text.strip():
-                print(f"pdfplumber extracted {len(text)} chars")
-                return text
-        except Exception as e:
-            print(f"pdfplumber error: {e}")
-    
-    # Method 2: Try PyMuPDF (fitz)
-    if HAS_FITZ:
-        try:
-            doc = fitz.open(file_path)
-            for page in doc:
-                page_text = page.get_text()
-                if page_text:
-                    text += page_text + "\n"
-            doc.close()
-            if text.strip():
-                print(f"PyMuPDF extracted {len(text)} chars")
-                return text
-        except Exception as e:
-            print(f"PyMuPDF error: {e}")
-    
-    # Method 3: Try PyPDF2
-    if HAS_PYPDF2:
-        try:
-            reader = PdfReader(file_path)
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-            if text.strip():
-                print(f"PyPDF2 extracted {len(text)} chars")
-                return text
-        except Exception as e:
-            print(f"PyPDF2 error: {e}")
-    
+    """Extract text content from PDF file (backends tried in PDF_BACKENDS order)"""
     # If no PDF library available, return error message
-    if not HAS_PDFPLUMBER and not HAS_FITZ and not HAS_PYPDF2:
+    if not available_backends():
         print("WARNING: No PDF library available")
         return "PDF_LIBRARY_NOT_AVAILABLE"
     
-    print(f"WARNING: Could not extract text from PDF. It may be image-based.")
+    text = _extract_pdf_for_parse(file_path)["text"]
+    if not text.strip():
+        print(f"WARNING: Could not extract text from PDF. It may be image-based.")
     return text
 
+def _extract_pdf_for_parse(source) -> Dict[str, Any]:
+    """extract_pdf() of a path or bytes; a missing backend or an oversize file comes back as no text"""
+    if not available_backends():
+        return {"text": "", "backend": None, "attempts": [], "error": "No PDF library available"}
+    try:
+        extraction = extract_pdf(source)
+    except PdfTooLargeError as e:
+        return {"text": "", "backend": None, "attempts": [], "error": str(e)}
+    for attempt in extraction["attempts"]:
+        if attempt["status"] == "error":
+            print(f"{attempt['backend']} error: {attempt['error']}")
+    if extraction["text"]:
+        print(f"{extraction['backend']} extracted {len(extraction['text'])} chars")
+    return extraction
+
 def extract_text_from_docx(file_path: str) -> str:
     """Extract text content from Word document"""
     text = ""
@@ -182,9 +80,9 @@ def extract_phone(text: str) -> str:
     valid_phones = [p for p in matches if len(re.sub(r'\D', '', p)) >= 10]
     return valid_phones[0] if valid_phones else ""
 
-def extract_name(text: str) -> str:
+def extract_name(text: Union[str, ResumeDocument]) -> str:
     """Extract candidate name from resume (usually first line or prominent text)"""
-    lines = text.strip().split('\n')
+    lines = ResumeDocument.of(text).text.strip().split('\n')
     for line in lines[:5]:  # Check first 5 lines
         line = line.strip()
         # Skip empty lines and lines that look like headers/contact info
@@ -196,18 +94,66 @@ def extract_name(text: str) -> str:
             return line
     return ""
 
-def extract_skills(text: str) -> List[str]:
+def _trie_pattern(words: List[str]) -> str:
+    """
+    Regex alternation of words, factored into a trie so each position costs one
+    walk down the tree. Longer continuations are tried before a word ends, so
+    the longest word matching at a position wins.
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+    
+    def render(node: Dict[str, Any]) -> str:
+        branches = [re.escape(ch) + render(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+    
+    return render(trie)
+
+# The registry's extracted spellings (see skill_taxonomy), so whatever is extracted has a skill ID;
+# match-only synonyms still resolve when a job names them
+ALL_SKILLS = EXTRACTED_SKILL_NAMES
+
+# One pass finds, at every position, the longest skill with a word boundary on both sides
+_SKILL_MATCHER = re.compile(r"(?=\b(" + _trie_pattern(ALL_SKILLS) + r")\b)")
+_WORD_BOUNDARY = re.compile(r"\b")
+# Shorter skills that can match where a longer one did (e.g. "react" inside "react native")
+_SKILL_PREFIXES = {
+    skill: [other for other in ALL_SKILLS if other != skill and skill.startswith(other)]
+    for skill in ALL_SKILLS
+}
+
+def _find_skills(text_lower: str) -> set:
+    """Every skill s for which re.search(r'\b' + re.escape(s) + r'\b', text_lower) would match"""
+    found = set()
+    for match in _SKILL_MATCHER.finditer(text_lower):
+        skill = match.group(1)
+        found.add(skill)
+        for prefix in _SKILL_PREFIXES[skill]:
+            if prefix not in found and _WORD_BOUNDARY.match(text_lower, match.start() + len(prefix)):
+                found.add(prefix)
+    return found
+
+def extract_skills(text: Union[str, ResumeDocument]) -> List[str]:
     """Extract skills from resume text"""
-    text_lower = text.lower()
+    # Skills are named all over a resume (experience bullets, projects, summary),
+    # so this one reads the whole document rather than the Skills section
+    text_lower = ResumeDocument.of(text).lower
     found_skills = []
     
     # Skip false positives
     skip_words = ['& certificates', 'technical skills:', 'skills:', 'selenium)']
     
-    for skill in TECH_SKILLS + SOFT_SKILLS:
-        # Check for whole word match (with word boundaries)
-        pattern = r'\b' + re.escape(skill) + r'\b'
-        if re.search(pattern, text_lower):
+    # Whole-word matches of every skill, found in a single pass over the text
+    matched = _find_skills(text_lower)
+    for skill in ALL_SKILLS:
+        if skill in matched:
             skill_title = skill.title()
             # Clean up skill names
             if skill_title.lower() not in skip_words and len(skill_title) > 1:
@@ -225,11 +171,12 @@ def extract_skills(text: str) -> List[str]:
     return unique_skills
 
 
-def extract_experience_years(text: str) -> float:
+def extract_experience_years(text: Union[str, ResumeDocument]) -> float:
     """Estimate years of experience from resume"""
-    text_lower = text.lower()
+    doc = ResumeDocument.of(text)
+    text_lower = doc.lower
     
-    # Look for explicit experience mentions first
+    # Look for explicit experience mentions first (usually in the summary, so anywhere)
     patterns = [
         r'(\d+)\+?\s*years?\s*(?:of\s*)?experience',
         r'experience[:\s]+(\d+)\+?\s*years?',
@@ -242,9 +189,10 @@ def extract_experience_years(text: str) -> float:
             return float(max(matches, key=lambda x: int(x)))
     
     # Try to calculate from work history dates (e.g., "2011-2016" or "2011 - 2016")
-    # More flexible pattern to catch various date formats
+    # More flexible pattern to catch various date formats. Only the Experience
+    # section is read, so degree years are not counted as work.
     year_range_pattern = r'(\d{4})\s*[-–—]\s*(\d{4}|present|current|ongoing|now)'
-    date_matches = re.findall(year_range_pattern, text_lower)
+    date_matches = re.findall(year_range_pattern, doc.section_lower("experience"))
     
     if date_matches:
         total_years = 0
@@ -279,91 +227,72 @@ def extract_experience_years(text: str) -> float:
     return 0.0
 
 
-def extract_education(text: str) -> List[Dict[str, str]]:
+# Degrees in priority order: a line is credited with the first one it mentions.
+# Each has the substrings (or regexes) that name it, substrings that veto it on
+# that line, and (keyword, field) pairs where the first keyword on the line wins.
+DEGREE_TABLE = [
+    {"degree": "B.S.B.A.", "terms": ["b.s.b.a", "bsba"],
+     "fields": [("management", "Management Information Systems"), ("information", "Management Information Systems"),
+                ("business", "Business Administration")]},
+    {"degree": "M.S.", "terms": ["m.s.", "master's", "master of science", "ms in", "ms,"],
+     "fields": [("computer science", "Computer Science"), ("information", "Information Technology"),
+                ("data", "Data Science")]},
+    {"degree": "B.S.", "terms": ["b.s.", "bachelor's", "bachelor of science", "bs in", "bs,"],
+     "fields": [("computer", "Computer Science")]},
+    {"degree": "MBA", "terms": ["mba", "m.b.a"],
+     "fields": [("digital transformation", "Digital Transformation"), ("business", "Business Administration")]},
+    {"degree": "B.Tech", "terms": ["b.tech", "b tech", "btech", "b. tech"],
+     "fields": [("computer", "Computer Engineering"), ("information", "Information Technology"),
+                ("electronic", "Electronics")]},
+    {"degree": "M.Tech", "terms": ["m.tech", "m tech", "mtech"],
+     "fields": [("computer", "Computer Science")]},
+    # Regexes keep these short names from matching inside words ("be", "abca"). They
+    # open with their first letter and check the word boundary behind it, (?<!\wb),
+    # rather than opening with \b: literal openings let the combined scan skip ahead.
+    {"degree": "B.E", "patterns": [r"b(?<!\wb)\.?e\.?\b"], "unless": ["bachelor"]},
+    {"degree": "BCA", "patterns": [r"b(?<!\wb)ca\b"], "unless": ["bachelor"], "default_field": "Computer Applications"},
+    {"degree": "MCA", "patterns": [r"m(?<!\wm)ca\b"], "unless": ["m.s.", "master's"],
+     "default_field": "Computer Applications"},
+]
+
+def _degree_alternatives(entry: Dict[str, Any]) -> str:
+    return "|".join([re.escape(term) for term in entry.get("terms", [])] + entry.get("patterns", []))
+
+# Any degree at all: one scan that rules out most lines
+_DEGREE_SCAN = re.compile("|".join(_degree_alternatives(entry) for entry in DEGREE_TABLE))
+# Which degrees: a lookahead tried at every position, one named group per degree in
+# table order, so each position reports the highest-priority degree starting there
+_DEGREE_MATCHER = re.compile("(?=" + "|".join(
+    f"(?P<d{i}>{_degree_alternatives(entry)})" for i, entry in enumerate(DEGREE_TABLE)
+) + ")")
+
+def _match_degree(line_lower: str) -> Optional[Dict[str, Any]]:
+    """Highest-priority degree named on a lowercased line, or None"""
+    if not _DEGREE_SCAN.search(line_lower):
+        return None
+    found = sorted({int(match.lastgroup[1:]) for match in _DEGREE_MATCHER.finditer(line_lower)})
+    for i in found:
+        entry = DEGREE_TABLE[i]
+        if not any(word in line_lower for word in entry.get("unless", [])):
+            return entry
+    return None
+
+def extract_education(text: Union[str, ResumeDocument]) -> List[Dict[str, str]]:
     """Extract education information from resume"""
     education_list = []
-    text_lower = text.lower()
-    lines = text.split('\n')
+    doc = ResumeDocument.of(text)
     
-    # Look for specific degree mentions with context
-    for i, line in enumerate(lines):
-        line_lower = line.lower().strip()
-        matched = False  # Track if this line matched a degree
-        
-        # B.S.B.A. detection - CHECK FIRST (before B.S. since it contains "b.s.")
-        if not matched and ('b.s.b.a' in line_lower or 'bsba' in line_lower):
-            field = ""
-            if 'management' in line_lower or 'information' in line_lower:
-                field = "Management Information Systems"
-            elif 'business' in line_lower:
-                field = "Business Administration"
-            education_list.append({"degree": "B.S.B.A.", "field": field, "raw": line.strip()})
-            matched = True
-        
-        # M.S. / Master's detection
-        if not matched and ('m.s.' in line_lower or 'm.s.,' in line_lower or "master's" in line_lower or 
-            'master of science' in line_lower or 'ms in' in line_lower or 'ms,' in line_lower):
-            field = ""
-            if 'computer science' in line_lower:
-                field = "Computer Science"
-            elif 'information' in line_lower:
-                field = "Information Technology"
-            elif 'data' in line_lower:
-                field = "Data Science"
-            education_list.append({"degree": "M.S.", "field": field, "raw": line.strip()})
-            matched = True
-        
-        # B.S. / Bachelor's detection (after B.S.B.A. to avoid conflict)
-        if not matched and ('b.s.' in line_lower or 'b.s.,' in line_lower or "bachelor's" in line_lower or
-              'bachelor of science' in line_lower or 'bs in' in line_lower or 'bs,' in line_lower):
-            field = ""
-            if 'computer' in line_lower:
-                field = "Computer Science"
-            education_list.append({"degree": "B.S.", "field": field, "raw": line.strip()})
-            matched = True
-        
-        # MBA detection
-        if not matched and ('mba' in line_lower or 'm.b.a' in line_lower):
-            field = ""
-            if 'digital transformation' in line_lower:
-                field = "Digital Transformation"
-            elif 'business' in line_lower:
-                field = "Business Administration"
-            education_list.append({"degree": "MBA", "field": field, "raw": line.strip()})
-            matched = True
-        
-        # B.Tech detection
-        if not matched and ('b.tech' in line_lower or 'b tech' in line_lower or 'btech' in line_lower or 'b. tech' in line_lower):
-            field = ""
-            if 'computer' in line_lower:
-                field = "Computer Engineering"
-            elif 'information' in line_lower:
-                field = "Information Technology"
-            elif 'electronic' in line_lower:
-                field = "Electronics"
-            education_list.append({"degree": "B.Tech", "field": field, "raw": line.strip()})
-            matched = True
-        
-        # M.Tech detection
-        if not matched and ('m.tech' in line_lower or 'm tech' in line_lower or 'mtech' in line_lower):
-            field = ""
-            if 'computer' in line_lower:
-                field = "Computer Science"
-            education_list.append({"degree": "M.Tech", "field": field, "raw": line.strip()})
-            matched = True
-        
-        # B.E detection (avoid matching "be" as a word)
-        if not matched and re.search(r'\bb\.?e\.?\b', line_lower) and 'bachelor' not in line_lower:
-            education_list.append({"degree": "B.E", "field": "", "raw": line.strip()})
-            matched = True
-        
-        # BCA/MCA detection - use word boundaries to avoid false matches
-        if not matched and re.search(r'\bbca\b', line_lower) and 'bachelor' not in line_lower:
-            education_list.append({"degree": "BCA", "field": "Computer Applications", "raw": line.strip()})
-            matched = True
-        if not matched and re.search(r'\bmca\b', line_lower) and 'm.s.' not in line_lower and "master's" not in line_lower:
-            education_list.append({"degree": "MCA", "field": "Computer Applications", "raw": line.strip()})
-            matched = True
+    # One matcher pass per line of the Education section
+    for i in doc.section_line_numbers("education"):
+        line_lower = doc.lower_lines[i].strip()
+        entry = _match_degree(line_lower)
+        if entry is None:
+            continue
+        field = next(
+            (name for keyword, name in entry.get("fields", []) if keyword in line_lower),
+            entry.get("default_field", "")
+        )
+        education_list.append({"degree": entry["degree"], "field": field, "raw": doc.lines[i].strip()})
     
     # Remove duplicates
     seen = set()
@@ -377,23 +306,23 @@ def extract_education(text: str) -> List[Dict[str, str]]:
     return unique_edu if unique_edu else [{"degree": "Degree", "field": "", "raw": ""}]
 
 
-def extract_work_experience(text: str) -> List[Dict[str, Any]]:
+def extract_work_experience(text: Union[str, ResumeDocument]) -> List[Dict[str, Any]]:
     """Extract work experience entries from resume"""
     experiences = []
+    doc = ResumeDocument.of(text)
     
-    # Look for company/role patterns
+    # Look for company/role patterns in the Experience section
     # This is a simplified extraction - can be enhanced
-    lines = text.split('\n')
     current_exp = {}
     
-    for i, line in enumerate(lines):
-        line = line.strip()
-        
-        # Look for job titles
-        job_indicators = ['engineer', 'developer', 'manager', 'analyst', 'designer', 
-                         'architect', 'lead', 'senior', 'junior', 'intern', 'consultant']
+    # Look for job titles
+    job_indicators = ['engineer', 'developer', 'manager', 'analyst', 'designer', 
+                     'architect', 'lead', 'senior', 'junior', 'intern', 'consultant']
+    
+    for i in doc.section_line_numbers("experience"):
+        line = doc.lines[i].strip()
         
-        if any(indicator in line.lower() for indicator in job_indicators):
+        if any(indicator in doc.lower_lines[i] for indicator in job_indicators):
             if current_exp:
                 experiences.append(current_exp)
             current_exp = {"title": line, "description": ""}
@@ -405,39 +334,72 @@ def extract_work_experience(text: str) -> List[Dict[str, Any]]:
     
     return experiences[:5]  # Return top 5 experiences
 
+def _build_parsed_resume(raw_text: str, extraction: Dict[str, Any], no_text_error: str) -> Dict[str, Any]:
+    """Run every extractor over one preprocessed document"""
+    # Everything the PDF layer reported but the text: backend, pages, timings
+    report = {key: value for key, value in extraction.items() if key != "text"} if extraction else None
+    
+    # If no text extracted (image-based PDF), return a message
+    if not raw_text or len(raw_text.strip()) < 50:
+        result = {
+            "name": "",
+            "skills": [],
+            "skill_ids": [],
+            "experience_years": 0,
+            "education": [],
+            "work_experience": [],
+            "contact_info": {},
+            "raw_text": "",
+            "error": (extraction or {}).get("error") or no_text_error
+        }
+        if report:
+            result["extraction"] = report
+        return result
+    
+    # Extract all information from one preprocessed document
+    doc = ResumeDocument(raw_text)
+    skills = extract_skills(doc)
+    education = extract_education(doc)
+    experience_years = extract_experience_years(doc)
+    
+    # Format education for display
+    education_display = []
+    for edu in education:
+        if edu.get("field"):
+            education_display.append(f"{edu['degree']} in {edu['field']}")
+        else:
+            education_display.append(edu['degree'])
+    
+    result = {
+        "name": extract_name(doc),
+        "skills": skills,
+        "skill_ids": skill_ids(skills),
+        "experience_years": experience_years,
+        "education": education_display if education_display else ["Education info found"],
+        "education_details": education,
+        "work_experience": extract_work_experience(doc),
+        "contact_info": {
+            "email": extract_email(doc.text),
+            "phone": extract_phone(doc.text)
+        },
+        "raw_text": raw_text[:5000]  # Store first 5000 chars
+    }
+    if report:
+        result["extraction"] = report
+    return result
+
 def parse_resume_from_bytes(file_content: bytes, filename: str) -> Dict[str, Any]:
     """Parse resume from bytes in memory (for serverless environments)"""
     import io
-    import tempfile
     
     file_ext = os.path.splitext(filename)[1].lower()
     raw_text = ""
+    extraction = None
     
     # Try to extract text from bytes
     if file_ext == '.pdf':
-        # Method 1: pdfplumber from bytes
-        if HAS_PDFPLUMBER:
-            try:
-                import pdfplumber
-                with pdfplumber.open(io.BytesIO(file_content)) as pdf:
-                    for page in pdf.pages:
-                        page_text = page.extract_text()
-                        if page_text:
-                            raw_text += page_text + "\n"
-            except Exception as e:
-                print(f"pdfplumber bytes error: {e}")
-        
-        # Method 2: PyPDF2 from bytes
-        if not raw_text.strip() and HAS_PYPDF2:
-            try:
-                from PyPDF2 import PdfReader
-                reader = PdfReader(io.BytesIO(file_content))
-                for page in reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        raw_text += page_text + "\n"
-            except Exception as e:
-                print(f"PyPDF2 bytes error: {e}")
+        extraction = _extract_pdf_for_parse(file_content)
+        raw_text = extraction["text"]
     
     elif file_ext in ['.docx', '.doc']:
         if HAS_DOCX:
@@ -456,109 +418,65 @@ def parse_resume_from_bytes(file_content: bytes, filename: str) -> Dict[str, Any
         except:
             raw_text = ""
     
-    # If no text extracted
-    if not raw_text or len(raw_text.strip()) < 50:
-        return {
-            "name": "",
-            "skills": [],
-            "experience_years": 0,
-            "education": [],
-            "work_experience": [],
-            "contact_info": {},
-            "raw_text": "",
-            "error": "Could not extract text. The file may be image-based or corrupted."
-        }
-    
-    # Extract all information
-    skills = extract_skills(raw_text)
-    education = extract_education(raw_text)
-    experience_years = extract_experience_years(raw_text)
-    
-    education_display = []
-    for edu in education:
-        if edu.get("field"):
-            education_display.append(f"{edu['degree']} in {edu['field']}")
-        else:
-            education_display.append(edu['degree'])
-    
-    return {
-        "name": extract_name(raw_text),
-        "skills": skills,
-        "experience_years": experience_years,
-        "education": education_display if education_display else ["Education info found"],
-        "education_details": education,
-        "work_experience": extract_work_experience(raw_text),
-        "contact_info": {
-            "email": extract_email(raw_text),
-            "phone": extract_phone(raw_text)
-        },
-        "raw_text": raw_text[:5000]
-    }
+    return _build_parsed_resume(
+        raw_text, extraction, "Could not extract text. The file may be image-based or corrupted."
+    )
 
 def parse_resume(file_path: str) -> Dict[str, Any]:
     """Main function to parse resume and extract all information"""
     # Determine file type and extract text
     file_ext = os.path.splitext(file_path)[1].lower()
+    extraction = None
     
     if file_ext == '.pdf':
-        raw_text = extract_text_from_pdf(file_path)
+        extraction = _extract_pdf_for_parse(file_path)
+        raw_text = extraction["text"]
     elif file_ext in ['.docx', '.doc']:
         raw_text = extract_text_from_docx(file_path)
     else:
         with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
             raw_text = f.read()
     
-    # If no text extracted (image-based PDF), return a message
-    if not raw_text or len(raw_text.strip()) < 50:
-        return {
-            "name": "",
-            "skills": [],
-            "experience_years": 0,
-            "education": [],
-            "work_experience": [],
-            "contact_info": {},
-            "raw_text": "",
-            "error": "Could not extract text from PDF. The file may be image-based. Please upload a DOCX file or a text-based PDF."
-        }
-    
-    # Extract all information
-    skills = extract_skills(raw_text)
-    education = extract_education(raw_text)
-    experience_years = extract_experience_years(raw_text)
-    
-    # Format education for display
-    education_display = []
-    for edu in education:
-        if edu.get("field"):
-            education_display.append(f"{edu['degree']} in {edu['field']}")
-        else:
-            education_display.append(edu['degree'])
-    
-    return {
-        "name": extract_name(raw_text),
-        "skills": skills,
-        "experience_years": experience_years,
-        "education": education_display if education_display else ["Education info found"],
-        "education_details": education,
-        "work_experience": extract_work_experience(raw_text),
-        "contact_info": {
-            "email": extract_email(raw_text),
-            "phone": extract_phone(raw_text)
-        },
-        "raw_text": raw_text[:5000]  # Store first 5000 chars
-    }
+    return _build_parsed_resume(
+        raw_text, extraction,
+        "Could not extract text from PDF. The file may be image-based. Please upload a DOCX file or a text-based PDF."
+    )
+
+# Weights of the overall match score; match_engine computes the same score in bulk
+MATCH_WEIGHTS = {
+    "required_skills": 0.5,
+    "preferred_skills": 0.15,
+    "experience": 0.20,
+    "education": 0.15
+}
+
+def candidate_education_text(parsed_resume: Dict[str, Any]) -> str:
+    """Lowercased degrees and fields of a parsed resume, which education requirements are looked up in"""
+    # "education" holds display strings; the degree and field dicts are in "education_details"
+    return ' '.join(
+        f"{e.get('degree', '')} {e.get('field', '')}".lower() for e in parsed_resume.get("education_details", [])
+    )
+
+def match_ranking(match_score: float) -> str:
+    """Ranking bucket of an overall match score"""
+    if match_score >= 70:
+        return "high_match"
+    if match_score >= 40:
+        return "potential"
+    return "reject"
 
 def match_resume_to_job(parsed_resume: Dict[str, Any], job: Dict[str, Any]) -> Dict[str, Any]:
     """Match parsed resume against job requirements and calculate scores"""
     
-    resume_skills = [s.lower() for s in parsed_resume.get("skills", [])]
+    # Skills compare by registry ID, so "ReactJS" on a job matches "React" on a resume
+    resume_skills = resume_skill_keys(parsed_resume)
     required_skills = [s.lower() for s in job.get("required_skills", [])]
     preferred_skills = [s.lower() for s in job.get("preferred_skills", [])]
     
     # Calculate skill matches
-    matched_required = [s for s in required_skills if s in resume_skills]
-    matched_preferred = [s for s in preferred_skills if s in resume_skills]
-    missing_skills = [s for s in required_skills if s not in resume_skills]
+    matched_required = [s for s in required_skills if skill_key(s) in resume_skills]
+    matched_preferred = [s for s in preferred_skills if skill_key(s) in resume_skills]
+    missing_skills = [s for s in required_skills if skill_key(s) not in resume_skills]
     
     # Calculate scores
     required_score = len(matched_required) / len(required_skills) if required_skills else 1.0
@@ -572,27 +490,22 @@ def match_resume_to_job(parsed_resume: Dict[str, Any], job: Dict[str, Any]) -> D
     
     # Education match
     education_reqs = job.get("education_requirements", [])
-    candidate_education = [e.get("degree", "").lower() for e in parsed_resume.get("education", [])]
+    candidate_education = candidate_education_text(parsed_resume)
     education_match = not education_reqs or any(
-        req.lower() in ' '.join(candidate_education) for req in education_reqs
+        req.lower() in candidate_education for req in education_reqs
     )
     education_score = 1.0 if education_match else 0.5
     
     # Overall match score (weighted)
     match_score = (
-        required_score * 0.5 +      # 50% weight on required skills
-        preferred_score * 0.15 +    # 15% weight on preferred skills
-        experience_score * 0.20 +   # 20% weight on experience
-        education_score * 0.15      # 15% weight on education
+        required_score * MATCH_WEIGHTS["required_skills"] +      # 50% weight on required skills
+        preferred_score * MATCH_WEIGHTS["preferred_skills"] +    # 15% weight on preferred skills
+        experience_score * MATCH_WEIGHTS["experience"] +         # 20% weight on experience
+        education_score * MATCH_WEIGHTS["education"]             # 15% weight on education
     ) * 100
     
     # Determine ranking
-    if match_score >= 70:
-        ranking = "high_match"
-    elif match_score >= 40:
-        ranking = "potential"
-    else:
-        ranking = "reject"
+    ranking = match_ranking(match_score)
     
     return {
         "match_score": round(match_score, 2),
@@ -1,5 +1,6 @@
 from typing import Dict, List, Any, Optional
 from sqlalchemy.orm import Session
+from app.config import settings
 from app.models import (
     Assessment, QuestionResponse, Question, CandidateProfile,
     ProctoringEvent, FinalEvaluation, JobDescription
@@ -50,7 +51,14 @@ def score_mcq_response(question: Question, selected_option: int) -> Dict[str, An
     }
 
 def score_coding_response(question: Question, code_result: Dict[str, Any]) -> Dict[str, Any]:
-    """Score coding response based on test case results"""
+    """
+    Score coding response based on test case results.
+    When the suite has performance cases, PERFORMANCE_WEIGHT of the score is
+    efficiency credit (performance cases passed within their time budget) and
+    the rest is correctness credit (all cases passed). Performance cases whose
+    budget is unknown count for correctness only. Cases the suite's time
+    budget left no time for score nothing and are reported as tests_skipped.
+    """
     test_results = code_result.get("test_results", [])
     
     if not test_results:
@@ -67,14 +75,30 @@ def score_coding_response(question: Question, code_result: Dict[str, Any]) -> Di
     
     score_ratio = passed / total if total > 0 else 0
     score = round(question.max_score * score_ratio, 2)
-    
-    return {
+    result = {
         "is_correct": passed == total,
         "score": score,
         "max_score": question.max_score,
         "tests_passed": passed,
-        "tests_total": total
+        "tests_total": total,
+        "tests_skipped": sum(1 for t in test_results if t.get("budget_exhausted"))
     }
+    
+    performance_results = [t for t in test_results if t.get("time_budget_ms") is not None]
+    unknown_budgets = sum(1 for t in test_results if "time_budget_ms" in t and t["time_budget_ms"] is None)
+    if unknown_budgets:
+        result["performance_unknown"] = unknown_budgets
+    if performance_results:
+        within_budget = sum(1 for t in performance_results if t.get("within_budget"))
+        efficiency_ratio = within_budget / len(performance_results)
+        weight = settings.performance_weight
+        result["correctness_score"] = round(question.max_score * (1 - weight) * score_ratio, 2)
+        result["efficiency_score"] = round(question.max_score * weight * efficiency_ratio, 2)
+        result["score"] = round(result["correctness_score"] + result["efficiency_score"], 2)
+        result["performance_passed"] = within_budget
+        result["performance_total"] = len(performance_results)
+    
+    return result
 
 def score_text_response(question: Question, response_text: str) -> Dict[str, Any]:
     """
@@ -0,0 +1,130 @@
+"""
+Canonical skill registry.
+
+Every skill has one stable integer ID and any number of spellings that mean
+the same thing ("react", "reactjs", "react.js"). Parsed resumes store the IDs
+of their skills and job requirements resolve to IDs the same way, so matching
+a resume against a job is a set intersection and a synonym counts as a hit
+for its skill.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set
+
+# One entry per skill: canonical name first, then its synonyms. The resume parser
+# looks for these spellings (see MATCH_ONLY_NAMES), so this is the only list to
+# edit. A skill's ID is its position here and is stored in parsed resumes, so only
+# ever append: never reorder or remove entries (add synonyms to an existing entry freely).
+SKILL_REGISTRY: List[List[str]] = [
+    # Programming Languages
+    ["python"], ["javascript"], ["java"], ["c++"], ["c#"], ["ruby"], ["go", "golang"], ["rust"],
+    ["typescript"], ["r"], ["scala"], ["kotlin"], ["swift"], ["php"], ["perl"], ["matlab"],
+
+    # Web Frameworks
+    ["react", "reactjs", "react.js"], ["react native"], ["angular", "angularjs", "angular.js"],
+    ["vue", "vue.js", "vuejs"], ["node.js", "nodejs", "node"], ["express", "expressjs", "express.js"],
+    ["django"], ["flask"], ["fastapi"], ["spring"], ["spring boot"], [".net"], ["asp.net"],
+    ["laravel"], ["rails"], ["next.js", "nextjs"], ["jquery"], ["backbone"], ["ember"],
+
+    # Databases
+    ["sql"], ["mysql"], ["postgresql", "postgres"], ["mongodb"], ["redis"], ["elasticsearch"],
+    ["cassandra"], ["oracle"], ["sqlite"], ["dynamodb"], ["firebase"], ["supabase"], ["mariadb"],
+
+    # Cloud & DevOps
+    ["aws", "amazon web services"], ["azure"], ["gcp", "google cloud", "google cloud platform"],
+    ["docker"], ["kubernetes", "k8s"], ["jenkins"], ["ci/cd"], ["circleci"], ["travis"],
+    ["terraform"], ["ansible"], ["cloudformation"], ["heroku"], ["vercel"], ["netlify"],
+    ["tomcat"], ["nginx"], ["apache"],
+
+    # Build Tools
+    ["maven"], ["gradle"], ["grunt"], ["gulp"], ["npm"], ["yarn"], ["pnpm"],
+
+    # Tools & Version Control
+    ["git"], ["github"], ["gitlab"], ["bitbucket"], ["linux"], ["bash"], ["powershell"], ["unix"],
+    ["rest api", "rest"], ["graphql"], ["microservices"], ["api integration"], ["soap"],
+
+    # AI/ML & Data Science
+    ["machine learning"], ["deep learning"], ["tensorflow"], ["pytorch"], ["scikit-learn", "sklearn"],
+    ["data analysis"], ["pandas"], ["numpy"], ["data science"], ["nlp"], ["computer vision"],
+    ["rag"], ["langchain"], ["langgraph"], ["llm", "large language model"], ["gpt"], ["openai"],
+    ["hugging face", "huggingface"], ["transformers"], ["vector database"], ["embeddings"],
+    ["prompt engineering"], ["generative ai"], ["ai agents"], ["agentic ai"],
+
+    # Automation & Testing
+    ["selenium"], ["playwright"], ["puppeteer"], ["cypress"], ["pytest"], ["junit"], ["mocha"],
+    ["jest"], ["web scraping"], ["beautifulsoup"], ["scrapy"], ["automation"], ["exponentjs"],
+
+    # Data & BI Tools
+    ["power bi"], ["tableau"], ["excel"], ["looker"], ["metabase"], ["superset"],
+    ["apache spark", "spark"], ["hadoop"], ["airflow"], ["kafka"], ["etl"],
+
+    # Low-code/No-code & Integration
+    ["n8n"], ["zapier"], ["make", "integromat"], ["retool"], ["appsmith"],
+
+    # Frontend
+    ["html"], ["css"], ["sass", "scss"], ["less"], ["tailwind", "tailwindcss"], ["bootstrap"],
+    ["webpack"], ["vite"], ["figma"], ["ui/ux"], ["responsive design"],
+
+    # Project Management & Agile
+    ["agile"], ["scrum"], ["jira"], ["confluence"], ["trello"], ["asana"], ["notion"],
+
+    # Soft skills
+    ["leadership"], ["communication"], ["teamwork"], ["problem solving"], ["analytical"],
+    ["time management"], ["project management"], ["mentoring"], ["collaboration"],
+    ["adaptability"], ["creativity"], ["critical thinking"], ["decision making"],
+    ["presentation"], ["negotiation"], ["stakeholder management"],
+]
+
+# Every spelling, in registry order
+SKILL_NAMES: List[str] = [name for names in SKILL_REGISTRY for name in names]
+
+# Synonyms that resolve to a skill ID when matching but are not extracted from
+# resumes: the parser extracted skills under its own spellings before the
+# registry existed, and its output must not change with the registry. New
+# synonyms belong here unless the parser should start reporting them.
+MATCH_ONLY_NAMES: Set[str] = {
+    "golang", "amazon web services", "google cloud platform", "sklearn", "huggingface", "spark",
+}
+
+# The vocabulary the resume parser extracts, in registry order
+EXTRACTED_SKILL_NAMES: List[str] = [name for name in SKILL_NAMES if name not in MATCH_ONLY_NAMES]
+
+_SKILL_IDS: Dict[str, int] = {
+    name: skill_id for skill_id, names in enumerate(SKILL_REGISTRY) for name in names
+}
+
+
+def _normalize(name: str) -> str:
+    return re.sub(r"\s+", " ", name).strip().lower()
+
+
+@lru_cache(maxsize=4096)
+def skill_id(name: str) -> Optional[int]:
+    """ID of a skill by any of its spellings (case-insensitive), or None if unknown"""
+    return _SKILL_IDS.get(_normalize(name))
+
+
+def skill_name(sid: int) -> str:
+    """Canonical name of a skill ID"""
+    return SKILL_REGISTRY[sid][0]
+
+
+def skill_ids(names: Iterable[str]) -> List[int]:
+    """Sorted IDs of the known skills among names; unknown names are left out"""
+    return sorted({sid for sid in map(skill_id, names) if sid is not None})
+
+
+def skill_key(name: str):
+    """
+    What a skill is matched by: its ID when known, else its normalized name,
+    so free-text job requirements still match the same text on a resume.
+    """
+    sid = skill_id(name)
+    return sid if sid is not None else _normalize(name)
+
+
+def resume_skill_keys(parsed_resume: Dict) -> Set:
+    """Match keys of a parsed resume's skills; resumes parsed before skill IDs existed are resolved by name"""
+    if "skill_ids" in parsed_resume:
+        return set(parsed_resume["skill_ids"])
+    return {skill_key(s) for s in parsed_resume.get("skills", [])}
@@ -0,0 +1,83 @@
+"""
+Benchmark extract_skills against the previous one-regex-per-skill implementation.
+
+Usage: python benchmark_skills.py [resume_dir] [repeats]
+
+Extracts the text of every resume in resume_dir (default uploads/resumes),
+checks that both implementations return the same skills in the same order,
+and reports the time per resume of each.
+"""
+import sys
+import os
+import re
+import time
+
+# Get the directory where this script is located
+backend_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Ensure the backend directory is in the path
+sys.path.insert(0, backend_dir)
+
+# Change working directory to backend folder
+os.chdir(backend_dir)
+
+from app.services.resume_service import (
+    ALL_SKILLS, extract_skills, extract_text_from_docx, extract_text_from_pdf
+)
+
+
+def legacy_extract_skills(text: str):
+    """extract_skills as it was: one re.search per skill over the whole text"""
+    text_lower = text.lower()
+    found_skills = []
+    skip_words = ['& certificates', 'technical skills:', 'skills:', 'selenium)']
+    for skill in ALL_SKILLS:
+        pattern = r'\b' + re.escape(skill) + r'\b'
+        if re.search(pattern, text_lower):
+            skill_title = skill.title()
+            if skill_title.lower() not in skip_words and len(skill_title) > 1:
+                found_skills.append(skill_title)
+    seen = set()
+    unique_skills = []
+    for s in found_skills:
+        if s.lower() not in seen:
+            seen.add(s.lower())
+            unique_skills.append(s)
+    return unique_skills
+
+
+def load_text(path: str) -> str:
+    if path.lower().endswith(".pdf"):
+        return extract_text_from_pdf(path)
+    if path.lower().endswith(".docx"):
+        return extract_text_from_docx(path)
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        return f.read()
+
+
+def time_per_call(fn, text: str, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn(text)
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+if __name__ == "__main__":
+    resume_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.join("uploads", "resumes")
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    total_legacy = total_new = 0.0
+    print(f"{'resume':<60} {'chars':>8} {'skills':>6} {'legacy ms':>10} {'new ms':>8} {'speedup':>8}")
+    for name in sorted(os.listdir(resume_dir)):
+        text = load_text(os.path.join(resume_dir, name))
+        expected = legacy_extract_skills(text)
+        actual = extract_skills(text)
+        if actual != expected:
+            print(f"MISMATCH in {name}:\n  legacy: {expected}\n  new:    {actual}")
+            sys.exit(1)
+        legacy_ms = time_per_call(legacy_extract_skills, text, repeats)
+        new_ms = time_per_call(extract_skills, text, repeats)
+        total_legacy += legacy_ms
+        total_new += new_ms
+        print(f"{name[:60]:<60} {len(text):>8} {len(actual):>6} {legacy_ms:>10.2f} {new_ms:>8.2f} {legacy_ms / new_ms:>7.1f}x")
+    print(f"{'total':<60} {'':>8} {'':>6} {total_legacy:>10.2f} {total_new:>8.2f} {total_legacy / total_new:>7.1f}x")
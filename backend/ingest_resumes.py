@@ -0,0 +1,59 @@
+"""
+Bulk-ingest resumes from a zip archive or a directory.
+
+Usage: python ingest_resumes.py <archive.zip | directory>
+
+Creates or updates a candidate per resume (matched by the email on it), with
+the same pipeline as POST /api/recruiter/resumes/bulk, and prints progress as
+it goes. Exits with status 1 if any file failed.
+"""
+import sys
+import os
+import asyncio
+
+# Get the directory where this script is located
+backend_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Ensure the backend directory is in the path
+sys.path.insert(0, backend_dir)
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print(__doc__.strip())
+        sys.exit(2)
+    # Resolve the path before moving to the backend folder, where the database lives
+    source_path = os.path.abspath(sys.argv[1])
+    os.chdir(backend_dir)
+
+    from app.database import Base, engine
+    from app.services.bulk_ingest import ResumeSource, ingest_resumes
+    from app.services.resume_pool import shutdown_resume_pool
+
+    Base.metadata.create_all(bind=engine)
+    source = ResumeSource.open(source_path)
+    print(f"Ingesting {source.total} resumes from {source_path}")
+
+    async def run() -> int:
+        failed = 0
+        async for event in ingest_resumes(source):
+            if event["event"] == "file":
+                status = f"FAILED: {event['error']}" if event["status"] == "failed" else "parsed"
+                print(f"[{event['processed']}/{event['total']}] {event['file']}: {status}")
+            elif event["event"] == "batch":
+                print(f"Saved {event['saved']} candidates ({event['created']} new, {event['updated']} updated)")
+                for failure in event["failed"]:
+                    print(f"  not saved: {failure['file']}: {failure['error']}")
+            else:
+                failed = event["failed"]
+                print(
+                    f"Done in {event['elapsed_ms'] / 1000:.1f}s: {event['parsed']} parsed, "
+                    f"{event['saved']} saved, {failed} failed of {event['total']}"
+                )
+        return failed
+
+    try:
+        failed = asyncio.run(run())
+    finally:
+        source.close()
+        shutdown_resume_pool()
+    sys.exit(1 if failed else 0)
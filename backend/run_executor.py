@@ -0,0 +1,33 @@
+import sys
+import os
+import asyncio
+import signal
+
+# Get the directory where this script is located
+backend_dir = os.path.dirname(os.path.abspath(__file__))
+
+# Ensure the backend directory is in the path
+sys.path.insert(0, backend_dir)
+
+# Change working directory to backend folder
+os.chdir(backend_dir)
+
+if __name__ == "__main__":
+    from app.config import settings
+    from app.services.executor_service import serve
+    from app.services.python_pool import shutdown_python_pool
+    from app.services.node_pool import shutdown_node_pool
+    from app.services.execution_telemetry import telemetry
+
+    # API workers reach this daemon when started with the same EXECUTOR_SOCKET
+    socket_path = sys.argv[1] if len(sys.argv) > 1 else (settings.executor_socket or "/tmp/disco-executor.sock")
+    # Stop on SIGTERM as on Ctrl+C, so the socket is removed and sandbox workers are reaped
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        asyncio.run(serve(socket_path))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shutdown_python_pool()
+        shutdown_node_pool()
+        telemetry.shutdown()
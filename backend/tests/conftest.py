@@ -0,0 +1,13 @@
+import sys
+import os
+
+# Make the app package importable however pytest is started
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--update",
+        action="store_true",
+        help="Rewrite the golden files from the current output instead of checking against them"
+    )
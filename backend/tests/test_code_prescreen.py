@@ -0,0 +1,79 @@
+"""
+Tests for the static prescreen: what it rejects and why, and that verdicts are
+keyed on the code and the suite digest without hashing oversize sources.
+"""
+import pytest
+
+from app.config import settings
+from app.services import code_prescreen
+from app.services.code_prescreen import prescreen_code, suite_digest
+
+STDIN_CASES = [{"input": "1", "expected_output": "1"}]
+
+
+@pytest.mark.parametrize("code", [
+    "import subprocess\nsubprocess.run(['ls'])",
+    "from socket import socket",
+    "__import__('ctypes')",
+    "import os\nos.system('ls')",
+    "import os as o\nprint(o.popen('ls').read())",
+    "from os import execv",
+    "import os\ndef f():\n    os.fork()\nf()",
+    "__import__('os').spawnl(0, '/bin/sh', 'sh')",
+    "import posix\nposix.system('ls')",
+])
+def test_banned_modules_and_os_process_calls(code):
+    verdict = prescreen_code(code, "python", STDIN_CASES)
+    assert not verdict["valid"]
+    assert verdict["reason"] == "banned_import"
+
+
+@pytest.mark.parametrize("code", [
+    "import os\nprint(os.path.join('a', 'b'))",
+    "import os\nprint(os.getcwd())",
+    "class Shell:\n    def system(self):\n        return 1\nprint(Shell().system())",
+    "import sys, resource\nsys.setrecursionlimit(10 ** 6)\nprint(input())",
+])
+def test_ordinary_code_is_accepted(code):
+    assert prescreen_code(code, "python", STDIN_CASES)["valid"]
+
+
+def test_syntax_and_entry_point_rejections():
+    assert prescreen_code("def f(:\n", "python")["reason"] == "syntax"
+    assert prescreen_code("def f(x):\n    return x", "python", STDIN_CASES)["reason"] == "no_entry_point"
+    missing = prescreen_code("def g(x):\n    return x", "python", [{"function": "f", "args": [1]}])
+    assert missing["reason"] == "no_entry_point" and "'f'" in missing["error"]
+    assert prescreen_code("def f(x):\n    return x", "python", [{"function": "f", "args": [1]}])["valid"]
+
+
+def test_javascript_banned_modules():
+    assert prescreen_code("const cp = require('child_process')", "javascript")["reason"] == "banned_import"
+    assert prescreen_code("import net from 'node:net'", "js")["reason"] == "banned_import"
+    assert prescreen_code("const fs = require('fs')", "javascript")["valid"]
+
+
+def test_oversize_source_is_rejected_before_hashing(monkeypatch):
+    def no_hashing(_):
+        raise AssertionError("suite hashed for an oversize source")
+
+    monkeypatch.setattr(code_prescreen, "suite_digest", no_hashing)
+    verdict = prescreen_code("x" * (settings.max_source_bytes + 1), "python", STDIN_CASES)
+    assert verdict["reason"] == "oversize"
+
+
+def test_verdicts_are_keyed_on_the_suite_digest(monkeypatch):
+    code = "def f(x):\n    return x  # keyed on digest"
+    cases = [{"function": "f", "args": [1]}]
+    digest = suite_digest(cases)
+    first = prescreen_code(code, "python", cases, digest)
+    assert first["valid"]
+    hits = code_prescreen.prescreen_cache.hits
+
+    def no_hashing(_):
+        raise AssertionError("suite hashed although its digest was given")
+
+    monkeypatch.setattr(code_prescreen, "suite_digest", no_hashing)
+    assert prescreen_code(code, "python", cases, digest) == first
+    assert code_prescreen.prescreen_cache.hits == hits + 1
+    # Another suite is another verdict: f is not defined for it
+    assert not prescreen_code(code, "python", [{"function": "g", "args": [1]}], "other")["valid"]
@@ -0,0 +1,80 @@
+"""
+Tests for the compiled-language backend: builds held by a caller survive
+eviction until released, and run commands follow each run's memory limit.
+"""
+import os
+import shutil
+
+import pytest
+
+from app.services import compiled_runner
+from app.services.compiled_runner import ArtifactCache, _java_classes, run_artifact
+
+needs_gcc = pytest.mark.skipif(shutil.which("gcc") is None, reason="gcc is not installed")
+
+PROGRAM = '#include <stdio.h>\nint main(void) { int x; scanf("%%d", &x); printf("%%d\\n", x * %d); return 0; }\n'
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ArtifactCache(1, str(tmp_path))
+
+
+@needs_gcc
+def test_evicted_build_is_kept_until_released(cache):
+    held, cached = cache.get_or_compile("c", PROGRAM % 2)
+    assert held.ok and not cached
+    # Compiling another source evicts the held build, which must stay runnable
+    other, _ = cache.get_or_compile("c", PROGRAM % 3)
+    cache.release(other)
+    assert held.evicted and os.path.isdir(held.directory)
+    assert run_artifact(held, "c", "21\n", 5, 64 * 1024 * 1024).stdout == "42\n"
+
+    cache.release(held)
+    assert not os.path.exists(held.directory)
+
+
+@needs_gcc
+def test_unheld_build_is_deleted_on_eviction(cache):
+    first, _ = cache.get_or_compile("c", PROGRAM % 2)
+    cache.release(first)
+    second, _ = cache.get_or_compile("c", PROGRAM % 3)
+    assert first.evicted and not os.path.exists(first.directory)
+    again, cached = cache.get_or_compile("c", PROGRAM % 3)
+    assert cached and again is second
+    cache.release(second)
+    cache.release(again)
+    assert os.path.isdir(second.directory)
+
+
+@needs_gcc
+def test_compile_errors_are_cached(cache):
+    broken, _ = cache.get_or_compile("c", "int main( {")
+    cache.release(broken)
+    assert not broken.ok and "error" in broken.error
+    again, cached = cache.get_or_compile("c", "int main( {")
+    cache.release(again)
+    assert cached and again is broken
+
+
+def test_java_heap_follows_each_runs_memory_limit(cache, monkeypatch):
+    source = "public class Solution { public static void main(String[] a) {} }"
+    monkeypatch.setattr(compiled_runner, "run_process", lambda *args, **kwargs: (args, kwargs))
+    monkeypatch.setattr(cache, "_compile", lambda key, spec, file_class, main_class, *_: compiled_runner.Artifact(
+        key, "/nonexistent", main_class, None, 0.0
+    ))
+    artifact, _ = cache.get_or_compile("java", source)
+
+    (args, *_), kwargs = run_artifact(artifact, "java", "", 5, 256 * 1024 * 1024)
+    assert "-Xmx256m" in args and args[-1] == "Solution"
+    assert kwargs["memory_bytes"] is None
+    (args, *_), _ = run_artifact(artifact, "java", "", 5, 64 * 1024 * 1024)
+    assert "-Xmx64m" in args
+
+
+def test_java_file_and_main_class():
+    assert _java_classes("class Helper {}\npublic class Solution { public static void main(String[] a) {} }") == (
+        "Solution", "Solution"
+    )
+    assert _java_classes("public class Api {}\nclass Main { public static void main(String[] a) {} }") == ("Api", "Main")
+    assert _java_classes("class A { // void main(\n}") == ("Main", "Main")
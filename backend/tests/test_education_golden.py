@@ -0,0 +1,207 @@
+"""
+Golden tests for extract_education over the sample resumes in uploads/resumes.
+
+Each sample is checked whole (section-aware, with dedup) and line by line, so
+every line of every sample pins down which degree and field it maps to.
+PDF samples are read with PDF_BACKEND only, since other backends lay the same
+page out differently. Regenerate the goldens after an intended change with:
+
+    pytest tests --update
+
+The goldens only pin down the current output, so the samples (and some lines
+made to reach every branch) are also checked against legacy_extract_education,
+the chain of substring tests the degree table replaced.
+"""
+import json
+import os
+import re
+from typing import Dict, List
+
+import pytest
+
+from app.config import settings
+from app.services.pdf_text import BACKENDS
+from app.services.resume_document import ResumeDocument
+from app.services.resume_service import extract_education, extract_text_from_docx, extract_text_from_pdf
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESUME_DIR = os.path.join(BACKEND_DIR, "uploads", "resumes")
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden", "education.json")
+# The backend the goldens were recorded with
+PDF_BACKEND = "pdfium"
+
+
+@pytest.fixture(autouse=True)
+def pinned_pdf_backend(monkeypatch):
+    monkeypatch.setattr(settings, "pdf_backends", PDF_BACKEND)
+
+
+def load_text(name: str) -> str:
+    path = os.path.join(RESUME_DIR, name)
+    if name.lower().endswith(".pdf"):
+        if not BACKENDS[PDF_BACKEND][0]:
+            pytest.skip(f"{PDF_BACKEND} is not installed")
+        return extract_text_from_pdf(path)
+    if name.lower().endswith(".docx"):
+        return extract_text_from_docx(path)
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        return f.read()
+
+
+def education_snapshot(text: str) -> dict:
+    """Whole-resume result plus the degree and field of every line that has one"""
+    lines = []
+    for number, line in enumerate(text.split("\n")):
+        found = extract_education(line)
+        if found[0]["raw"]:
+            lines.append([number, found[0]["degree"], found[0]["field"]])
+    return {"resume": extract_education(text), "lines": lines}
+
+
+def sample_names():
+    return sorted(os.listdir(RESUME_DIR))
+
+
+def load_goldens() -> dict:
+    if not os.path.exists(GOLDEN_PATH):
+        return {}
+    with open(GOLDEN_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture(scope="module")
+def goldens(request):
+    """The recorded snapshots; with --update, the ones this run takes are written back at the end"""
+    goldens = load_goldens()
+    yield goldens
+    if request.config.getoption("--update"):
+        with open(GOLDEN_PATH, "w", encoding="utf-8") as f:
+            json.dump(dict(sorted(goldens.items())), f, indent=1, ensure_ascii=False)
+            f.write("\n")
+
+
+@pytest.mark.parametrize("name", sample_names())
+def test_education_matches_golden(name, goldens, request):
+    snapshot = education_snapshot(load_text(name))
+    if request.config.getoption("--update"):
+        goldens[name] = snapshot
+        return
+    assert name in goldens, f"No golden for {name}; run pytest tests --update"
+    assert snapshot == goldens[name]
+
+
+def legacy_extract_education(text: str) -> List[Dict[str, str]]:
+    """extract_education before the degree table, verbatim"""
+    education_list = []
+    doc = ResumeDocument.of(text)
+
+    for i in doc.section_line_numbers("education"):
+        line = doc.lines[i]
+        line_lower = doc.lower_lines[i].strip()
+        matched = False
+
+        if not matched and ('b.s.b.a' in line_lower or 'bsba' in line_lower):
+            field = ""
+            if 'management' in line_lower or 'information' in line_lower:
+                field = "Management Information Systems"
+            elif 'business' in line_lower:
+                field = "Business Administration"
+            education_list.append({"degree": "B.S.B.A.", "field": field, "raw": line.strip()})
+            matched = True
+
+        if not matched and ('m.s.' in line_lower or 'm.s.,' in line_lower or "master's" in line_lower or
+            'master of science' in line_lower or 'ms in' in line_lower or 'ms,' in line_lower):
+            field = ""
+            if 'computer science' in line_lower:
+                field = "Computer Science"
+            elif 'information' in line_lower:
+                field = "Information Technology"
+            elif 'data' in line_lower:
+                field = "Data Science"
+            education_list.append({"degree": "M.S.", "field": field, "raw": line.strip()})
+            matched = True
+
+        if not matched and ('b.s.' in line_lower or 'b.s.,' in line_lower or "bachelor's" in line_lower or
+              'bachelor of science' in line_lower or 'bs in' in line_lower or 'bs,' in line_lower):
+            field = ""
+            if 'computer' in line_lower:
+                field = "Computer Science"
+            education_list.append({"degree": "B.S.", "field": field, "raw": line.strip()})
+            matched = True
+
+        if not matched and ('mba' in line_lower or 'm.b.a' in line_lower):
+            field = ""
+            if 'digital transformation' in line_lower:
+                field = "Digital Transformation"
+            elif 'business' in line_lower:
+                field = "Business Administration"
+            education_list.append({"degree": "MBA", "field": field, "raw": line.strip()})
+            matched = True
+
+        if not matched and ('b.tech' in line_lower or 'b tech' in line_lower or 'btech' in line_lower or 'b. tech' in line_lower):
+            field = ""
+            if 'computer' in line_lower:
+                field = "Computer Engineering"
+            elif 'information' in line_lower:
+                field = "Information Technology"
+            elif 'electronic' in line_lower:
+                field = "Electronics"
+            education_list.append({"degree": "B.Tech", "field": field, "raw": line.strip()})
+            matched = True
+
+        if not matched and ('m.tech' in line_lower or 'm tech' in line_lower or 'mtech' in line_lower):
+            field = ""
+            if 'computer' in line_lower:
+                field = "Computer Science"
+            education_list.append({"degree": "M.Tech", "field": field, "raw": line.strip()})
+            matched = True
+
+        if not matched and re.search(r'\bb\.?e\.?\b', line_lower) and 'bachelor' not in line_lower:
+            education_list.append({"degree": "B.E", "field": "", "raw": line.strip()})
+            matched = True
+
+        if not matched and re.search(r'\bbca\b', line_lower) and 'bachelor' not in line_lower:
+            education_list.append({"degree": "BCA", "field": "Computer Applications", "raw": line.strip()})
+            matched = True
+        if not matched and re.search(r'\bmca\b', line_lower) and 'm.s.' not in line_lower and "master's" not in line_lower:
+            education_list.append({"degree": "MCA", "field": "Computer Applications", "raw": line.strip()})
+            matched = True
+
+    seen = set()
+    unique_edu = []
+    for edu in education_list:
+        key = edu['degree']
+        if key not in seen:
+            seen.add(key)
+            unique_edu.append(edu)
+
+    return unique_edu if unique_edu else [{"degree": "Degree", "field": "", "raw": ""}]
+
+
+# Lines that reach every branch of the legacy chain, and where branches overlap
+EDUCATION_LINES = [
+    "B.S.B.A. in Management Information Systems", "BSBA, Business", "bsba",
+    "M.S. in Computer Science", "Master's in Information Systems", "Master of Science, Data Analytics",
+    "MS in Physics", "MS, Stanford", "M.S., MCA equivalent",
+    "B.S. Computer Engineering", "Bachelor's degree", "Bachelor of Science in Biology", "BS in Math", "BS, MIT",
+    "MBA, Digital Transformation", "M.B.A. Business School", "mba",
+    "B.Tech Computer Science", "B Tech Information Technology", "BTech Electronics", "B. Tech Civil",
+    "M.Tech in Computer Science", "M Tech", "mtech",
+    "B.E. Mechanical", "BE", "b.e bachelor", "Be the change",
+    "BCA", "BCA bachelor", "MCA", "MCA and Master's", "MCA, M.S.",
+    "Bachelor of Science and MBA", "M.S. and B.Tech", "B.Tech, M.Tech", "MBA in Information Technology",
+    "Bsc in bsba", "Alumni, Harvard", "",
+]
+
+
+@pytest.mark.parametrize("line", EDUCATION_LINES)
+def test_degree_table_matches_legacy_chain_on_lines(line):
+    assert extract_education(line) == legacy_extract_education(line)
+
+
+@pytest.mark.parametrize("name", sample_names())
+def test_degree_table_matches_legacy_chain_on_samples(name):
+    text = load_text(name)
+    assert extract_education(text) == legacy_extract_education(text)
+    for line in text.split("\n"):
+        assert extract_education(line) == legacy_extract_education(line), line
@@ -0,0 +1,95 @@
+"""
+Tests for per-question limits: the suite budget's clock, how a question's
+budget is derived, and how cases the budget cuts off are reported and scored.
+"""
+import threading
+import time
+from types import SimpleNamespace
+
+from app.config import settings
+from app.services.code_executor import (
+    BUDGET_EXHAUSTED, EXECUTION_TIMEOUT, MAX_MEMORY_CAP, ExecutionLimits, SuiteBudget, execute_code
+)
+from app.services.scoring_service import score_coding_response
+
+
+def test_budget_only_runs_while_cases_run():
+    budget = SuiteBudget(0.2)
+    time.sleep(0.3)
+    assert not budget.exhausted()
+    with budget.running():
+        time.sleep(0.25)
+    assert budget.exhausted()
+    assert budget.remaining() < 0
+
+
+def test_parallel_cases_are_charged_once():
+    budget = SuiteBudget(1.0)
+
+    def case():
+        with budget.running():
+            time.sleep(0.3)
+
+    threads = [threading.Thread(target=case) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert 0.5 < budget.remaining() < 0.75
+
+
+def test_suite_budget_is_the_sum_of_case_limits():
+    limits = ExecutionLimits.for_suite([{"time_limit": 1}, {"time_limit": 2.5}, {}])
+    assert limits.suite_budget == 3.5 + EXECUTION_TIMEOUT
+    capped = ExecutionLimits.for_suite([{}] * 100)
+    assert capped.suite_budget == settings.max_suite_seconds
+    assert ExecutionLimits.for_suite(None).suite_budget == settings.max_suite_seconds
+
+
+def test_case_limits_are_capped():
+    limits = ExecutionLimits()
+    assert limits.timeout_for({"time_limit": 1000}) == EXECUTION_TIMEOUT
+    assert limits.memory_for({"memory_limit_mb": 10 ** 6}) == MAX_MEMORY_CAP
+    assert limits.memory_for({"memory_limit_mb": 32}) == 32 * 1024 * 1024
+    budget = SuiteBudget(0.5)
+    assert limits.timeout_for({}, budget) == 0.5
+
+
+SLOW = "import time\nn = int(input())\ntime.sleep(0.4)\nprint(n)"
+
+
+def test_cases_past_the_budget_are_flagged_and_scored(monkeypatch):
+    monkeypatch.setattr(settings, "max_parallel_cases", 1)
+    cases = [{"input": str(i), "expected_output": str(i), "time_limit": 0.25} for i in range(4)]
+    limits = ExecutionLimits.for_suite(cases)
+    assert limits.suite_budget == 1.0
+    cases = [dict(case, time_limit=1) for case in cases]
+    result = execute_code(SLOW, "python", cases, use_cache=False, limits=limits)
+
+    results = result["test_results"]
+    assert results[0]["passed"] and results[1]["passed"]
+    assert all(r["budget_exhausted"] and r["error"] == BUDGET_EXHAUSTED for r in results[2:])
+    assert "not run: suite time budget exhausted" in result["output"]
+
+    score = score_coding_response(SimpleNamespace(max_score=10.0), result)
+    assert score["tests_passed"] == 2 and score["tests_skipped"] == 2 and score["score"] == 5.0
+
+
+def test_harness_cases_past_the_budget_are_flagged():
+    code = "import time\ndef f(x):\n    time.sleep(0.3)\n    return x"
+    cases = [{"function": "f", "args": [i], "expected_output": str(i)} for i in range(6)]
+    result = execute_code(code, "python", cases, use_cache=False, limits=ExecutionLimits(suite_budget=1))
+    results = result["test_results"]
+    assert results[0]["passed"]
+    assert results[-1]["budget_exhausted"]
+    assert all(r["passed"] or r.get("budget_exhausted") for r in results)
+
+
+def test_timeout_is_not_a_budget_skip():
+    result = execute_code(
+        "import time\ntime.sleep(5)\nprint(input())", "python",
+        [{"input": "1", "expected_output": "1", "time_limit": 0.3}],
+        use_cache=False
+    )
+    assert result["test_results"][0]["error"] == "Timeout"
+    assert "budget_exhausted" not in result["test_results"][0]
@@ -0,0 +1,103 @@
+"""
+Tests for the execution scheduler (priorities, the graded reserve) and for the
+async execution path in front of it: prescreening and cache lookups stay off
+the event loop, and a known suite digest spares hashing the suite.
+"""
+import asyncio
+import threading
+
+import pytest
+
+from app.services import code_executor
+from app.services.code_executor import ExecutionLimits, execute_code_local_async, suite_digest
+from app.services.execution_scheduler import (
+    PRIORITY_GRADED, PRIORITY_PRACTICE, ExecutionScheduler, QueueFullError
+)
+
+
+def blocked_scheduler(max_queue: int):
+    """A one-slot scheduler whose slot is held until the returned event is set"""
+    scheduler = ExecutionScheduler(slots=1, max_queue=max_queue)
+    release, started = threading.Event(), threading.Event()
+    scheduler.submit(PRIORITY_GRADED, lambda: (started.set(), release.wait(5)))
+    assert started.wait(5)
+    return scheduler, release
+
+
+def test_graded_jobs_run_before_practice_jobs():
+    scheduler, release = blocked_scheduler(max_queue=10)
+    order = []
+    futures = [
+        scheduler.submit(PRIORITY_PRACTICE, lambda: order.append("practice")),
+        scheduler.submit(PRIORITY_GRADED, lambda: order.append("graded")),
+    ]
+    release.set()
+    for future in futures:
+        future.result(5)
+    assert order == ["graded", "practice"]
+
+
+def test_practice_runs_cannot_fill_the_graded_reserve():
+    scheduler, release = blocked_scheduler(max_queue=5)
+    futures = [scheduler.submit(PRIORITY_PRACTICE, lambda: None) for _ in range(scheduler.practice_limit)]
+    with pytest.raises(QueueFullError) as exc:
+        scheduler.submit(PRIORITY_PRACTICE, lambda: None)
+    assert exc.value.retry_after >= 1
+    futures.append(scheduler.submit(PRIORITY_GRADED, lambda: None))
+    release.set()
+    for future in futures:
+        future.result(5)
+    assert scheduler.stats()["rejected"] == 1
+
+
+def test_run_propagates_job_exceptions():
+    scheduler = ExecutionScheduler(slots=1, max_queue=4)
+
+    def boom():
+        raise ValueError("job failed")
+
+    with pytest.raises(ValueError, match="job failed"):
+        asyncio.run(scheduler.run(PRIORITY_GRADED, boom))
+
+
+def test_prescreen_and_cache_lookup_run_off_the_event_loop(monkeypatch):
+    loop_threads = []
+    screen = code_executor._screen
+
+    def recording_screen(*args):
+        loop_threads.append(threading.current_thread() is threading.main_thread())
+        return screen(*args)
+
+    monkeypatch.setattr(code_executor, "_screen", recording_screen)
+    result = asyncio.run(execute_code_local_async("import subprocess", "python", [{"input": "", "expected_output": ""}]))
+    assert result["rejected"] == "banned_import"
+    assert loop_threads == [False]
+
+
+def test_cache_hits_skip_the_scheduler_and_the_suite_hash(monkeypatch):
+    code = "print(input())  # cache hit test"
+    test_cases = [{"input": "hi", "expected_output": "hi"}]
+    digest = suite_digest(test_cases)
+    first = asyncio.run(execute_code_local_async(code, "python", test_cases, digest=digest))
+    assert first["success"] and not first["cached"]
+
+    def no_hashing(_):
+        raise AssertionError("suite hashed again")
+
+    def no_scheduling(*_):
+        raise AssertionError("cache hit was scheduled")
+
+    monkeypatch.setattr(code_executor, "suite_digest", no_hashing)
+    monkeypatch.setattr(code_executor.scheduler, "submit", no_scheduling)
+    second = asyncio.run(execute_code_local_async(code, "python", test_cases, digest=digest))
+    assert second["cached"]
+    assert second["test_results"] == first["test_results"]
+
+
+def test_digest_matches_an_unhashed_run():
+    code = "print(int(input()) + 1)"
+    test_cases = [{"input": "1", "expected_output": "2"}]
+    key = code_executor._cache_key(code, "python", test_cases, False, True, ExecutionLimits())
+    assert key == code_executor._cache_key(
+        code, "python", test_cases, False, True, ExecutionLimits(), suite_digest(test_cases)
+    )
@@ -0,0 +1,39 @@
+"""
+Tests for the invite tokens that let a bulk-imported candidate claim their
+account: bound to one account and address, and useless for signing in.
+"""
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.services.auth_service import (
+    create_access_token, create_invite_token, get_current_user, verify_invite_token
+)
+
+IMPORTED = SimpleNamespace(id=7, email="ada@example.com")
+
+
+def test_invite_claims_only_its_account():
+    token = create_invite_token(IMPORTED)
+    assert verify_invite_token(token, IMPORTED)
+    assert not verify_invite_token(token, SimpleNamespace(id=8, email="ada@example.com"))
+    assert not verify_invite_token(token, SimpleNamespace(id=7, email="eve@example.com"))
+    assert not verify_invite_token(None, IMPORTED)
+    assert not verify_invite_token("not-a-token", IMPORTED)
+
+
+def test_expired_and_session_tokens_are_not_invites():
+    expired = create_access_token({"claim": 7, "email": IMPORTED.email}, timedelta(seconds=-1))
+    assert not verify_invite_token(expired, IMPORTED)
+    assert not verify_invite_token(create_access_token({"sub": "7"}), IMPORTED)
+
+
+def test_invite_cannot_sign_in():
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=create_invite_token(IMPORTED))
+    with pytest.raises(HTTPException) as e:
+        asyncio.run(get_current_user(credentials, db=None))
+    assert e.value.status_code == 401
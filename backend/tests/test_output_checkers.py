@@ -0,0 +1,78 @@
+"""
+Tests for the streaming output checkers: each mode accepts and rejects what its
+docstring says, and the verdict does not depend on how the output is chunked.
+"""
+import pytest
+
+from app.services.output_checkers import CHECKERS, check_output, get_checker
+
+
+def chunked(test_case, output: str, size: int) -> bool:
+    checker = get_checker(test_case)
+    data = output.encode("utf-8")
+    for start in range(0, len(data), size):
+        checker.feed(data[start:start + size])
+    return checker.matched
+
+
+CASES = [
+    # (checker, expected, output, matched)
+    ("exact", "1 2\n3", "1 2\n3\n\n", True),
+    ("exact", "1 2\n3", "  1 2\n3", True),
+    ("exact", "1 2\n3", "1  2\n3", False),
+    ("exact", "1 2\n3", "1 2\n3 4", False),
+    ("exact", "1 2\n3", "1 2", False),
+    ("exact", "", "\n \n", True),
+    ("whitespace", "a  b\nc", "\n a b \nc\n\n", True),
+    ("whitespace", "a\n\nb", "a\n\nb", True),
+    ("whitespace", "a\n\nb", "a\nb", False),
+    ("whitespace", "a b", "ab", False),
+    ("tokens", "1 2 3", "1\n2\n   3\n", True),
+    ("tokens", "1 2 3", "1 2", False),
+    ("tokens", "1 2 3", "1 2 3 4", False),
+    ("tokens", "1 2 3", "1 3 2", False),
+    ("float", "1.41421 2", "1.414213562 2.0000001", True),
+    ("float", "1.41421", "1.5", False),
+    ("float", "1e9", "1000000000.5", True),
+    ("float", "abc 1", "abc 1.0", True),
+    ("float", "abc", "abd", False),
+    ("unordered", "a\nb\nc", "c\na\nb\n", True),
+    ("unordered", "a\nb\nb", "b\na\nb", True),
+    ("unordered", "a\nb\nb", "a\na\nb", False),
+    ("unordered", "a\nb", "a\nb\nc", False),
+]
+
+
+@pytest.mark.parametrize("mode,expected,output,matched", CASES)
+def test_checker_modes(mode, expected, output, matched):
+    test_case = {"expected_output": expected, "checker": mode, "epsilon": 1e-4}
+    assert check_output(test_case, output) is matched
+    for size in (1, 2, 3, 7):
+        assert chunked(test_case, output, size) is matched, f"chunk size {size}"
+
+
+def test_every_mode_is_covered():
+    assert {case[0] for case in CASES} == set(CHECKERS)
+
+
+def test_exact_is_the_default():
+    assert check_output({"expected_output": "x"}, "x\n")
+    assert not check_output({"expected_output": "x"}, "x y")
+
+
+def test_float_epsilon_is_per_case():
+    assert check_output({"expected_output": "1.0", "checker": "float", "epsilon": 0.5}, "1.4")
+    assert not check_output({"expected_output": "1.0", "checker": "float"}, "1.4")
+
+
+@pytest.mark.parametrize("mode", ["whitespace", "tokens", "float", "unordered"])
+def test_overlong_output_does_not_match(mode):
+    checker = get_checker({"expected_output": "ab", "checker": mode})
+    for _ in range(100):
+        checker.feed(b"x" * 100)
+    assert not checker.matched
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError, match="Unknown output checker"):
+        get_checker({"expected_output": "1", "checker": "regex"})
@@ -0,0 +1,119 @@
+"""
+Tests for performance cases: generator validation and caps, suite preparation
+against a reference solution, unknown budgets, and efficiency scoring.
+"""
+from types import SimpleNamespace
+
+import pytest
+
+from app.config import settings
+from app.services import performance_cases
+from app.services.code_executor import execute_code, suite_digest
+from app.services.performance_cases import (
+    MAX_CASE_INPUT_CHARS, MAX_GENERATED_N, generate_case, prepare_test_cases, validate_test_cases
+)
+from app.services.scoring_service import score_coding_response
+
+REFERENCE = "n = int(input())\nvalues = list(map(int, input().split()))\nprint(sum(values))"
+
+
+def perf_case(**generate):
+    return {"performance": True, "generate": {"kind": "ints", "n": 1000, "high": 100, "seed": 3, **generate}}
+
+
+def test_generated_input_is_deterministic():
+    case = generate_case(perf_case(n=5))
+    assert case == generate_case(perf_case(n=5))
+    n, values = case["input"].split("\n")
+    assert n == "5" and len(values.split()) == 5
+    assert all(0 <= int(v) <= 100 for v in values.split())
+    assert "generate" not in case
+
+
+def test_generated_args_and_strings():
+    args = generate_case({"performance": True, "function": "f", "generate": {"kind": "ints", "n": 4, "as": "args"}})
+    assert len(args["args"][0]) == 4
+    text = generate_case({"performance": True, "generate": {"kind": "string", "n": 6, "alphabet": "ab"}})
+    assert len(text["input"]) == 6 and set(text["input"]) <= {"a", "b"}
+
+
+@pytest.mark.parametrize("case,message", [
+    (perf_case(kind="floats"), "Unknown generator kind"),
+    (perf_case(n=MAX_GENERATED_N + 1), "Generator n"),
+    (perf_case(n="many"), "invalid literal"),
+    (perf_case(n=None), "Malformed generate spec"),
+    (perf_case(low=10, high=1), "Generator bounds"),
+    ({"performance": True, "generate": {"kind": "string", "alphabet": ""}}, "alphabet"),
+    ({"performance": True, "generate": "ints"}, "generate must be an object"),
+    (dict(perf_case(), input_template="{n} {other}"), "placeholder"),
+    (dict(perf_case(n=MAX_GENERATED_N, high=10 ** 9), input_template="{values}" * 3), str(MAX_CASE_INPUT_CHARS)),
+])
+def test_invalid_specs_are_rejected(case, message):
+    with pytest.raises(ValueError, match=message):
+        validate_test_cases([{"input": "1", "expected_output": "1"}, case], REFERENCE)
+    with pytest.raises(ValueError):
+        generate_case(case)
+
+
+def test_suite_cap_and_reference_requirement():
+    big = dict(perf_case(n=MAX_GENERATED_N, high=10 ** 12), input_template="{values}")
+    with pytest.raises(ValueError, match="suite"):
+        validate_test_cases([big] * 5, REFERENCE)
+    with pytest.raises(ValueError, match="reference solution"):
+        validate_test_cases([perf_case()], None)
+    validate_test_cases([dict(perf_case(), expected_output="1", time_budget_ms=100)], None)
+
+
+def test_invalid_suites_are_not_prepared():
+    # Preparing raises rather than grading a different number of cases
+    with pytest.raises(ValueError):
+        prepare_test_cases([{"input": "1", "expected_output": "1"}, perf_case(n=-1)], REFERENCE)
+
+
+def test_failing_reference_raises():
+    with pytest.raises(ValueError, match="Test case 1"):
+        prepare_test_cases([perf_case(seed=11)], "raise SystemExit(1)")
+
+
+def test_prepared_suite_gets_outputs_budgets_and_digest():
+    suite, digest = prepare_test_cases([{"input": "1\n5", "expected_output": "5"}, perf_case(seed=5)], REFERENCE)
+    assert len(suite) == 2 and digest == suite_digest(suite)
+    case = suite[1]
+    assert case["expected_output"] == str(sum(map(int, case["input"].split("\n")[1].split())))
+    assert case["reference_time_ms"] > 0
+    assert case["time_budget_ms"] >= performance_cases.MIN_BUDGET_MS
+    # Prepared once per question
+    assert prepare_test_cases([{"input": "1\n5", "expected_output": "5"}, perf_case(seed=5)], REFERENCE)[0] is suite
+
+    result = execute_code(REFERENCE, "python", suite, use_cache=False)
+    assert result["test_results"][1]["within_budget"] is True
+    assert "time_budget_ms" not in result["test_results"][0]
+
+
+def test_failed_benchmark_keeps_the_case_with_an_unknown_budget(monkeypatch):
+    monkeypatch.setattr(performance_cases, "_benchmark", lambda reference, language, suite: [None] * len(suite))
+    test_cases = [{"input": "1\n5", "expected_output": "5"}, perf_case(seed=9)]
+    suite, _ = prepare_test_cases(test_cases, REFERENCE)
+    assert len(suite) == 2 and suite[1]["time_budget_ms"] is None and "expected_output" in suite[1]
+    # Incomplete suites are prepared again next time
+    assert prepare_test_cases(test_cases, REFERENCE)[0] is not suite
+
+    result = execute_code(REFERENCE, "python", suite, use_cache=False)
+    assert result["test_results"][1]["passed"]
+    assert result["test_results"][1]["within_budget"] is None
+    score = score_coding_response(SimpleNamespace(max_score=10.0), result)
+    assert score["score"] == 10.0 and score["performance_unknown"] == 1
+    assert "efficiency_score" not in score
+
+
+def test_efficiency_credit_is_scored_separately(monkeypatch):
+    monkeypatch.setattr(settings, "performance_weight", 0.4)
+    result = {"test_results": [
+        {"passed": True},
+        {"passed": True, "time_budget_ms": 50, "within_budget": False},
+        {"passed": True, "time_budget_ms": 50, "within_budget": True},
+    ]}
+    score = score_coding_response(SimpleNamespace(max_score=10.0), result)
+    assert score["correctness_score"] == 6.0
+    assert score["efficiency_score"] == 2.0
+    assert score["score"] == 8.0 and score["performance_passed"] == 1
@@ -0,0 +1,122 @@
+"""
+Tests for the function-style harness: HarnessReader's framing of the harness's
+stdout, and whole suites run through the executor, including cases that time
+out or exceed the output limit.
+"""
+import json
+
+import pytest
+
+from app.services.code_executor import ExecutionLimits, execute_code
+from app.services.python_harness import OUTPUT_PREVIEW_CHARS, HarnessReader, harness_input, is_function_style
+
+
+def frame(kind: str, index: int, payload: bytes) -> bytes:
+    return b"%s %d %d\n" % (kind.encode(), index, len(payload)) + payload
+
+
+def record(error=None) -> bytes:
+    return json.dumps({"error": error, "usage": {"wall_time_ms": 1.0}}).encode()
+
+
+def feed_in_chunks(reader: HarnessReader, stream: bytes, size: int):
+    for start in range(0, len(stream), size):
+        reader.feed(stream[start:start + size])
+
+
+CASES = [{"expected_output": "hello world"}, {"expected_output": "2"}]
+STREAM = (
+    frame("O", 0, b"hello ")
+    + frame("O", 1, b"3")
+    + frame("O", 0, b"world\n")
+    + frame("R", 1, record("Traceback: boom"))
+    + frame("R", 0, record())
+)
+
+
+@pytest.mark.parametrize("size", [1, 3, 16, len(STREAM)])
+def test_frames_are_reassembled_across_chunks(size):
+    reader = HarnessReader(CASES)
+    feed_in_chunks(reader, STREAM, size)
+    first, second = reader.results
+    assert first["matched"] and first["output"] == "hello world" and first["error"] is None
+    assert not second["matched"] and second["output"] == "3" and second["error"] == "Traceback: boom"
+    assert first["usage"] == {"wall_time_ms": 1.0}
+
+
+def test_result_is_pending_until_its_record_arrives():
+    reader = HarnessReader(CASES)
+    reader.feed(frame("O", 0, b"hello world") + frame("R", 0, record())[:5])
+    assert reader.results == [None, None]
+
+
+def test_frames_for_unknown_cases_are_ignored():
+    reader = HarnessReader(CASES[:1])
+    reader.feed(frame("O", 5, b"junk") + frame("R", -1, record()) + frame("O", 0, b"hello world") + frame("R", 0, record()))
+    assert reader.results[0]["matched"]
+
+
+def test_first_record_wins():
+    reader = HarnessReader(CASES[:1])
+    reader.feed(frame("O", 0, b"hello world") + frame("R", 0, record()) + frame("R", 0, record("late")))
+    assert reader.results[0]["error"] is None
+
+
+@pytest.mark.parametrize("stream", [
+    b"X" * 100,
+    b"O zero 3\nabc",
+    frame("R", 0, b"not json"),
+])
+def test_malformed_streams_stop_the_reader(stream):
+    reader = HarnessReader(CASES[:1])
+    reader.feed(stream)
+    reader.feed(frame("O", 0, b"hello world") + frame("R", 0, record()))
+    assert reader.results == [None]
+
+
+def test_output_preview_is_capped():
+    reader = HarnessReader([{"expected_output": "x" * (OUTPUT_PREVIEW_CHARS * 2)}])
+    reader.feed(frame("O", 0, b"x" * OUTPUT_PREVIEW_CHARS) + frame("O", 0, b"x" * OUTPUT_PREVIEW_CHARS))
+    reader.feed(frame("R", 0, record()))
+    assert reader.results[0]["matched"]
+    assert len(reader.results[0]["output"]) == OUTPUT_PREVIEW_CHARS
+
+
+def test_unknown_checker_is_reported_per_case():
+    reader = HarnessReader([{"expected_output": "1", "checker": "regex"}])
+    reader.feed(frame("O", 0, b"1") + frame("R", 0, record()))
+    assert not reader.results[0]["matched"]
+    assert "Unknown output checker" in reader.results[0]["error"]
+
+
+def test_sandbox_never_sees_expected_outputs():
+    cases = [{"function": "f", "args": [1], "expected_output": "secret", "checker": "tokens"}]
+    assert "secret" not in harness_input(cases)
+
+
+SOLUTION = '''
+def f(x):
+    if x == 1:
+        while True:
+            pass
+    if x == 2:
+        print("y" * 10 ** 7)
+    return x * 2
+'''
+
+
+def test_suite_with_timeout_and_output_limit():
+    test_cases = [
+        {"function": "f", "args": [3], "expected_output": "6"},
+        {"function": "f", "args": [1], "expected_output": "2"},
+        {"function": "f", "args": [2], "expected_output": "4"},
+        {"function": "f", "args": [5], "expected_output": "10"},
+    ]
+    assert is_function_style(SOLUTION, test_cases)
+    result = execute_code(SOLUTION, "python", test_cases, use_cache=False, limits=ExecutionLimits(case_timeout=1))
+    passed = [r["passed"] for r in result["test_results"]]
+    errors = [r["error"] for r in result["test_results"]]
+    assert passed == [True, False, False, True]
+    assert errors[1] == "Timeout"
+    assert errors[2] == "Output limit exceeded"
+    assert result["test_results"][1]["wall_time_ms"] < 5000
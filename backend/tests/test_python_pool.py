@@ -0,0 +1,58 @@
+"""
+Tests for the warm Python worker pool: jobs run, time out and report their
+status the way process_runner does, and the status comes from the worker, not
+from the submission.
+"""
+import subprocess
+import time
+
+import pytest
+
+from app.services.python_pool import POOL_SUPPORTED, PythonWorkerPool
+
+pytestmark = pytest.mark.skipif(not POOL_SUPPORTED, reason="the worker pool needs fork, fd passing and rlimits")
+
+
+@pytest.fixture
+def pool():
+    pool = PythonWorkerPool(1)
+    pool.start()
+    yield pool
+    pool.shutdown()
+
+
+def test_runs_code_on_stdin(pool):
+    result = pool.run("print(int(input()) * 2)", "21\n", timeout=10)
+    assert result.returncode == 0
+    assert result.stdout == "42\n"
+    assert result.usage["peak_memory_kb"]
+
+
+def test_reports_exit_code_and_traceback(pool):
+    assert pool.run("import sys; sys.exit(3)", None, timeout=10).returncode == 3
+    result = pool.run("1 / 0", None, timeout=10)
+    assert result.returncode == 1
+    assert "ZeroDivisionError" in result.stderr
+
+
+def test_submission_cannot_forge_status(pool):
+    code = (
+        "import os\n"
+        "for fd in range(3, 1024):\n"
+        "    try:\n"
+        "        os.write(fd, b'0 0.0 0.0 0 ')\n"
+        "    except OSError:\n"
+        "        pass\n"
+        "raise SystemExit(7)\n"
+    )
+    result = pool.run(code, None, timeout=10)
+    assert result.returncode == 7
+
+
+def test_timeout_kills_the_job(pool):
+    start = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        pool.run("while True: pass", None, timeout=0.5)
+    assert time.monotonic() - start < 5
+    # The pool refills after a killed job
+    assert pool.run("print('ok')", None, timeout=10).stdout == "ok\n"
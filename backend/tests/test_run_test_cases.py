@@ -0,0 +1,72 @@
+"""
+Tests for _run_test_cases, the parallel per-case loop shared by every language:
+result order, the per-submission parallelism cap, fail-fast skipping and
+errors raised by a case.
+"""
+import threading
+import time
+
+from app.config import settings
+from app.services.code_executor import _run_test_cases
+
+
+def test_results_keep_case_order():
+    # Later cases finish first
+    def run_case(i, test_case):
+        time.sleep(test_case["sleep"])
+        return {"test_case": i + 1, "passed": True}
+
+    cases = [{"sleep": 0.05 * (3 - i)} for i in range(4)]
+    results = _run_test_cases(cases, run_case)
+    assert [r["test_case"] for r in results] == [1, 2, 3, 4]
+
+
+def test_parallel_cases_are_capped(monkeypatch):
+    monkeypatch.setattr(settings, "max_parallel_cases", 2)
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def run_case(i, test_case):
+        with lock:
+            running.append(i)
+            peak.append(len(running))
+        time.sleep(0.02)
+        with lock:
+            running.remove(i)
+        return {"test_case": i + 1, "passed": True}
+
+    results = _run_test_cases([{}] * 6, run_case)
+    assert all(r["passed"] for r in results)
+    assert max(peak) <= 2
+
+
+def test_fail_fast_skips_cases_not_started(monkeypatch):
+    monkeypatch.setattr(settings, "max_parallel_cases", 1)
+    started = []
+
+    def run_case(i, test_case):
+        started.append(i)
+        return {"test_case": i + 1, "passed": i != 1}
+
+    results = _run_test_cases([{}] * 5, run_case, fail_fast=True)
+    assert started == [0, 1]
+    assert [r["passed"] for r in results] == [True, False, False, False, False]
+    assert all(r["error"] == "Skipped after an earlier failure" for r in results[2:])
+
+
+def test_without_fail_fast_every_case_runs():
+    results = _run_test_cases([{}] * 4, lambda i, tc: {"test_case": i + 1, "passed": i % 2 == 0})
+    assert [r["passed"] for r in results] == [True, False, True, False]
+    assert all("error" not in r for r in results)
+
+
+def test_case_exception_becomes_a_failed_result():
+    def run_case(i, test_case):
+        if i == 1:
+            raise RuntimeError("runner broke")
+        return {"test_case": i + 1, "passed": True}
+
+    results = _run_test_cases([{}] * 3, run_case)
+    assert results[1] == {"test_case": 2, "passed": False, "error": "runner broke"}
+    assert results[0]["passed"] and results[2]["passed"]
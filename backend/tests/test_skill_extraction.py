@@ -0,0 +1,104 @@
+"""
+Tests that extract_skills reports what the parser reported before the skill
+registry: the same vocabulary, matched one regex per skill, in the same order.
+Synonyms added with the registry are only used to match jobs.
+"""
+import os
+import re
+
+import pytest
+
+from app.services.resume_service import extract_skills, extract_text_from_docx, extract_text_from_pdf
+from app.services.skill_taxonomy import MATCH_ONLY_NAMES, skill_id
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESUME_DIR = os.path.join(BACKEND_DIR, "uploads", "resumes")
+
+# TECH_SKILLS + SOFT_SKILLS as the parser had them before the registry
+LEGACY_SKILLS = [
+    "python", "javascript", "java", "c++", "c#", "ruby", "go", "rust", "typescript",
+    "r", "scala", "kotlin", "swift", "php", "perl", "matlab",
+    "react", "reactjs", "react.js", "react native", "angular", "angularjs", "angular.js",
+    "vue", "vue.js", "vuejs", "node.js", "nodejs", "node",
+    "express", "expressjs", "express.js", "django", "flask", "fastapi",
+    "spring", "spring boot", ".net", "asp.net", "laravel", "rails", "next.js", "nextjs",
+    "jquery", "backbone", "ember",
+    "sql", "mysql", "postgresql", "postgres", "mongodb", "redis", "elasticsearch", "cassandra",
+    "oracle", "sqlite", "dynamodb", "firebase", "supabase", "mariadb",
+    "aws", "azure", "gcp", "google cloud", "docker", "kubernetes", "k8s",
+    "jenkins", "ci/cd", "circleci", "travis", "terraform", "ansible", "cloudformation",
+    "heroku", "vercel", "netlify", "tomcat", "nginx", "apache",
+    "maven", "gradle", "grunt", "gulp", "npm", "yarn", "pnpm",
+    "git", "github", "gitlab", "bitbucket", "linux", "bash", "powershell", "unix",
+    "rest api", "rest", "graphql", "microservices", "api integration", "soap",
+    "machine learning", "deep learning", "tensorflow", "pytorch", "scikit-learn",
+    "data analysis", "pandas", "numpy", "data science", "nlp", "computer vision",
+    "rag", "langchain", "langgraph", "llm", "large language model", "gpt", "openai",
+    "hugging face", "transformers", "vector database", "embeddings", "prompt engineering",
+    "generative ai", "ai agents", "agentic ai",
+    "selenium", "playwright", "puppeteer", "cypress", "pytest", "junit", "mocha", "jest",
+    "web scraping", "beautifulsoup", "scrapy", "automation", "exponentjs",
+    "power bi", "tableau", "excel", "looker", "metabase", "superset",
+    "apache spark", "hadoop", "airflow", "kafka", "etl",
+    "n8n", "zapier", "make", "integromat", "retool", "appsmith",
+    "html", "css", "sass", "scss", "less", "tailwind", "tailwindcss", "bootstrap", "webpack", "vite",
+    "figma", "ui/ux", "responsive design",
+    "agile", "scrum", "jira", "confluence", "trello", "asana", "notion",
+    "leadership", "communication", "teamwork", "problem solving", "analytical",
+    "time management", "project management", "mentoring", "collaboration",
+    "adaptability", "creativity", "critical thinking", "decision making",
+    "presentation", "negotiation", "stakeholder management",
+]
+
+TEXTS = [
+    "Golang and Go developer on Amazon Web Services and AWS; Google Cloud Platform, GCP.",
+    "Spark, Apache Spark, sklearn, scikit-learn, HuggingFace and Hugging Face models.",
+    "React Native apps, React.js, Node.js/Express; CI/CD with Jenkins. C++ and C#, .NET.",
+    "Skills: Technical Skills: Selenium) R, rest api, REST, ui/ux & Certificates",
+]
+
+
+def legacy_extract_skills(text: str):
+    """extract_skills before the registry: one re.search per skill over the whole text"""
+    text_lower = text.lower()
+    found_skills = []
+    skip_words = ['& certificates', 'technical skills:', 'skills:', 'selenium)']
+    for skill in LEGACY_SKILLS:
+        if re.search(r'\b' + re.escape(skill) + r'\b', text_lower):
+            skill_title = skill.title()
+            if skill_title.lower() not in skip_words and len(skill_title) > 1:
+                found_skills.append(skill_title)
+    seen = set()
+    unique_skills = []
+    for s in found_skills:
+        if s.lower() not in seen:
+            seen.add(s.lower())
+            unique_skills.append(s)
+    return unique_skills
+
+
+def sample_texts():
+    texts = list(TEXTS)
+    for name in sorted(os.listdir(RESUME_DIR)) if os.path.isdir(RESUME_DIR) else []:
+        path = os.path.join(RESUME_DIR, name)
+        if name.lower().endswith(".pdf"):
+            texts.append(extract_text_from_pdf(path))
+        elif name.lower().endswith(".docx"):
+            texts.append(extract_text_from_docx(path))
+        elif name.lower().endswith(".txt"):
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                texts.append(f.read())
+    return texts
+
+
+@pytest.mark.parametrize("text", sample_texts())
+def test_extraction_matches_the_legacy_parser(text):
+    assert extract_skills(text) == legacy_extract_skills(text)
+
+
+def test_match_only_synonyms_resolve_but_are_not_extracted():
+    skills = {s.lower() for s in extract_skills(" ".join(sorted(MATCH_ONLY_NAMES)))}
+    assert not skills & MATCH_ONLY_NAMES
+    assert skill_id("golang") == skill_id("go")
+    assert skill_id("Amazon Web Services") == skill_id("aws")
+    assert skill_id("spark") == skill_id("apache spark")
@@ -11,12 +11,15 @@ function RegisterForm() {
   const router = useRouter();
   const searchParams = useSearchParams();
   const defaultRole = searchParams.get("role") || "candidate";
+  // Set by the link emailed to a candidate whose resume a recruiter imported
+  const inviteToken = searchParams.get("invite") || undefined;
   
   const [formData, setFormData] = useState({
-    email: "",
+    email: searchParams.get("email") || "",
     password: "",
     full_name: "",
-    role: defaultRole,
+    role: inviteToken ? "candidate" : defaultRole,
+    invite_token: inviteToken,
   });
   const [loading, setLoading] = useState(false);
   const setAuth = useAuthStore((state) => state.setAuth);
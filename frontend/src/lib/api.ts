@@ -37,7 +37,7 @@ api.interceptors.response.use(
 
 // Auth API
 export const authAPI = {
-  register: (data: { email: string; password: string; full_name: string; role: string }) =>
+  register: (data: { email: string; password: string; full_name: string; role: string; invite_token?: string }) =>
     api.post('/auth/register', data),
   login: (data: { email: string; password: string }) =>
     api.post('/auth/login', data),
@@ -104,6 +104,7 @@ export const recruiterAPI = {
   getQuestions: (params?: any) => api.get('/recruiter/questions', { params }),
   getCandidates: (params?: any) => api.get('/recruiter/candidates', { params }),
   getCandidate: (candidateId: number) => api.get(`/recruiter/candidates/${candidateId}`),
+  inviteCandidate: (candidateId: number) => api.post(`/recruiter/candidates/${candidateId}/invite`),
   getShortlist: (jobId: number) => api.get(`/recruiter/candidates/job/${jobId}/shortlist`),
 };
 